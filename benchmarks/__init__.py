@@ -0,0 +1 @@
+"""Benchmarks for dbviewer: hot-path micro-benchmarks and end-to-end endpoint runs"""
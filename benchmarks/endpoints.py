@@ -0,0 +1,201 @@
+"""Measure dbviewer's table endpoints end to end on a synthetic database.
+
+Run from the repository root:
+
+    python -m benchmarks.endpoints [--rows 100000] [--columns 12] [--wide-columns 200] [--requests 30]
+                                   [--output results.json] [--compare baseline.json]
+
+Requests go through the Flask test client against a generated SQLite upload
+with the page cache, rate limits and automatic indexes disabled, so every
+request does the real work. Each scenario reports latency percentiles and
+throughput; --output writes them as JSON and --compare prints the change
+against an earlier run (e.g. one made on another commit).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault('FLASK_SECRET_KEY', 'benchmark-only-secret-key-not-used-for-serving-requests')
+os.environ.setdefault('DBVIEWER_PAGE_CACHE_TTL', '0')
+os.environ.setdefault('DBVIEWER_AUTO_INDEX_THRESHOLD', '0')
+os.environ.setdefault('DBVIEWER_PAGE_CACHE_REDIS_URL', '')
+
+import logging  # noqa: E402
+
+import dbviewer  # noqa: E402
+from benchmarks.synthetic import MAIN_TABLE, WIDE_TABLE, generate_database  # noqa: E402
+
+DATABASE_ID = 'benchmark.db'
+PER_PAGE = 50
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, elapsed, extra=None):
+    ordered = sorted(latencies)
+    summary = {
+        'requests': len(ordered),
+        'p50_ms': percentile(ordered, 0.50) * 1000,
+        'p90_ms': percentile(ordered, 0.90) * 1000,
+        'p99_ms': percentile(ordered, 0.99) * 1000,
+        'mean_ms': sum(ordered) / len(ordered) * 1000,
+        'max_ms': ordered[-1] * 1000,
+        'throughput_rps': len(ordered) / elapsed if elapsed else 0.0
+    }
+    summary.update(extra or {})
+    return summary
+
+
+def run_scenario(client, make_url, requests, warmup, before_request=None):
+    """Time `requests` GETs of make_url(i) after `warmup` untimed ones; returns latencies and bytes read"""
+    latencies = []
+    body_bytes = 0
+    started = time.perf_counter()
+    for i in range(warmup + requests):
+        if before_request:
+            before_request()
+        request_started = time.perf_counter()
+        response = client.get(make_url(i))
+        body = response.get_data()
+        latency = time.perf_counter() - request_started
+        if response.status_code != 200:
+            raise SystemExit(f"{make_url(i)} returned {response.status_code}: {body[:200]!r}")
+        if i == warmup - 1:
+            started = time.perf_counter()
+        if i >= warmup:
+            latencies.append(latency)
+            body_bytes += len(body)
+    return latencies, body_bytes, time.perf_counter() - started
+
+
+def build_scenarios(info, upload_path, rng):
+    """(name, url factory, per-request hook) for every measured operation"""
+    base = f"/database/{DATABASE_ID}/table"
+    main = info['tables'][MAIN_TABLE]
+    last_page = max(main['rows'] // PER_PAGE, 1)
+    sort_columns = [name for name in main['columns'] if name.startswith(('text_', 'integer_', 'real_'))] or ['created']
+
+    def deep_page(i):
+        # Pages in the last tenth of the table, varied so no layer can serve a repeat
+        return max(last_page - rng.randrange(max(last_page // 10, 1)), 1)
+
+    def clear_counts():
+        dbviewer.invalidate_counts(upload_path)
+
+    scenarios = [
+        ('first_page', lambda i: f"{base}/{MAIN_TABLE}?page=1&per_page={PER_PAGE}", None),
+        ('deep_page', lambda i: f"{base}/{MAIN_TABLE}?page={deep_page(i)}&per_page={PER_PAGE}", None),
+        ('sorted_page', lambda i: (f"{base}/{MAIN_TABLE}?page={rng.randint(1, last_page)}&per_page={PER_PAGE}"
+                                   f"&sort_column={sort_columns[i % len(sort_columns)]}&sort_order={('ASC', 'DESC')[i % 2]}"), None),
+        ('search', lambda i: f"{base}/{MAIN_TABLE}?page=1&per_page={PER_PAGE}&search={info['search_word']}", clear_counts),
+        ('count', lambda i: f"{base}/{MAIN_TABLE}?page=1&per_page=1", clear_counts),
+        ('export', lambda i: f"{base}/{MAIN_TABLE}/export?format=csv&gzip=0", None),
+    ]
+    if WIDE_TABLE in info['tables']:
+        wide_last_page = max(info['tables'][WIDE_TABLE]['rows'] // PER_PAGE, 1)
+        scenarios += [
+            ('wide_first_page', lambda i: f"{base}/{WIDE_TABLE}?page=1&per_page={PER_PAGE}", None),
+            ('wide_deep_page', lambda i: f"{base}/{WIDE_TABLE}?page={wide_last_page}&per_page={PER_PAGE}", None),
+        ]
+    return scenarios
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_comparison(results, baseline_path):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    print(f"\nChange against {baseline_path} (commit {baseline['meta'].get('commit')}), negative is faster:")
+    for name, current in results.items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            print(f"  {name:<16} not in baseline")
+            continue
+        changes = '   '.join(
+            f"{key[:-3]} {(current[key] - previous[key]) / previous[key] * 100:+6.1f}%"
+            for key in ('p50_ms', 'p90_ms', 'p99_ms') if previous[key]
+        )
+        print(f"  {name:<16} {changes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--columns', type=int, default=12)
+    parser.add_argument('--text-ratio', type=float, default=0.5)
+    parser.add_argument('--blob-ratio', type=float, default=0.1)
+    parser.add_argument('--wide-columns', type=int, default=200, help='0 skips the wide table')
+    parser.add_argument('--wide-rows', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=30, help='timed requests per scenario')
+    parser.add_argument('--export-requests', type=int, default=3)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scenario', action='append', help='run only these scenarios (repeatable)')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+    args = parser.parse_args()
+
+    # Per-request INFO logs would otherwise flood the console and app.log
+    logging.getLogger().setLevel(logging.WARNING)
+    dbviewer.limiter.enabled = False
+    upload_folder = tempfile.mkdtemp(prefix='dbviewer-bench-')
+    dbviewer.app.config['UPLOAD_FOLDER'] = upload_folder
+    try:
+        upload_path = os.path.join(upload_folder, DATABASE_ID)
+        started = time.perf_counter()
+        info = generate_database(upload_path, args.rows, args.columns, args.text_ratio, args.blob_ratio,
+                                 args.wide_columns, args.wide_rows, args.seed)
+        print(f"Generated {info['size'] / 1024 / 1024:.1f} MB in {time.perf_counter() - started:.1f}s: "
+              + ', '.join(f"{name} {t['rows']:,} rows x {len(t['columns'])} columns" for name, t in info['tables'].items()))
+
+        client = dbviewer.app.test_client()
+        rng = random.Random(args.seed)
+        results = {}
+        for name, make_url, before_request in build_scenarios(info, upload_path, rng):
+            if args.scenario and name not in args.scenario:
+                continue
+            requests = args.export_requests if name == 'export' else args.requests
+            latencies, body_bytes, elapsed = run_scenario(client, make_url, requests, args.warmup, before_request)
+            extra = {'rows_per_s': info['tables'][MAIN_TABLE]['rows'] * requests / elapsed} if name == 'export' else None
+            results[name] = summarize(latencies, elapsed, extra)
+            results[name]['body_bytes'] = body_bytes // requests
+            r = results[name]
+            print(f"  {name:<16} p50 {r['p50_ms']:>9.2f} ms   p90 {r['p90_ms']:>9.2f} ms   p99 {r['p99_ms']:>9.2f} ms   "
+                  f"{r['throughput_rps']:>8.1f} req/s" + (f"   {r['rows_per_s']:,.0f} rows/s" if 'rows_per_s' in r else ''))
+    finally:
+        shutil.rmtree(upload_folder, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'commit': git_commit(), 'created': datetime.now().isoformat(),
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'args': vars(args), 'database': {k: v for k, v in info.items() if k != 'path'}
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
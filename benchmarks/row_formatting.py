@@ -0,0 +1,124 @@
+"""Compare the per-cell view_table formatting loop with the precompiled row formatter.
+
+Run from the repository root:
+
+    python -m benchmarks.row_formatting [--rows 1000] [--columns 50] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import re
+import time
+from datetime import datetime
+
+os.environ.setdefault('FLASK_SECRET_KEY', 'benchmark-only-secret-key-not-used-for-serving-requests')
+
+import dbviewer  # noqa: E402
+
+COLUMN_TYPES = ['INTEGER', 'TEXT', 'REAL', 'DATETIME', 'BLOB']
+
+
+def legacy_highlight(value, search_term):
+    """highlight_search_term as it was: the pattern is recompiled for every cell"""
+    if not search_term or not value:
+        return value
+    str_value = str(value)
+    str_value = str_value.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    pattern = re.compile(re.escape(search_term), re.IGNORECASE)
+    return pattern.sub(lambda m: f'<mark>{m.group()}</mark>', str_value)
+
+
+def legacy_format_rows(rows, description, search_term):
+    """The original view_table formatting loop"""
+    results = []
+    for row in rows:
+        row_dict = {}
+        for i, col in enumerate(description):
+            value = None
+            try:
+                value = row[i]
+            except TypeError:
+                value = "<Access Error>"
+
+            if value is None: display_value = 'NULL'
+            elif value == "<Access Error>": display_value = value
+            elif isinstance(value, bytes):
+                try: display_value = value.decode('utf-8')
+                except UnicodeDecodeError:
+                    try: display_value = value.decode('latin-1')
+                    except UnicodeDecodeError: display_value = f'<Binary {len(value)} bytes>'
+            elif isinstance(value, datetime):
+                display_value = value.strftime('%Y-%m-%d %H:%M:%S')
+            else:
+                try: display_value = str(value)
+                except (UnicodeDecodeError, UnicodeEncodeError):
+                    try: display_value = repr(value)
+                    except Exception: display_value = '<Unable to display>'
+                except Exception: display_value = '<Unable to display>'
+
+            if search_term:
+                display_value = legacy_highlight(display_value, search_term)
+
+            row_dict[col[0]] = display_value
+        results.append(row_dict)
+    return results
+
+
+def make_page(row_count, column_count, seed=0):
+    """Synthetic page of rows plus matching cursor.description and get_table_info output"""
+    rng = random.Random(seed)
+    columns = [{'name': f'col{i}', 'type': COLUMN_TYPES[i % len(COLUMN_TYPES)], 'size': None} for i in range(column_count)]
+    description = [(col['name'], None, None, None, None, None, None) for col in columns]
+    rows = []
+    for r in range(row_count):
+        row = []
+        for col in columns:
+            if rng.random() < 0.05:
+                row.append(None)
+            elif col['type'] == 'INTEGER':
+                row.append(rng.randint(-10**6, 10**6))
+            elif col['type'] == 'TEXT':
+                row.append(f"name {r} <b>& {rng.choice(['alpha', 'beta', 'gamma', 'delta'])}</b>")
+            elif col['type'] == 'REAL':
+                row.append(rng.random() * 1000)
+            elif col['type'] == 'DATETIME':
+                row.append(datetime(2020, 1, 1 + r % 28, r % 24, r % 60, 0))
+            else:
+                row.append(bytes([rng.randrange(256) for _ in range(8)]))
+        rows.append(tuple(row))
+    return rows, description, columns
+
+
+def measure(func, repeat):
+    """Best wall-clock time over several runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--columns', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rows, description, columns = make_page(args.rows, args.columns)
+    print(f"{args.rows} rows x {args.columns} columns, best of {args.repeat}")
+    for label, term in (('no search', ''), ('search', 'alp')):
+        expected = legacy_format_rows(rows, description, term)
+        actual = dbviewer.build_row_formatter(description, columns, term)(rows)
+        if actual != expected:
+            raise SystemExit(f"{label}: formatter output differs from the legacy loop")
+
+        legacy = measure(lambda: legacy_format_rows(rows, description, term), args.repeat)
+        current = measure(lambda: dbviewer.build_row_formatter(description, columns, term)(rows), args.repeat)
+        print(f"  {label:<10} legacy {args.rows / legacy:>10,.0f} rows/s   "
+              f"precompiled {args.rows / current:>10,.0f} rows/s   ({legacy / current:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
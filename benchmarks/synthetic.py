@@ -0,0 +1,117 @@
+"""Generate a synthetic SQLite database for benchmarking dbviewer.
+
+Run from the repository root:
+
+    python -m benchmarks.synthetic out.db [--rows 100000] [--columns 12] [--text-ratio 0.5] [--blob-ratio 0.1]
+                                         [--wide-columns 200] [--wide-rows 2000] [--seed 0]
+
+The same arguments and seed always produce the same rows.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+MAIN_TABLE = 'items'
+WIDE_TABLE = 'wide'
+INSERT_BATCH_SIZE = 5000
+
+# Words that text cells are built from; a search for one of them matches a predictable share of rows
+WORDS = ['alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel',
+         'india', 'juliet', 'kilo', 'lima', 'mike', 'november', 'oscar', 'papa',
+         'quartz', 'romeo', 'sierra', 'tango', 'uniform', 'victor', 'whiskey', 'xray']
+SEARCH_WORD = 'quartz'
+
+
+def plan_columns(count, text_ratio, blob_ratio):
+    """Name and declared type of each generated column after `id` and `created`"""
+    text_count = round(count * text_ratio)
+    blob_count = round(count * blob_ratio)
+    numeric_count = max(count - text_count - blob_count, 0)
+    kinds = (['TEXT'] * text_count + ['BLOB'] * blob_count
+             + [('INTEGER', 'REAL')[i % 2] for i in range(numeric_count)])
+    # Interleave kinds so every type appears early in wide rows
+    random.Random(count).shuffle(kinds)
+    return [(f"{kind.lower()}_{i}", kind) for i, kind in enumerate(kinds)]
+
+
+def make_value(rng, kind, row_id):
+    if rng.random() < 0.03:
+        return None
+    if kind == 'INTEGER':
+        return rng.randint(-10**6, 10**6)
+    if kind == 'REAL':
+        return round(rng.uniform(-1000, 1000), 4)
+    if kind == 'TEXT':
+        return f"{rng.choice(WORDS)} {rng.choice(WORDS)} {row_id}"
+    return rng.randbytes(rng.randint(16, 64))
+
+
+def fill_table(conn, table_name, columns, row_count, rng):
+    """Create a table with an INTEGER PRIMARY KEY, a date column and the planned columns, then fill it"""
+    definitions = ', '.join(f"[{name}] {kind}" for name, kind in columns)
+    conn.execute(f"CREATE TABLE [{table_name}] (id INTEGER PRIMARY KEY, created DATETIME, {definitions})")
+    placeholders = ', '.join('?' * (len(columns) + 2))
+    start = datetime(2015, 1, 1)
+    batch = []
+    for row_id in range(1, row_count + 1):
+        created = (start + timedelta(minutes=rng.randrange(10 * 365 * 24 * 60))).strftime('%Y-%m-%d %H:%M:%S')
+        batch.append([row_id, created] + [make_value(rng, kind, row_id) for _, kind in columns])
+        if len(batch) >= INSERT_BATCH_SIZE:
+            conn.executemany(f"INSERT INTO [{table_name}] VALUES ({placeholders})", batch)
+            batch = []
+    if batch:
+        conn.executemany(f"INSERT INTO [{table_name}] VALUES ({placeholders})", batch)
+
+
+def generate_database(path, rows=100000, columns=12, text_ratio=0.5, blob_ratio=0.1,
+                      wide_columns=0, wide_rows=2000, seed=0):
+    """Write a fresh database to path and describe what it contains"""
+    if os.path.exists(path):
+        os.remove(path)
+    rng = random.Random(seed)
+    main_columns = plan_columns(columns, text_ratio, blob_ratio)
+    conn = sqlite3.connect(path)
+    try:
+        # The file is thrown away if generation fails, so durability is not needed
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        fill_table(conn, MAIN_TABLE, main_columns, rows, rng)
+        tables = {MAIN_TABLE: {'rows': rows, 'columns': ['id', 'created'] + [name for name, _ in main_columns]}}
+        if wide_columns > 0:
+            wide = plan_columns(wide_columns, text_ratio, blob_ratio)
+            fill_table(conn, WIDE_TABLE, wide, wide_rows, rng)
+            tables[WIDE_TABLE] = {'rows': wide_rows, 'columns': ['id', 'created'] + [name for name, _ in wide]}
+        conn.commit()
+    finally:
+        conn.close()
+    return {
+        'path': path, 'size': os.path.getsize(path), 'seed': seed, 'search_word': SEARCH_WORD,
+        'text_ratio': text_ratio, 'blob_ratio': blob_ratio, 'tables': tables
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--columns', type=int, default=12)
+    parser.add_argument('--text-ratio', type=float, default=0.5)
+    parser.add_argument('--blob-ratio', type=float, default=0.1)
+    parser.add_argument('--wide-columns', type=int, default=0)
+    parser.add_argument('--wide-rows', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    info = generate_database(args.path, args.rows, args.columns, args.text_ratio, args.blob_ratio,
+                             args.wide_columns, args.wide_rows, args.seed)
+    for name, table in info['tables'].items():
+        print(f"{name}: {table['rows']:,} rows x {len(table['columns'])} columns")
+    print(f"{info['size'] / 1024 / 1024:.1f} MB written to {args.path} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,19 +1,33 @@
 import os
 import tempfile
+import shutil
+import uuid
+import math
 import threading
 import time
-from datetime import datetime
+from datetime import datetime, date, time as datetime_time, timedelta, timezone
 from functools import lru_cache, wraps
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import json
 import re
 import mimetypes
+import csv
+import io
+import zlib
 import hashlib
+import cProfile
+import pstats
+import array
+import mmap
+import base64
+import urllib.parse
+from decimal import Decimal
 from typing import Optional, Dict, Any, List, Tuple
 from dotenv import load_dotenv
 
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Request, render_template, request, jsonify, session, Response, stream_with_context, g, has_app_context, has_request_context, send_file
 from werkzeug.utils import secure_filename
 from flask_wtf.csrf import CSRFProtect
 from flask_limiter import Limiter
@@ -21,6 +35,16 @@ from flask_limiter.util import get_remote_address
 import pyodbc
 import sqlite3
 
+try:
+    import orjson  # Faster serialization of table pages; stdlib json is the fallback
+except ImportError:
+    orjson = None
+
+try:
+    import redis  # Optional: page cache shared between workers
+except ImportError:
+    redis = None
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -78,13 +102,144 @@ app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(os.path.abspath(__fil
 # Allowed extensions
 ALLOWED_EXTENSIONS = {'mdb', 'accdb', 'sqlite', 'db'}
 
-# Cache for database connections and queries
-connection_cache = OrderedDict()
-MAX_CACHE_SIZE = 10
+# Connection pools, one per database file (LRU-bounded)
+connection_pools = OrderedDict()
+MAX_CACHE_SIZE = int(os.environ.get('DBVIEWER_MAX_POOLS', 10))
+DB_POOL_SIZE = int(os.environ.get('DBVIEWER_DB_POOL_SIZE', 4))  # connections per database
+DB_POOL_WAIT_TIMEOUT = float(os.environ.get('DBVIEWER_DB_POOL_WAIT_TIMEOUT', 30))  # seconds to wait for a free connection
+DB_POOL_VALIDATE_AFTER = float(os.environ.get('DBVIEWER_DB_POOL_VALIDATE_AFTER', 300))  # idle seconds before a connection is re-tested
 
-# Thread lock for cache operations
+# Read-only SQLite connection profile for uploaded files and mirrors
+SQLITE_MMAP_SIZE = int(os.environ.get('DBVIEWER_SQLITE_MMAP_SIZE', 256 * 1024 * 1024))  # bytes mapped per connection, 0 disables
+SQLITE_CACHE_SIZE_KB = int(os.environ.get('DBVIEWER_SQLITE_CACHE_SIZE_KB', 16384))  # page cache per connection
+SQLITE_IMMUTABLE = os.environ.get('DBVIEWER_SQLITE_IMMUTABLE', '1').lower() in ('1', 'true', 'yes')  # uploads are never modified in place
+
+# Thread lock for the pool registry; never held while connecting
 cache_lock = threading.Lock()
 
+# Versioned cache of catalog metadata (tables, columns, keys) per database file
+metadata_cache = OrderedDict()
+METADATA_CACHE_SIZE = int(os.environ.get('DBVIEWER_METADATA_CACHE_SIZE', 64))
+metadata_lock = threading.Lock()
+
+# Persistent catalog of uploaded databases, reconciled against the uploads folder
+CATALOG_FILENAME = 'catalog.sqlite'
+CATALOG_RECONCILE_INTERVAL = int(os.environ.get('DBVIEWER_CATALOG_RECONCILE_INTERVAL', 30))  # seconds
+catalog_state = {'last_reconcile': 0.0, 'schema_path': None}
+catalog_lock = threading.Lock()
+CATALOG_SORT_COLUMNS = {
+    'modified_time': 'mtime_ns',
+    'name': 'original_name COLLATE NOCASE',
+    'size': 'file_size',
+    'table_count': 'table_count'
+}
+
+# Row counts per (file version, table, search spec); estimates are refined in the background
+count_cache = OrderedDict()
+COUNT_CACHE_SIZE = int(os.environ.get('DBVIEWER_COUNT_CACHE_SIZE', 1024))
+COUNT_EXACT_THRESHOLD = int(os.environ.get('DBVIEWER_COUNT_EXACT_THRESHOLD', 100000))  # rows; smaller tables are always counted exactly
+COUNT_SAMPLE_ROWS = int(os.environ.get('DBVIEWER_COUNT_SAMPLE_ROWS', 10000))
+count_lock = threading.Lock()
+
+# Table page layouts: 'rows' (list of dicts) or 'columnar' (names once, positional rows)
+TABLE_RESPONSE_FORMATS = ('rows', 'columnar')
+
+# Table page results, compressed: in-process L1 in front of Redis shared by all workers
+page_cache = OrderedDict()
+page_cache_bytes = 0
+PAGE_CACHE_TTL = int(os.environ.get('DBVIEWER_PAGE_CACHE_TTL', 300))  # seconds, 0 disables the cache
+PAGE_CACHE_L1_BYTES = int(os.environ.get('DBVIEWER_PAGE_CACHE_L1_BYTES', 32 * 1024 * 1024))  # compressed bytes per worker
+PAGE_CACHE_MAX_ENTRY_BYTES = int(os.environ.get('DBVIEWER_PAGE_CACHE_MAX_ENTRY_BYTES', 2 * 1024 * 1024))  # larger pages are not cached
+PAGE_CACHE_REDIS_URL = os.environ.get('DBVIEWER_PAGE_CACHE_REDIS_URL', os.environ.get('REDIS_URL', ''))
+page_cache_lock = threading.Lock()
+HTTP_CACHE_MAX_AGE = int(os.environ.get('DBVIEWER_HTTP_CACHE_MAX_AGE', 60))  # seconds browsers/nginx may reuse a response unchecked
+redis_state = {'client': None, 'retry_at': 0.0}
+
+# Streaming exports
+EXPORT_BATCH_SIZE = int(os.environ.get('DBVIEWER_EXPORT_BATCH_SIZE', 2000))
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'jsonl': ('application/x-ndjson', 'jsonl')
+}
+
+# Sidecar files (mirrors, indexes, ...) live in a hidden folder inside uploads
+SIDECAR_FOLDER_NAME = '.dbviewer'
+
+# Background work (mirror conversion, ...) runs off the request path
+BACKGROUND_WORKERS = int(os.environ.get('DBVIEWER_BACKGROUND_WORKERS', 2))
+background_executor = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix='dbviewer-bg')
+background_tasks = set()
+background_lock = threading.Lock()
+
+# Access -> SQLite mirror settings
+MIRROR_BATCH_SIZE = int(os.environ.get('DBVIEWER_MIRROR_BATCH_SIZE', 5000))
+MIRROR_STALE_SECONDS = 300  # A mirror build lock (or FTS build) untouched for this long is treated as abandoned
+
+# Optional per-table full-text (FTS5 trigram) search indexes
+FTS_SCHEMA = 'dbv_fts'
+FTS_MIN_TERM_LENGTH = 3  # Trigram indexes cannot answer shorter substrings
+FTS_BATCH_SIZE = int(os.environ.get('DBVIEWER_FTS_BATCH_SIZE', 5000))
+FTS_AUTO_BUILD = os.environ.get('DBVIEWER_FTS_AUTO_BUILD', '').lower() in ('1', 'true', 'yes')
+
+# Adaptive indexes for frequently sorted/searched columns, built into a sidecar copy or the mirror
+AUTO_INDEX_THRESHOLD = int(os.environ.get('DBVIEWER_AUTO_INDEX_THRESHOLD', 5))  # uses of a column before it is indexed, 0 disables
+AUTO_INDEX_MAX_PER_TABLE = int(os.environ.get('DBVIEWER_AUTO_INDEX_MAX_PER_TABLE', 4))
+AUTO_INDEX_PREFIX = 'dbv_auto_'
+index_rewrite_lock = threading.Lock()  # One rewrite of an indexed copy or mirror at a time per worker
+INDEX_REWRITE_LOCK_STALE_SECONDS = 3600  # A lock marker untouched for this long was left by a dead worker
+INDEX_REWRITE_LOCK_WAIT = 30  # seconds an admin index drop waits for a running rewrite
+
+# Sorted key order of Access tables, so deep pages fetch their rows by key instead of skipping the whole result
+ACCESS_ORDER_CACHE_ENTRIES = int(os.environ.get('DBVIEWER_ACCESS_ORDER_CACHE_ENTRIES', 32))  # orders kept per worker, 0 disables
+ACCESS_ORDER_MAX_FILES = 64  # integer-key orders kept on disk per database
+ACCESS_ORDER_BATCH_SIZE = 5000
+ACCESS_ORDER_FETCH_CHUNK = 100  # keys per IN (...) lookup
+access_order_cache = OrderedDict()  # digest -> memoryview over an mmapped int64 file, or tuple of keys
+access_order_lock = threading.Lock()
+
+# Per-endpoint query time budgets in seconds (0 = unlimited); runaway scans are interrupted
+QUERY_BUDGETS = {
+    'table': float(os.environ.get('DBVIEWER_QUERY_BUDGET_TABLE', 15)),  # table page requests
+    'count': float(os.environ.get('DBVIEWER_QUERY_BUDGET_COUNT', 300)),  # background exact counts
+    'job': float(os.environ.get('DBVIEWER_QUERY_BUDGET_JOB', 600)),  # asynchronous query jobs
+}
+QUERY_DEADLINE_CHECK_STEPS = 1000  # SQLite VM instructions between deadline checks
+
+# Asynchronous query jobs; state lives on disk so any worker can answer polls and cancels
+JOB_KINDS = ('page', 'count')
+JOB_WORKERS = int(os.environ.get('DBVIEWER_JOB_WORKERS', 2))
+JOB_QUEUE_LIMIT = int(os.environ.get('DBVIEWER_JOB_QUEUE_LIMIT', 16))  # queued + running jobs per worker process
+JOB_RETENTION_SECONDS = int(os.environ.get('DBVIEWER_JOB_RETENTION', 3600))  # finished jobs are removed after this
+JOB_HEARTBEAT_SECONDS = 1.0
+JOB_STALE_SECONDS = 30  # A running job without a heartbeat for this long died with its worker
+JOB_PROGRESS_STEPS = 10000  # SQLite VM instructions between progress callbacks
+job_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix='dbviewer-job')
+active_jobs = {}
+jobs_lock = threading.Lock()
+
+# Per-stage request timings (Server-Timing header) and Prometheus metrics at /metrics
+METRICS_ENABLED = os.environ.get('DBVIEWER_METRICS', '1').lower() in ('1', 'true', 'yes')
+METRICS_FLUSH_INTERVAL = float(os.environ.get('DBVIEWER_METRICS_FLUSH_INTERVAL', 5))  # seconds between snapshots shared with other workers
+METRICS_STALE_SECONDS = 86400  # Snapshots of workers gone this long are dropped
+METRICS_MAX_DATABASES = int(os.environ.get('DBVIEWER_METRICS_MAX_DATABASES', 100))  # databases labelled per worker; the rest count as "other"
+METRICS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)  # seconds
+METRICS_HELP = {
+    'dbviewer_requests_total': ('counter', 'Requests handled, by endpoint and status'),
+    'dbviewer_request_duration_seconds': ('histogram', 'Wall-clock time of whole requests, by endpoint'),
+    'dbviewer_stage_duration_seconds': ('histogram', 'Time spent in each stage of a request, by endpoint and stage'),
+    'dbviewer_connection_cache_total': ('counter', 'Connection pool events: hit (idle connection reused), miss (new connection opened), eviction (pool dropped by the LRU)'),
+    'dbviewer_database_queries_total': ('counter', 'Queries run against each database, by kind (databases past the label cap count as "other")'),
+}
+metrics_state = {'pid': None, 'worker_id': None, 'counters': {}, 'histograms': {}, 'databases': set(), 'flushed_at': 0.0}
+metrics_lock = threading.Lock()
+
+# Admin-requested profiling of single requests, kept on disk in a bounded ring
+PROFILE_HEADER = 'X-Profile'
+PROFILE_RING_SIZE = int(os.environ.get('DBVIEWER_PROFILE_RING_SIZE', 20))  # profiles kept, oldest dropped first
+PROFILE_TEXT_LINES = 60  # functions listed by the text view of a profile
+profile_lock = threading.Lock()  # One profiled request at a time: profilers cannot be nested
+
 # Security configuration
 MAX_UPLOAD_SIZE = 100 * 1024 * 1024  # 100MB
 ALLOWED_MIME_TYPES = {
@@ -95,6 +250,31 @@ ALLOWED_MIME_TYPES = {
     'application/octet-stream'  # For .db files
 }
 
+# Streaming upload ingest: parts are validated, hashed and spooled to disk while the body is parsed
+UPLOAD_BUFFER_SIZE = int(os.environ.get('DBVIEWER_UPLOAD_BUFFER_SIZE', 1024 * 1024))  # bytes per disk write
+UPLOAD_HEADER_BYTES = 32  # Leading bytes checked for a database signature
+UPLOAD_STALE_SECONDS = 3600  # Spool files left behind by a dead worker are removed after this
+CONTENT_LOCK_WAIT = 30  # seconds to wait for another worker adding or removing an alias of the same content
+CONTENT_LOCK_STALE_SECONDS = 120  # A content lock marker this old was left by a dead worker
+
+# Chunked, resumable uploads for files beyond the single-request limit
+CHUNKED_UPLOAD_MAX_SIZE = int(os.environ.get('DBVIEWER_CHUNKED_UPLOAD_MAX_SIZE', 2 * 1024 * 1024 * 1024))  # bytes per file
+UPLOAD_CHUNK_SIZE = int(os.environ.get('DBVIEWER_UPLOAD_CHUNK_SIZE', 8 * 1024 * 1024))  # must stay below MAX_CONTENT_LENGTH
+CHUNKED_UPLOAD_STALE_SECONDS = int(os.environ.get('DBVIEWER_CHUNKED_UPLOAD_RETENTION', 86400))  # idle sessions are removed after this
+CHUNKED_UPLOAD_FINALIZE_STALE_SECONDS = 900  # A finalize without progress for this long died with its worker
+CHUNKED_UPLOAD_MAX_SESSIONS_PER_CLIENT = int(os.environ.get('DBVIEWER_CHUNKED_UPLOAD_MAX_SESSIONS_PER_CLIENT', 3))
+CHUNKED_UPLOAD_MAX_BYTES_PER_CLIENT = int(os.environ.get('DBVIEWER_CHUNKED_UPLOAD_MAX_BYTES_PER_CLIENT', 4 * 1024 * 1024 * 1024))  # declared sizes of open sessions
+CHUNKED_UPLOAD_MAX_PENDING_BYTES = int(os.environ.get('DBVIEWER_CHUNKED_UPLOAD_MAX_PENDING_BYTES', 16 * 1024 * 1024 * 1024))  # all clients together
+
+# Background analysis of new uploads (row counts, columns, statistics), kept in the catalog
+ANALYSIS_ENABLED = os.environ.get('DBVIEWER_UPLOAD_ANALYSIS', '1').lower() in ('1', 'true', 'yes')
+ANALYSIS_SAMPLE_ROWS = 200  # rows read per table to estimate row and page sizes
+ANALYSIS_PAGE_ROWS = 50  # rows of the page that page_bytes estimates (the default per_page)
+ANALYSIS_STALE_SECONDS = 1800  # A running analysis without progress for this long died with its worker
+ANALYSIS_RETRY_SECONDS = 300  # first retry of a failed analysis; doubles with each failure
+ANALYSIS_RETRY_MAX_SECONDS = 86400
+ANALYSIS_ANALYZE_MAX_BYTES = int(os.environ.get('DBVIEWER_ANALYSIS_ANALYZE_MAX_BYTES', 512 * 1024 * 1024))  # larger indexed copies/mirrors are not rewritten to run ANALYZE
+
 def handle_database_error(func):
     """Decorator for database operation error handling"""
     @wraps(func)
@@ -132,35 +312,381 @@ def format_pyodbc_error(e: pyodbc.Error) -> str:
         parts.append(str(e)) # Fallback to default string representation
     return " ".join(parts)
 
-def validate_file_content(filepath: str) -> bool:
-    """Validate file content beyond extension checking"""
-    try:
-        # Check file size
-        if os.path.getsize(filepath) > MAX_UPLOAD_SIZE:
+def validate_file_header(header: bytes) -> bool:
+    """Check the leading bytes of a file for a SQLite or Access signature"""
+    # SQLite files start with 'SQLite format 3\000'
+    if header.startswith(b'SQLite format 3'):
+        return True
+        
+    # Access database files have specific signatures
+    # .mdb files typically start with specific bytes
+    if header.startswith(b'\x00\x01\x00\x00Standard Jet DB') or \
+       header.startswith(b'\x00\x01\x00\x00Standard ACE DB'):
+        return True
+        
+    # Additional checks for other Access formats
+    if b'Microsoft' in header[:32] or b'Access' in header[:32]:
+        return True
+        
+    return False
+
+class UploadRejected(Exception):
+    """Raised while an upload is being received, to stop reading a file known to be bad.
+
+    Deliberately not a ValueError: werkzeug's form parser silently swallows those.
+    """
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+def get_incoming_folder():
+    """Spool folder for uploads in progress, on the same filesystem as uploads/ so renames are atomic"""
+    return os.path.join(get_sidecar_folder(), 'incoming')
+
+def cleanup_stale_uploads():
+    """Remove spool files abandoned by workers that died mid-upload, and idle chunked upload sessions"""
+    incoming_folder = get_incoming_folder()
+    if not os.path.isdir(incoming_folder):
+        return
+    now = time.time()
+    for name in os.listdir(incoming_folder):
+        path = os.path.join(incoming_folder, name)
+        try:
+            if os.path.isdir(path):
+                if os.path.getmtime(path) < now - CHUNKED_UPLOAD_STALE_SECONDS:
+                    shutil.rmtree(path, ignore_errors=True)
+            elif os.path.getmtime(path) < now - UPLOAD_STALE_SECONDS:
+                os.remove(path)
+        except OSError:
+            pass
+
+class StreamingUpload:
+    """File-like target the multipart parser writes an uploaded file into.
+
+    Bytes are spooled to a temp file in large buffered writes and hashed with
+    SHA-256 as they arrive. The database signature is checked as soon as the
+    first UPLOAD_HEADER_BYTES are in and the size on every write, so a bad
+    upload is rejected before the rest of it is read. commit() moves the
+    file into place with an atomic rename.
+    """
+
+    def __init__(self, filename):
+        os.makedirs(get_incoming_folder(), exist_ok=True)
+        self.filename = filename
+        self.path = os.path.join(get_incoming_folder(), f"{uuid.uuid4().hex}.part")
+        self.size = 0
+        self.header = b''
+        self.validated = False
+        self.sha256 = hashlib.sha256()
+        self._file = open(self.path, 'w+b', buffering=UPLOAD_BUFFER_SIZE)
+
+    def write(self, data):
+        self.size += len(data)
+        if self.size > MAX_UPLOAD_SIZE:
+            self.discard()
+            raise UploadRejected('file_too_large', f'File too large. Maximum size is {MAX_UPLOAD_SIZE // (1024*1024)}MB')
+        if not self.validated:
+            self.header += data[:UPLOAD_HEADER_BYTES - len(self.header)]
+            if len(self.header) >= UPLOAD_HEADER_BYTES:
+                self._check_header()
+        self.sha256.update(data)
+        return self._file.write(data)
+
+    def _check_header(self):
+        if not validate_file_header(self.header):
+            self.discard()
+            raise UploadRejected('invalid_file_content', 'Invalid file format or corrupted file')
+        self.validated = True
+
+    def finish(self):
+        """Validate a file shorter than the signature and flush it; returns its SHA-256 hex digest"""
+        if self.size and not self.validated:
+            self._check_header()
+        self._file.flush()
+        return self.sha256.hexdigest()
+
+    def commit(self, destination):
+        """Atomically move the validated file into the uploads folder"""
+        self._file.close()
+        os.replace(self.path, destination)
+        self.path = None
+
+    def discard(self):
+        """Close and delete the spool file unless it was committed"""
+        if not self._file.closed:
+            self._file.close()
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+    # The parser and FileStorage also read, seek and close the stream
+    def read(self, *args):
+        return self._file.read(*args)
+
+    def readline(self, *args):
+        return self._file.readline(*args)
+
+    def seek(self, *args):
+        return self._file.seek(*args)
+
+    def tell(self):
+        return self._file.tell()
+
+    def close(self):
+        self.discard()
+
+class UploadQuotaExceeded(Exception):
+    """A chunked upload session cannot be opened without exceeding a per-client or global limit"""
+
+    def __init__(self, message, status=429):
+        super().__init__(message)
+        self.status = status
+
+class ChunkedUpload:
+    """A resumable upload assembled from numbered chunks, possibly sent in parallel to different workers.
+
+    Its state lives in a folder under incoming/: session.json, the data file
+    (a sparse file of the full size, so each chunk is written at its offset)
+    and one marker per received chunk holding that chunk's SHA-256. Chunk 0
+    is checked for a database signature as soon as it arrives. commit() and
+    discard() match StreamingUpload, so finalized uploads are stored the
+    same way.
+    """
+
+    def __init__(self, upload_id):
+        self.upload_id = upload_id
+        self.folder = os.path.join(get_incoming_folder(), upload_id)
+        self.data_path = os.path.join(self.folder, 'data')
+
+    @classmethod
+    def create(cls, filename, size, client):
+        """Open a session for `client`, unless its sessions or all sessions together would exceed their limits"""
+        os.makedirs(get_incoming_folder(), exist_ok=True)
+        # Sessions are counted and created under one lock, so parallel inits on other workers cannot overshoot
+        marker_path = os.path.join(get_incoming_folder(), 'sessions.lock')
+        if not acquire_lock_marker(marker_path, 10, 60):
+            raise UploadQuotaExceeded('Upload service is busy, try again shortly', 503)
+        try:
+            cls._check_quota(size, client)
+            upload = cls(uuid.uuid4().hex)
+            os.makedirs(upload.folder)
+            try:
+                # Sparse: disk is only used as chunks arrive, so an idle session reserves nothing
+                with open(upload.data_path, 'wb') as f:
+                    f.truncate(size)
+                upload.session = {
+                    'id': upload.upload_id, 'filename': filename, 'size': size, 'client': client,
+                    'chunk_size': UPLOAD_CHUNK_SIZE, 'chunk_count': -(-size // UPLOAD_CHUNK_SIZE),
+                    'created': datetime.now().isoformat()
+                }
+                with open(os.path.join(upload.folder, 'session.json'), 'w', encoding='utf-8') as f:
+                    json.dump(upload.session, f)
+            except Exception:
+                upload.discard()
+                raise
+            return upload
+        finally:
+            os.remove(marker_path)
+
+    @classmethod
+    def open_sessions(cls):
+        """Every session still waiting for chunks or a finalize"""
+        sessions = []
+        for name in os.listdir(get_incoming_folder()):
+            upload = cls.load(name)
+            if upload is not None:
+                sessions.append(upload)
+        return sessions
+
+    @classmethod
+    def _check_quota(cls, size, client):
+        sessions = cls.open_sessions()
+        own = [upload for upload in sessions if upload.session.get('client') == client]
+        if len(own) >= CHUNKED_UPLOAD_MAX_SESSIONS_PER_CLIENT:
+            raise UploadQuotaExceeded(f'Too many unfinished uploads (at most {CHUNKED_UPLOAD_MAX_SESSIONS_PER_CLIENT}); '
+                                      'finish or cancel one first')
+        if sum(upload.session['size'] for upload in own) + size > CHUNKED_UPLOAD_MAX_BYTES_PER_CLIENT:
+            raise UploadQuotaExceeded('Unfinished uploads would exceed the per-client size limit; finish or cancel one first')
+        if sum(upload.session['size'] for upload in sessions) + size > CHUNKED_UPLOAD_MAX_PENDING_BYTES:
+            raise UploadQuotaExceeded('Too much upload data is pending on the server, try again later', 503)
+        # The space still to be written by open sessions has to fit as well
+        outstanding = sum(upload.session['size'] - upload.received_bytes() for upload in sessions)
+        if shutil.disk_usage(get_incoming_folder()).free < outstanding + size:
+            raise UploadQuotaExceeded('Not enough space to receive this file', 507)
+
+    def received_bytes(self):
+        try:
+            return sum(self.chunk_length(index) for index in self.received_chunks())
+        except FileNotFoundError:
+            return self.session['size']  # Finalized or discarded meanwhile
+
+    @classmethod
+    def load(cls, upload_id):
+        """The session for an id, or None if it is unknown, finished or expired"""
+        if not re.fullmatch(r'[0-9a-f]{32}', upload_id or ''):
+            return None
+        upload = cls(upload_id)
+        try:
+            with open(os.path.join(upload.folder, 'session.json'), encoding='utf-8') as f:
+                upload.session = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return upload
+
+    def chunk_length(self, index):
+        return min(self.session['chunk_size'], self.session['size'] - index * self.session['chunk_size'])
+
+    def _marker_path(self, index):
+        return os.path.join(self.folder, f"{index}.chunk")
+
+    def received_chunks(self):
+        return sorted(int(name.split('.')[0]) for name in os.listdir(self.folder) if name.endswith('.chunk'))
+
+    def status(self):
+        received = self.received_chunks()
+        public = {key: value for key, value in self.session.items() if key != 'client'}
+        return dict(public, received=received, missing=self.session['chunk_count'] - len(received))
+
+    def write_chunk(self, index, stream, expected_sha256=None):
+        """Write chunk `index` from a request body at its offset; returns the chunk's SHA-256"""
+        if not 0 <= index < self.session['chunk_count']:
+            raise UploadRejected('invalid_chunk', f"Chunk index out of range (0-{self.session['chunk_count'] - 1})")
+        length = self.chunk_length(index)
+        sha256 = hashlib.sha256()
+        header = b''
+        received = 0
+        with open(self.data_path, 'r+b', buffering=0) as f:
+            f.seek(index * self.session['chunk_size'])
+            while True:
+                block = stream.read(min(UPLOAD_BUFFER_SIZE, length - received + 1))
+                if not block:
+                    break
+                received += len(block)
+                if received > length:
+                    raise UploadRejected('invalid_chunk', f"Chunk {index} is larger than {length} bytes")
+                if index == 0 and len(header) < UPLOAD_HEADER_BYTES:
+                    header += block[:UPLOAD_HEADER_BYTES - len(header)]
+                    if (len(header) >= UPLOAD_HEADER_BYTES or received == length) and not validate_file_header(header):
+                        # Nothing more of this file is wanted
+                        self.discard()
+                        raise UploadRejected('invalid_file_content', 'Invalid file format or corrupted file')
+                sha256.update(block)
+                f.write(block)
+        if received != length:
+            raise UploadRejected('invalid_chunk', f"Chunk {index} should be {length} bytes, got {received}")
+        digest = sha256.hexdigest()
+        if expected_sha256 and expected_sha256.lower() != digest:
+            raise UploadRejected('chunk_checksum_mismatch', f"Chunk {index} does not match its checksum; send it again")
+        tmp_path = f"{self._marker_path(index)}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(digest)
+        os.replace(tmp_path, self._marker_path(index))
+        return digest
+
+    @staticmethod
+    def finalize_path(upload_id):
+        """State of a finalize, kept outside the session folder because storing the file removes that"""
+        return os.path.join(get_incoming_folder(), f"{upload_id}.finalize.json")
+
+    @classmethod
+    def finalize_state(cls, upload_id):
+        """{'state': 'finalizing'} while the file is hashed and stored, then the stored response.
+
+        None before a finalize, and for a finalize whose worker died (no progress
+        for CHUNKED_UPLOAD_FINALIZE_STALE_SECONDS), which may then be retried.
+        """
+        path = cls.finalize_path(upload_id)
+        try:
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+            stale = time.time() - os.path.getmtime(path) > CHUNKED_UPLOAD_FINALIZE_STALE_SECONDS
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            state, stale = None, False  # Claimed, state not written yet
+        if not isinstance(state, dict):
+            state = {'state': 'finalizing'}
+        if state['state'] == 'finalizing' and stale:
+            return None
+        return state
+
+    def claim_finalize(self):
+        """True for exactly one caller, so a repeated finalize cannot store the file twice"""
+        # A claim left by a worker that died mid-finalize goes stale and can be taken over
+        if not acquire_lock_marker(self.finalize_path(self.upload_id), 0, CHUNKED_UPLOAD_FINALIZE_STALE_SECONDS):
             return False
-            
-        # Read first few bytes to identify file type
-        with open(filepath, 'rb') as f:
-            header = f.read(32)
-            
-        # SQLite files start with 'SQLite format 3\000'
-        if header.startswith(b'SQLite format 3'):
-            return True
-            
-        # Access database files have specific signatures
-        # .mdb files typically start with specific bytes
-        if header.startswith(b'\x00\x01\x00\x00Standard Jet DB') or \
-           header.startswith(b'\x00\x01\x00\x00Standard ACE DB'):
-            return True
-            
-        # Additional checks for other Access formats
-        if b'Microsoft' in header[:32] or b'Access' in header[:32]:
-            return True
-            
-        return False
-    except Exception as e:
-        security_logger.warning(f"File validation failed for {filepath}: {e}")
-        return False
+        self.write_finalize_state({'state': 'finalizing'})
+        return True
+
+    def release_finalize(self):
+        try:
+            os.remove(self.finalize_path(self.upload_id))
+        except OSError:
+            pass
+
+    def write_finalize_state(self, state):
+        path = self.finalize_path(self.upload_id)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    def file_sha256(self):
+        """SHA-256 of the assembled file; chunks arrive out of order, so it is one sequential read"""
+        sha256 = hashlib.sha256()
+        finalize_path = self.finalize_path(self.upload_id)
+        with open(self.data_path, 'rb') as f:
+            for i, block in enumerate(iter(lambda: f.read(UPLOAD_BUFFER_SIZE), b'')):
+                sha256.update(block)
+                if i % 256 == 255:
+                    os.utime(finalize_path)  # Shows the finalize is still alive
+        return sha256.hexdigest()
+
+    def finalize(self):
+        """Hash and store the assembled file, recording the upload response for the client to poll"""
+        try:
+            with app.app_context():
+                try:
+                    sha256 = self.file_sha256()
+                except Exception as e:
+                    upload_logger.error(f"Could not hash chunked upload {self.upload_id}: {e}")
+                    self.release_finalize()  # The chunks are intact, so finalizing may be retried
+                    return
+                response = register_upload(self, sha256, self.session['filename'], self.session['size'])
+                response, status = response if isinstance(response, tuple) else (response, response.status_code)
+                body = response.get_json()
+        except Exception as e:
+            upload_logger.error(f"Unexpected error finalizing chunked upload {self.upload_id}: {e}")
+            self.discard()
+            body, status = {'error': 'Upload failed due to server error'}, 500
+        self.write_finalize_state({'state': 'done' if status < 400 else 'failed', 'status': status, 'response': body})
+
+    def commit(self, destination):
+        os.replace(self.data_path, destination)
+        self.discard()
+
+    def discard(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+class DBViewerRequest(Request):
+    """Request whose /upload file parts stream through StreamingUpload instead of werkzeug's temp files"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.endpoint != 'upload_file':
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        if not filename or not allowed_file(filename):
+            raise UploadRejected('invalid_file_type', 'Invalid file type. Only .mdb, .accdb, .sqlite, and .db files are allowed')
+        upload = StreamingUpload(filename)
+        if not hasattr(self, 'streaming_uploads'):
+            self.streaming_uploads = []
+        self.streaming_uploads.append(upload)
+        return upload
+
+app.request_class = DBViewerRequest
 
 def sanitize_filename(filename: str) -> str:
     """Enhanced filename sanitization"""
@@ -185,8 +711,10 @@ def allowed_file(filename):
 def get_database_info(filepath):
     """Get basic database information"""
     try:
-        conn = get_db_connection(filepath)
-        tables = get_tables(conn)
+        source = resolve_upload_path(filepath)
+        read_path = resolve_read_path(source)
+        conn = get_db_connection(read_path)
+        tables = get_cached_tables(conn, read_path)
         file_size = os.path.getsize(filepath)
         modified_time = datetime.fromtimestamp(os.path.getmtime(filepath))
         
@@ -198,31 +726,547 @@ def get_database_info(filepath):
             'table_count': len(tables),
             'file_size': file_size,
             'modified_time': modified_time.isoformat(),
-            'upload_time': datetime.now().isoformat()
+            'upload_time': datetime.now().isoformat(),
+            'mirror_status': get_mirror_status(source)
         }
     except Exception as e:
         logger.error(f"Error getting database info for {filepath}: {e}")
         return None
 
-def get_all_databases():
-    """Get information about all uploaded databases"""
-    databases = []
+def get_catalog_connection():
+    """Open the catalog database, creating its schema once per process"""
+    catalog_path = os.path.join(get_sidecar_folder(), CATALOG_FILENAME)
+    schema_ready = catalog_state.get('schema_path') == catalog_path and os.path.exists(catalog_path)
+    if not schema_ready:
+        os.makedirs(get_sidecar_folder(), exist_ok=True)
+    conn = sqlite3.connect(catalog_path, timeout=30.0)
+    conn.row_factory = sqlite3.Row
+    if not schema_ready:
+        create_catalog_schema(conn)
+        catalog_state['schema_path'] = catalog_path
+    return conn
+
+def create_catalog_schema(conn):
+    """Create the catalog tables and indexes that do not exist yet"""
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS databases (
+            filename TEXT PRIMARY KEY,
+            original_name TEXT NOT NULL,
+            file_size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            modified_time TEXT NOT NULL,
+            upload_time TEXT NOT NULL,
+            table_count INTEGER NOT NULL,
+            tables_json TEXT NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_databases_mtime ON databases(mtime_ns)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_databases_name ON databases(original_name COLLATE NOCASE)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_databases_size ON databases(file_size)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_databases_table_count ON databases(table_count)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS column_usage (
+            filename TEXT NOT NULL,
+            table_name TEXT NOT NULL,
+            column_name TEXT NOT NULL,
+            sorts INTEGER NOT NULL DEFAULT 0,
+            searches INTEGER NOT NULL DEFAULT 0,
+            last_used REAL NOT NULL,
+            suppressed INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (filename, table_name, column_name)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS database_analysis (
+            filename TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            tables_done INTEGER NOT NULL DEFAULT 0,
+            tables_total INTEGER NOT NULL DEFAULT 0,
+            read_file TEXT,
+            read_size INTEGER,
+            read_mtime_ns INTEGER,
+            stats_json TEXT NOT NULL DEFAULT '{}',
+            error TEXT,
+            updated REAL NOT NULL
+        )
+    """)
+    aliases_existed = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'upload_aliases'").fetchone()
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS upload_aliases (
+            filename TEXT PRIMARY KEY,
+            content TEXT NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_upload_aliases_content ON upload_aliases(content)")
+    if not aliases_existed:
+        # Aliases made before reference counts were kept in the catalog
+        upload_folder = app.config['UPLOAD_FOLDER']
+        if os.path.isdir(upload_folder):
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO upload_aliases (filename, content) VALUES (?, ?)", [
+                    (entry.name, os.path.basename(resolve_upload_path(entry.path)))
+                    for entry in os.scandir(upload_folder) if entry.is_symlink() and allowed_file(entry.name)
+                ])
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS unreadable_files (
+            filename TEXT PRIMARY KEY,
+            file_size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            failed_at REAL NOT NULL
+        )
+    """)
+
+def catalog_upsert(db_info):
+    """Record (or refresh) a database in the catalog, keeping its original upload time"""
+    mtime_ns = os.stat(db_info['filepath']).st_mtime_ns
+    conn = get_catalog_connection()
+    try:
+        with conn:
+            conn.execute("""
+                INSERT INTO databases (filename, original_name, file_size, mtime_ns, modified_time,
+                                       upload_time, table_count, tables_json)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(filename) DO UPDATE SET
+                    original_name = excluded.original_name,
+                    file_size = excluded.file_size,
+                    mtime_ns = excluded.mtime_ns,
+                    modified_time = excluded.modified_time,
+                    table_count = excluded.table_count,
+                    tables_json = excluded.tables_json
+            """, (
+                db_info['filename'], db_info['original_name'], db_info['file_size'], mtime_ns,
+                db_info['modified_time'], db_info['upload_time'], db_info['table_count'],
+                json.dumps(db_info['tables'])
+            ))
+    finally:
+        conn.close()
+
+def catalog_remove(filename):
+    """Forget a database in the catalog"""
+    conn = get_catalog_connection()
+    try:
+        with conn:
+            conn.execute("DELETE FROM databases WHERE filename = ?", (filename,))
+            conn.execute("DELETE FROM column_usage WHERE filename = ?", (filename,))
+            conn.execute("DELETE FROM database_analysis WHERE filename = ?", (filename,))
+            conn.execute("DELETE FROM unreadable_files WHERE filename = ?", (filename,))
+            conn.execute("DELETE FROM upload_aliases WHERE filename = ?", (filename,))
+    finally:
+        conn.close()
+
+def store_database_analysis(filename, status, tables_done=0, tables_total=0, read_path=None, stats=None, error=None):
+    """Record the progress or result of a database's post-upload analysis"""
+    read_version = get_file_version(read_path) if read_path else (None, None)
+    conn = get_catalog_connection()
+    try:
+        with conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO database_analysis (filename, status, tables_done, tables_total, read_file,
+                                                          read_size, read_mtime_ns, stats_json, error, updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                filename, status, tables_done, tables_total, os.path.basename(read_path) if read_path else None,
+                read_version[0], read_version[1], json.dumps(stats or {}), error, time.time()
+            ))
+    finally:
+        conn.close()
+
+def load_database_analyses(filenames):
+    """Analysis records of the given content files, by filename"""
+    filenames = list(set(filenames))
+    if not filenames:
+        return {}
+    conn = get_catalog_connection()
+    try:
+        rows = conn.execute(
+            f"SELECT * FROM database_analysis WHERE filename IN ({', '.join('?' * len(filenames))})", filenames
+        ).fetchall()
+    finally:
+        conn.close()
+    return {row['filename']: dict(row, stats=json.loads(row['stats_json'])) for row in rows}
+
+def describe_database_analysis(record):
+    """Public view of an analysis record for database listings"""
+    if record is None:
+        return {'status': 'pending' if ANALYSIS_ENABLED else 'disabled', 'tables_done': 0, 'tables_total': 0}
+    stats = record['stats']
+    return {
+        'status': record['status'],
+        'tables_done': record['tables_done'],
+        'tables_total': record['tables_total'],
+        'error': record['error'],
+        'statistics': stats.get('statistics', False),
+        'page_size': stats.get('page_size'),
+        'page_count': stats.get('page_count'),
+        'tables': {
+            name: {key: table[key] for key in ('rows', 'column_count', 'avg_row_bytes', 'page_bytes')}
+            for name, table in stats.get('tables', {}).items()
+        },
+        'updated': datetime.fromtimestamp(record['updated']).isoformat()
+    }
+
+def record_column_usage(filename, table_name, column_name, kind):
+    """Count a sort or search on a column; returns (uses, suppressed)"""
+    counter = 'sorts' if kind == 'sort' else 'searches'
+    conn = get_catalog_connection()
+    try:
+        with conn:
+            updated = conn.execute(
+                f"UPDATE column_usage SET {counter} = {counter} + 1, last_used = ? "
+                "WHERE filename = ? AND table_name = ? AND column_name = ?",
+                (time.time(), filename, table_name, column_name)
+            ).rowcount
+            if not updated:
+                conn.execute(
+                    f"INSERT OR IGNORE INTO column_usage (filename, table_name, column_name, {counter}, last_used) "
+                    "VALUES (?, ?, ?, 1, ?)",
+                    (filename, table_name, column_name, time.time())
+                )
+            row = conn.execute(
+                "SELECT sorts + searches, suppressed FROM column_usage "
+                "WHERE filename = ? AND table_name = ? AND column_name = ?",
+                (filename, table_name, column_name)
+            ).fetchone()
+        return (row[0], bool(row[1])) if row else (0, False)
+    finally:
+        conn.close()
+
+def catalog_mark_unreadable(filename, version):
+    """Remember that a file version could not be opened, so reconciling does not retry it until it changes"""
+    conn = get_catalog_connection()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO unreadable_files (filename, file_size, mtime_ns, failed_at) VALUES (?, ?, ?, ?)",
+                (filename, version[0], version[1], time.time())
+            )
+    finally:
+        conn.close()
+
+def reconcile_catalog(force=False):
+    """Bring the catalog in line with the uploads folder.
+
+    Only files that are new or whose size/mtime changed are opened; the rest
+    cost one stat() each. Files that cannot be opened are remembered by
+    size/mtime and only retried once they change. Runs at most once per
+    CATALOG_RECONCILE_INTERVAL per process unless forced.
+    """
     upload_folder = app.config['UPLOAD_FOLDER']
-    
-    if not os.path.exists(upload_folder):
-        return databases
-    
-    for filename in os.listdir(upload_folder):
-        if allowed_file(filename):
+    with catalog_lock:
+        now = time.time()
+        if not force and now - catalog_state['last_reconcile'] < CATALOG_RECONCILE_INTERVAL:
+            return
+        catalog_state['last_reconcile'] = now
+
+        on_disk = {}
+        if os.path.exists(upload_folder):
+            for entry in os.scandir(upload_folder):
+                if allowed_file(entry.name) and entry.is_file():
+                    stat = entry.stat()
+                    on_disk[entry.name] = (stat.st_size, stat.st_mtime_ns)
+
+        conn = get_catalog_connection()
+        try:
+            known = {row['filename']: (row['file_size'], row['mtime_ns'])
+                     for row in conn.execute("SELECT filename, file_size, mtime_ns FROM databases")}
+            unreadable = {row['filename']: (row['file_size'], row['mtime_ns'])
+                          for row in conn.execute("SELECT filename, file_size, mtime_ns FROM unreadable_files")}
+        finally:
+            conn.close()
+
+        for filename in (set(known) | set(unreadable)) - set(on_disk):
+            catalog_remove(filename)
+        for filename, version in on_disk.items():
+            if known.get(filename) == version or unreadable.get(filename) == version:
+                continue
             filepath = os.path.join(upload_folder, filename)
-            if os.path.isfile(filepath):
-                db_info = get_database_info(filepath)
-                if db_info:
-                    databases.append(db_info)
-    
-    # Sort by upload time (newest first)
-    databases.sort(key=lambda x: x['modified_time'], reverse=True)
-    return databases
+            if filename in unreadable:
+                catalog_remove(filename)
+            if os.path.islink(filepath):
+                catalog_add_alias(filename, resolve_upload_path(filepath))
+            db_info = get_database_info(filepath)
+            if db_info:
+                catalog_upsert(db_info)
+                schedule_database_analysis(resolve_upload_path(db_info['filepath']))
+            else:
+                catalog_mark_unreadable(filename, version)
+
+def list_catalog_databases(page=None, per_page=None, sort='modified_time', order='DESC'):
+    """Read one (optionally paginated) slice of the catalog; returns (databases, total)"""
+    reconcile_catalog()
+    order_by = CATALOG_SORT_COLUMNS.get(sort, CATALOG_SORT_COLUMNS['modified_time'])
+    order = 'ASC' if order == 'ASC' else 'DESC'
+    query = f"SELECT * FROM databases ORDER BY {order_by} {order}, filename"
+    params = []
+    if page is not None and per_page is not None:
+        query += " LIMIT ? OFFSET ?"
+        params = [per_page, (page - 1) * per_page]
+
+    upload_folder = app.config['UPLOAD_FOLDER']
+    conn = get_catalog_connection()
+    try:
+        total = conn.execute("SELECT COUNT(*) FROM databases").fetchone()[0]
+        databases = []
+        sources = []
+        for row in conn.execute(query, params):
+            filepath = os.path.join(upload_folder, row['filename'])
+            tables = json.loads(row['tables_json'])
+            source = resolve_upload_path(filepath)
+            sources.append(source)
+            databases.append({
+                'filepath': filepath,
+                'filename': row['filename'],
+                'original_name': row['original_name'],
+                'tables': tables,
+                'table_count': row['table_count'],
+                'file_size': row['file_size'],
+                'modified_time': row['modified_time'],
+                'upload_time': row['upload_time'],
+                'mirror_status': get_mirror_status(source)
+            })
+    finally:
+        conn.close()
+    # Analysis is recorded against the content file, which all aliases share
+    analyses = load_database_analyses(os.path.basename(source) for source in sources)
+    for database, source in zip(databases, sources):
+        record = analyses.get(os.path.basename(source))
+        if ANALYSIS_ENABLED and analysis_due(source, record):
+            # Failed analyses are retried and stale ones refreshed as the list is polled
+            schedule_database_analysis(source)
+        database['analysis'] = describe_database_analysis(record)
+    return databases, total
+
+def get_all_databases():
+    """Get information about all uploaded databases (newest first)"""
+    return list_catalog_databases()[0]
+
+def _metrics_labels(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _metrics_worker_state():
+    """This process's metrics; a forked worker starts from zero under its own id"""
+    if metrics_state['pid'] != os.getpid():
+        metrics_state.update(
+            pid=os.getpid(), worker_id=f"{os.getpid()}-{uuid.uuid4().hex[:8]}",
+            counters={}, histograms={}, databases=set(), flushed_at=0.0
+        )
+    return metrics_state
+
+def metrics_count_query(database_id, kind):
+    """Count a query against a database, labelled by database until this worker labels METRICS_MAX_DATABASES of them"""
+    if not METRICS_ENABLED:
+        return
+    with metrics_lock:
+        databases = _metrics_worker_state()['databases']
+        if database_id not in databases:
+            if len(databases) >= METRICS_MAX_DATABASES:
+                database_id = 'other'
+            else:
+                databases.add(database_id)
+    metrics_inc('dbviewer_database_queries_total', database=database_id, kind=kind)
+
+def _drop_database_series(counters, database_ids):
+    for key in [key for key in counters if key[0] == 'dbviewer_database_queries_total'
+                and dict(key[1]).get('database') in database_ids]:
+        del counters[key]
+
+def metrics_forget_database(database_id):
+    """Drop a deleted database's query series from this worker (other workers prune theirs when they flush)"""
+    if not METRICS_ENABLED:
+        return
+    with metrics_lock:
+        state = _metrics_worker_state()
+        state['databases'].discard(database_id)
+        _drop_database_series(state['counters'], {database_id})
+
+def _missing_databases(database_ids):
+    upload_folder = app.config['UPLOAD_FOLDER']
+    return {database_id for database_id in database_ids
+            if database_id != 'other' and not os.path.lexists(os.path.join(upload_folder, database_id))}
+
+def metrics_inc(name, amount=1, **labels):
+    """Add to a counter"""
+    if not METRICS_ENABLED:
+        return
+    key = (name, _metrics_labels(labels))
+    with metrics_lock:
+        counters = _metrics_worker_state()['counters']
+        counters[key] = counters.get(key, 0) + amount
+
+def metrics_observe(name, value, **labels):
+    """Record one observation in a histogram"""
+    if not METRICS_ENABLED:
+        return
+    key = (name, _metrics_labels(labels))
+    with metrics_lock:
+        histograms = _metrics_worker_state()['histograms']
+        entry = histograms.get(key)
+        if entry is None:
+            # Bucket counts (non-cumulative, +Inf last), then sum and count
+            entry = histograms[key] = [0] * (len(METRICS_BUCKETS) + 1) + [0.0, 0]
+        for i, bound in enumerate(METRICS_BUCKETS):
+            if value <= bound:
+                break
+        else:
+            i = len(METRICS_BUCKETS)
+        entry[i] += 1
+        entry[-2] += value
+        entry[-1] += 1
+
+def record_stage(name, seconds):
+    """Record a request stage for the Server-Timing header and the stage histogram"""
+    endpoint = 'background'
+    if has_request_context():
+        endpoint = request.endpoint or 'unknown'
+        g.setdefault('stage_timings', []).append((name, seconds))
+    metrics_observe('dbviewer_stage_duration_seconds', seconds, endpoint=endpoint, stage=name)
+
+class timed_stage:
+    """Context manager timing one stage of the current request (or of background work)"""
+
+    def __init__(self, name):
+        self.name = name
+        self.started = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record_stage(self.name, time.perf_counter() - self.started)
+        return False
+
+def get_metrics_folder():
+    """Folder holding each worker's latest metrics snapshot"""
+    return os.path.join(get_sidecar_folder(), 'metrics')
+
+def _metrics_snapshot():
+    with metrics_lock:
+        state = _metrics_worker_state()
+        return {
+            'worker_id': state['worker_id'],
+            'counters': [[name, labels, value] for (name, labels), value in state['counters'].items()],
+            'histograms': [[name, labels, list(entry)] for (name, labels), entry in state['histograms'].items()]
+        }
+
+def flush_metrics(force=False):
+    """Write this worker's metrics to its snapshot file, at most every METRICS_FLUSH_INTERVAL seconds"""
+    if not METRICS_ENABLED:
+        return
+    now = time.time()
+    with metrics_lock:
+        state = _metrics_worker_state()
+        if not force and now - state['flushed_at'] < METRICS_FLUSH_INTERVAL:
+            return
+        state['flushed_at'] = now
+        labelled = set(state['databases'])
+    # Databases deleted or expired through another worker
+    for database_id in _missing_databases(labelled):
+        metrics_forget_database(database_id)
+    snapshot = _metrics_snapshot()
+    try:
+        os.makedirs(get_metrics_folder(), exist_ok=True)
+        path = os.path.join(get_metrics_folder(), f"{snapshot['worker_id']}.json")
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f)
+        os.replace(f"{path}.tmp", path)
+    except OSError as e:
+        logger.warning(f"Could not write metrics snapshot: {e}")
+
+def collect_metrics():
+    """Sum the snapshots of every worker, using this worker's live values for itself"""
+    snapshots = {}
+    metrics_folder = get_metrics_folder()
+    if os.path.isdir(metrics_folder):
+        cutoff = time.time() - METRICS_STALE_SECONDS
+        for name in os.listdir(metrics_folder):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(metrics_folder, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    continue
+                with open(path, encoding='utf-8') as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            snapshots[snapshot.get('worker_id')] = snapshot
+    own = _metrics_snapshot()
+    snapshots[own['worker_id']] = own
+
+    counters = {}
+    histograms = {}
+    for snapshot in snapshots.values():
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(tuple(label) for label in labels))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, entry in snapshot['histograms']:
+            key = (name, tuple(tuple(label) for label in labels))
+            total = histograms.get(key)
+            histograms[key] = list(entry) if total is None else [a + b for a, b in zip(total, entry)]
+    # Snapshots written before a database was deleted may still carry its series
+    _drop_database_series(counters, _missing_databases(
+        {dict(labels).get('database') for name, labels in counters if name == 'dbviewer_database_queries_total'} - {None}
+    ))
+    return counters, histograms
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = []
+    for key, value in pairs:
+        value = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{key}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+def render_metrics():
+    """Metrics of all workers in the Prometheus text exposition format"""
+    counters, histograms = collect_metrics()
+    lines = []
+    for name, (kind, help_text) in METRICS_HELP.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == 'counter':
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+        else:
+            for (metric, labels), entry in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(METRICS_BUCKETS + ('+Inf',), entry[:-2]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labels, [('le', str(bound))])} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {entry[-2]:.6f}")
+                lines.append(f"{name}_count{_format_labels(labels)} {entry[-1]}")
+    return '\n'.join(lines) + '\n'
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def add_server_timing(response):
+    """Report the request's stages in a Server-Timing header and count the request"""
+    started = g.get('request_started')
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    stages = g.get('stage_timings', [])
+    if stages:
+        response.headers['Server-Timing'] = ', '.join(
+            [f"{name};dur={seconds * 1000:.1f}" for name, seconds in stages] + [f"total;dur={elapsed * 1000:.1f}"]
+        )
+    endpoint = request.endpoint or 'unknown'
+    if endpoint != 'metrics':
+        metrics_inc('dbviewer_requests_total', endpoint=endpoint, status=response.status_code)
+        metrics_observe('dbviewer_request_duration_seconds', elapsed, endpoint=endpoint)
+        flush_metrics()
+    return response
 
 def get_connection_string(filepath):
     """Generate connection string for Access database"""
@@ -231,112 +1275,260 @@ def get_connection_string(filepath):
     else:
         return f'DRIVER={{Microsoft Access Driver (*.mdb)}};DBQ={filepath};'
 
+def sqlite_read_only_uri(filepath: str) -> str:
+    """Build a read-only SQLite URI, marked immutable when configured"""
+    uri = f"file:{urllib.parse.quote(os.path.abspath(filepath))}?mode=ro"
+    if SQLITE_IMMUTABLE:
+        # Files are replaced by rename, never rewritten, so SQLite can skip locking entirely
+        uri += "&immutable=1"
+    return uri
+
+def open_db_connection(filepath: str):
+    """Open a new, uncached connection to a database file"""
+    file_ext = filepath.rsplit('.', 1)[-1].lower()
+    conn = None
+
+    if file_ext in ['mdb', 'accdb']:
+        try:
+            conn_str = get_connection_string(filepath)
+            conn = pyodbc.connect(conn_str, timeout=30)
+            # Set encoding with better error handling
+            try:
+                conn.setdecoding(pyodbc.SQL_CHAR, encoding='utf-8')
+                conn.setdecoding(pyodbc.SQL_WCHAR, encoding='utf-8')
+                conn.setencoding(encoding='utf-8')
+            except Exception as encoding_error:
+                db_logger.warning(f"Could not set encoding for Access DB {filepath}: {encoding_error}")
+            
+            # Test the connection
+            cursor = conn.cursor()
+            # Use a query more likely to be supported by MDBTools
+            cursor.execute("SELECT count(*) FROM MSysObjects")
+            cursor.fetchone()
+            
+            db_logger.info(f"Successfully connected to Access DB: {filepath}")
+        except Exception as e:
+            error_details = format_pyodbc_error(e) if isinstance(e, pyodbc.Error) else str(e)
+            db_logger.error(f"Failed to connect to Access DB {filepath}: {error_details}")
+            raise ConnectionError(f"Failed to connect to Access database: {error_details}")
+            
+    elif file_ext in ['sqlite', 'db']:
+        try:
+            # Uploads are only ever read: open read-only so no -wal/-shm files or locks are created
+            conn = sqlite3.connect(
+                sqlite_read_only_uri(filepath),
+                uri=True,
+                check_same_thread=False,
+                timeout=30.0
+            )
+            conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+            conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+            conn.execute("PRAGMA query_only=ON")
+            
+            # Test the connection
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            
+            db_logger.info(f"Successfully connected to SQLite DB: {filepath}")
+        except Exception as e:
+            db_logger.error(f"Failed to connect to SQLite DB {filepath}: {e}")
+            raise ConnectionError(f"Failed to connect to SQLite database: {str(e)}")
+    else:
+        error_msg = f"Unsupported database type: {file_ext} for file {filepath}"
+        db_logger.error(error_msg)
+        raise ValueError(error_msg)
+    return conn
+
+def _connection_alive(conn):
+    """Run a trivial query to check a connection still works"""
+    try:
+        cursor = conn.cursor()
+        if isinstance(conn, pyodbc.Connection):
+            # Use a query more likely to be supported by MDBTools
+            cursor.execute("SELECT count(*) FROM MSysObjects")
+        else:  # SQLite
+            cursor.execute("SELECT 1")
+        cursor.fetchone()
+        return True
+    except Exception as e:
+        error_details = format_pyodbc_error(e) if isinstance(e, pyodbc.Error) else str(e)
+        db_logger.warning(f"Pooled connection invalid: {error_details}")
+        return False
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception as e:
+        db_logger.warning(f"Error closing connection: {e}")
+
+class PoolClosedError(ConnectionError):
+    """Raised to a waiter whose pool was closed (file rewritten, evicted or deleted)"""
+
+class ConnectionPool:
+    """Bounded pool of connections to one database file.
+
+    Checkout only takes this pool's condition lock, and connecting happens
+    outside it, so a slow Access open never blocks requests for other
+    databases. Idle connections are re-tested only after sitting unused for
+    DB_POOL_VALIDATE_AFTER seconds.
+    """
+
+    def __init__(self, filepath, size):
+        self.filepath = filepath
+        self.size = size
+        self.version = get_file_version(filepath)
+        self.closed = False
+        self._idle = []  # (connection, last_used) pairs, most recently used last
+        self._open_count = 0
+        self._cond = threading.Condition()
+
+    def checkout(self, timeout=DB_POOL_WAIT_TIMEOUT):
+        deadline = time.monotonic() + timeout
+        conn = None
+        last_used = None
+        with self._cond:
+            while True:
+                if self.closed:
+                    raise PoolClosedError(f"Connection pool for {self.filepath} is closed")
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._open_count < self.size:
+                    self._open_count += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise ConnectionError(f"Timed out after {timeout:g}s waiting for a connection to {os.path.basename(self.filepath)}")
+                self._cond.wait(remaining)
+
+        try:
+            if conn is not None and time.time() - last_used > DB_POOL_VALIDATE_AFTER and not _connection_alive(conn):
+                _close_quietly(conn)
+                conn = None
+            if conn is None:
+                metrics_inc('dbviewer_connection_cache_total', event='miss')
+                conn = open_db_connection(self.filepath)
+            else:
+                metrics_inc('dbviewer_connection_cache_total', event='hit')
+            return conn
+        except Exception:
+            with self._cond:
+                self._open_count -= 1
+                self._cond.notify()
+            raise
+
+    def checkin(self, conn, discard=False):
+        with self._cond:
+            if self.closed or discard:
+                self._open_count -= 1
+                self._cond.notify()
+            else:
+                self._idle.append((conn, time.time()))
+                self._cond.notify()
+                return
+        _close_quietly(conn)
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle = []
+            self._cond.notify_all()
+        for conn in idle:
+            _close_quietly(conn)
+
+def get_connection_pool(filepath):
+    """Get (or create) the pool for a database file; a rewritten file gets a fresh pool"""
+    version = get_file_version(filepath)
+    stale = []
+    with cache_lock:
+        pool = connection_pools.get(filepath)
+        if pool is not None and pool.version != version:
+            stale.append(connection_pools.pop(filepath))
+            pool = None
+        if pool is None:
+            pool = ConnectionPool(filepath, DB_POOL_SIZE)
+            connection_pools[filepath] = pool
+            while len(connection_pools) > MAX_CACHE_SIZE:
+                oldest, oldest_pool = connection_pools.popitem(last=False)
+                db_logger.debug(f"Evicting connection pool: {oldest}")
+                metrics_inc('dbviewer_connection_cache_total', event='eviction')
+                stale.append(oldest_pool)
+        else:
+            connection_pools.move_to_end(filepath)
+    for old_pool in stale:
+        old_pool.close()
+    return pool
+
+def checkout_pooled_connection(filepath):
+    """Check a connection out of the file's current pool; returns (pool, connection)"""
+    while True:
+        pool = get_connection_pool(filepath)
+        try:
+            return pool, pool.checkout()
+        except PoolClosedError:
+            # The pool was replaced while we waited; retry against the current one
+            if not os.path.exists(filepath):
+                raise FileNotFoundError(f"Database file not found: {filepath}")
+
+def close_connection_pool(filepath):
+    """Close and forget the pool of a database file (e.g. before deleting it)"""
+    with cache_lock:
+        pool = connection_pools.pop(filepath, None)
+    if pool is not None:
+        pool.close()
+
+class pooled_connection:
+    """Context manager checking a connection out of the pool for code outside a request"""
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.pool = None
+        self.conn = None
+
+    def __enter__(self):
+        if not os.path.exists(self.filepath):
+            raise FileNotFoundError(f"Database file not found: {self.filepath}")
+        self.pool, self.conn = checkout_pooled_connection(self.filepath)
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.pool.checkin(self.conn, discard=exc_type is not None)
+        return False
+
 @handle_database_error
 def get_db_connection(filepath: str):
-    """Get database connection with caching and improved error handling"""
+    """Get a pooled database connection, held for the rest of the current request"""
     if not os.path.exists(filepath):
         db_logger.error(f"Database file not found: {filepath}")
         raise FileNotFoundError(f"Database file not found: {filepath}")
+    if not has_app_context():
+        raise RuntimeError("get_db_connection() needs an app context; use pooled_connection() elsewhere")
     
-    with cache_lock:
-        if filepath in connection_cache:
-            # Test connection before returning cached one
-            try:
-                conn = connection_cache[filepath]
-                # Test the connection with a simple query
-                cursor = conn.cursor()
-                if isinstance(conn, pyodbc.Connection):
-                    # Use a query more likely to be supported by MDBTools
-                    cursor.execute("SELECT count(*) FROM MSysObjects")
-                else:  # SQLite
-                    cursor.execute("SELECT 1")
-                cursor.fetchone()
-                # Move to end (LRU) if connection is good
-                connection_cache.move_to_end(filepath)
-                db_logger.debug(f"Reusing cached connection for {filepath}")
-                return conn
-            except Exception as e:
-                error_details = format_pyodbc_error(e) if isinstance(e, pyodbc.Error) else str(e)
-                db_logger.warning(f"Cached connection invalid for {filepath}: {error_details}")
-                # Remove invalid connection from cache
-                connection_cache.pop(filepath, None)
-        
-        # Remove oldest if cache is full
-        if len(connection_cache) >= MAX_CACHE_SIZE:
-            oldest = next(iter(connection_cache))
-            old_conn = connection_cache.pop(oldest)
-            try:
-                old_conn.close()
-                db_logger.debug(f"Closed oldest cached connection: {oldest}")
-            except Exception as e:
-                db_logger.warning(f"Error closing old connection: {e}")
-        
-        # Create new connection
-        file_ext = filepath.rsplit('.', 1)[-1].lower()
-        conn = None
-
-        if file_ext in ['mdb', 'accdb']:
-            try:
-                conn_str = get_connection_string(filepath)
-                conn = pyodbc.connect(conn_str, timeout=30)
-                # Set encoding with better error handling
-                try:
-                    conn.setdecoding(pyodbc.SQL_CHAR, encoding='utf-8')
-                    conn.setdecoding(pyodbc.SQL_WCHAR, encoding='utf-8')
-                    conn.setencoding(encoding='utf-8')
-                except Exception as encoding_error:
-                    db_logger.warning(f"Could not set encoding for Access DB {filepath}: {encoding_error}")
-                
-                # Test the connection
-                cursor = conn.cursor()
-                # Use a query more likely to be supported by MDBTools
-                cursor.execute("SELECT count(*) FROM MSysObjects")
-                cursor.fetchone()
-                
-                db_logger.info(f"Successfully connected to Access DB: {filepath}")
-            except Exception as e:
-                error_details = format_pyodbc_error(e) if isinstance(e, pyodbc.Error) else str(e)
-                db_logger.error(f"Failed to connect to Access DB {filepath}: {error_details}")
-                raise ConnectionError(f"Failed to connect to Access database: {error_details}")
-                
-        elif file_ext in ['sqlite', 'db']:
-            try:
-                # Add timeout and other SQLite optimizations
-                conn = sqlite3.connect(
-                    filepath, 
-                    check_same_thread=False,
-                    timeout=30.0
-                )
-                # Enable WAL mode for better concurrent access
-                conn.execute("PRAGMA journal_mode=WAL")
-                conn.execute("PRAGMA synchronous=NORMAL")
-                conn.execute("PRAGMA cache_size=10000")
-                
-                # Test the connection
-                cursor = conn.cursor()
-                cursor.execute("SELECT 1")
-                cursor.fetchone()
-                
-                db_logger.info(f"Successfully connected to SQLite DB: {filepath}")
-            except Exception as e:
-                db_logger.error(f"Failed to connect to SQLite DB {filepath}: {e}")
-                raise ConnectionError(f"Failed to connect to SQLite database: {str(e)}")
-        else:
-            error_msg = f"Unsupported database type: {file_ext} for file {filepath}"
-            db_logger.error(error_msg)
-            raise ValueError(error_msg)
+    held = g.setdefault('db_connections', {})
+    if filepath in held:
+        return held[filepath][1]
+    
+    pool, conn = checkout_pooled_connection(filepath)
+    held[filepath] = (pool, conn)
+    db_logger.debug(f"Checked out pooled connection for {filepath}")
+    return conn
 
-        if conn:
-            connection_cache[filepath] = conn
-            return conn
-        else:
-            error_msg = f"Failed to establish database connection for {filepath}"
-            db_logger.error(error_msg)
-            raise ConnectionError(error_msg)
+@app.teardown_appcontext
+def release_db_connections(exc):
+    """Return connections checked out during the request to their pools"""
+    for pool, conn in g.pop('db_connections', {}).values():
+        pool.checkin(conn, discard=exc is not None)
 
 def get_tables(conn):
     """Get list of tables from database"""
+    return discover_tables(conn)[0]
+
+def discover_tables(conn):
+    """Get list of tables from database along with the catalog method that produced it"""
     tables = []
+    method = 'none'
     try:
         if isinstance(conn, pyodbc.Connection):
             cursor = conn.cursor()
@@ -350,6 +1542,7 @@ def get_tables(conn):
                     
                     if table_name and not table_name.startswith('MSys'):
                         tables.append(table_name)
+                method = 'odbc_catalog'
             except Exception as e:
                 logger.warning(f"Error getting tables with standard method: {e}")
                 # Fallback method using system tables
@@ -363,6 +1556,7 @@ def get_tables(conn):
                         
                         if table_name and not table_name.startswith('MSys'):
                             tables.append(table_name)
+                    method = 'msysobjects'
                 except Exception as fallback_e:
                     logger.warning(f"Fallback method failed: {fallback_e}")
                     # Last resort: try to find tables by querying schema
@@ -376,19 +1570,27 @@ def get_tables(conn):
                             
                             if table_name and not table_name.startswith('MSys'):
                                 tables.append(table_name)
+                        method = 'information_schema'
                     except Exception as last_resort_e:
                         logger.error(f"All table discovery methods failed: {last_resort_e}")
         else:  # SQLite
             cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            # ANALYZE statistics (sqlite_stat1, ...) written into indexed copies and mirrors are not user tables
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite\\_stat%' ESCAPE '\\'")
             tables = [row[0] for row in cursor.fetchall()]
+            method = 'sqlite_master'
     except Exception as e:
         logger.error(f"Error getting tables: {e}")
-    return sorted(tables)
+    return sorted(tables), method
 
 def get_table_info(conn, table_name):
     """Get column information for a table"""
+    return discover_table_info(conn, table_name)[0]
+
+def discover_table_info(conn, table_name):
+    """Get column information for a table along with the method that produced it"""
     columns = []
+    method = 'generic'
     try:
         cursor = conn.cursor()
         if isinstance(conn, pyodbc.Connection):
@@ -443,6 +1645,7 @@ def get_table_info(conn, table_name):
                         'type': type_name,
                         'size': col_size
                     })
+                method = 'odbc_columns'
             except Exception as e: # This 'e' could be the TypeError if cursor.columns() or iteration fails early
                 logger.warning(f"Error getting column metadata for table {table_name} using cursor.columns(): {e}", exc_info=True)
                 # Fallback: try to get basic column info using a different method
@@ -469,6 +1672,7 @@ def get_table_info(conn, table_name):
                                 'type': type_name_fb, 
                                 'size': size_fb
                             })
+                        method = 'select_top_1'
                     else:
                         logger.warning(f"Fallback method for table {table_name} yielded no description.")
                 except Exception as fallback_e:
@@ -487,6 +1691,7 @@ def get_table_info(conn, table_name):
                     'type': col[2],
                     'size': None
                 })
+            method = 'pragma_table_info'
     except Exception as e:
         logger.error(f"Error getting table info: {e}")
         # Return at least one generic column to prevent complete failure
@@ -496,40 +1701,275 @@ def get_table_info(conn, table_name):
                 'type': 'Text',
                 'size': None
             }]
-    return columns
+            method = 'generic'
+    return columns, method
 
-def build_search_query(table_name, columns, search_term, search_columns, sort_column, sort_order, limit, offset):
-    """Build optimized SQL query with search and pagination"""
-    # Validate and escape table name
-    table_name_escaped = f"[{table_name.replace(']', ']]')}]"
-    
-    # Base query - select only needed columns for better performance
-    query = f"SELECT * FROM {table_name_escaped}"
+def get_file_version(filepath):
+    """Cheap version stamp for a database file; changes whenever the file is rewritten"""
+    stat = os.stat(filepath)
+    return (stat.st_size, stat.st_mtime_ns)
+
+def invalidate_metadata(filepath):
+    """Drop cached metadata for a database file"""
+    with metadata_lock:
+        metadata_cache.pop(filepath, None)
+
+def _get_metadata_entry(filepath):
+    """Return the cache entry for the current version of filepath, resetting it if the file changed"""
+    try:
+        version = get_file_version(filepath)
+    except OSError:
+        invalidate_metadata(filepath)
+        raise FileNotFoundError(f"Database file not found: {filepath}")
+    with metadata_lock:
+        entry = metadata_cache.get(filepath)
+        if entry is not None and entry['version'] == version:
+            metadata_cache.move_to_end(filepath)
+            return entry
+        entry = {'version': version, 'tables': None, 'table_method': None, 'columns': {}, 'keys': {}, 'indexed': {}}
+        metadata_cache[filepath] = entry
+        if len(metadata_cache) > METADATA_CACHE_SIZE:
+            metadata_cache.popitem(last=False)
+    seed_from_analysis(filepath, entry)
+    return entry
+
+def seed_from_analysis(read_path, entry):
+    """Fill a fresh metadata entry and the count cache from the persisted analysis of this exact file version"""
+    if not ANALYSIS_ENABLED:
+        return
+    # Sidecars are named <content>~<kind>.sqlite, so the content file's name is the part before '~'
+    filename = os.path.basename(read_path).split('~', 1)[0]
+    try:
+        record = load_database_analyses([filename]).get(filename)
+    except Exception as e:
+        db_logger.warning(f"Could not load analysis of {filename}: {e}")
+        return
+    if (record is None or record['status'] != 'ready' or record['read_file'] != os.path.basename(read_path)
+            or (record['read_size'], record['read_mtime_ns']) != entry['version']):
+        return
+    tables = record['stats'].get('tables', {})
+    with metadata_lock:
+        if entry['tables'] is None:
+            entry['tables'] = list(tables)
+            entry['table_method'] = 'analysis'
+        for table_name, table in tables.items():
+            entry['columns'].setdefault(table_name, (table['columns'], 'analysis'))
+    for table_name, table in tables.items():
+        _count_cache_put((read_path, entry['version'], table_name, None), table['rows'])
+
+def get_cached_tables(conn, filepath):
+    """get_tables() with the result cached per (filepath, size, mtime)"""
+    entry = _get_metadata_entry(filepath)
+    if entry['tables'] is None:
+        tables, method = discover_tables(conn)
+        # Failed discovery is not cached so a transient error does not stick
+        if method == 'none':
+            return tables
+        with metadata_lock:
+            entry['tables'] = tables
+            entry['table_method'] = method
+        db_logger.debug(f"Cached {len(tables)} tables for {filepath} via {method}")
+    return entry['tables']
+
+def get_cached_table_info(conn, filepath, table_name):
+    """get_table_info() with the result cached per (filepath, size, mtime)"""
+    entry = _get_metadata_entry(filepath)
+    cached = entry['columns'].get(table_name)
+    if cached is not None:
+        return cached[0]
+    columns, method = discover_table_info(conn, table_name)
+    if method != 'generic':
+        with metadata_lock:
+            entry['columns'][table_name] = (columns, method)
+    return columns
+
+def get_cached_keyset_tiebreaker(conn, filepath, table_name, columns):
+    """get_keyset_tiebreaker() with the result cached per (filepath, size, mtime)"""
+    entry = _get_metadata_entry(filepath)
+    if table_name not in entry['keys']:
+        key_expr = get_keyset_tiebreaker(conn, table_name, columns)
+        with metadata_lock:
+            entry['keys'][table_name] = key_expr
+    return entry['keys'][table_name]
+
+def discover_indexed_columns(conn, table_name):
+    """Lower-cased columns that already lead an index of a SQLite table (including a rowid alias)"""
+    table_escaped = table_name.replace(']', ']]')
+    indexed = set()
+    for index_row in conn.execute(f"PRAGMA index_list([{table_escaped}])").fetchall():
+        index_info = conn.execute(f"PRAGMA index_info([{index_row[1].replace(']', ']]')}])").fetchall()
+        if index_info and index_info[0][2]:
+            indexed.add(index_info[0][2].lower())
+    pk_columns = [row for row in conn.execute(f"PRAGMA table_info([{table_escaped}])").fetchall() if row[5]]
+    if len(pk_columns) == 1 and str(pk_columns[0][2]).upper() == 'INTEGER':
+        indexed.add(pk_columns[0][1].lower())
+    return indexed
+
+def get_cached_indexed_columns(conn, filepath, table_name):
+    """discover_indexed_columns() cached per (filepath, size, mtime)"""
+    entry = _get_metadata_entry(filepath)
+    if table_name not in entry['indexed']:
+        indexed = discover_indexed_columns(conn, table_name)
+        with metadata_lock:
+            entry['indexed'][table_name] = indexed
+    return entry['indexed'][table_name]
+
+# Declared column type keywords (SQLite affinity rules plus Access/ODBC names) -> type family
+COLUMN_TYPE_FAMILIES = (
+    ('text', ('CHAR', 'TEXT', 'CLOB', 'MEMO', 'STRING', 'GUID')),
+    ('number', ('INT', 'COUNTER', 'AUTOINCREMENT', 'BYTE', 'REAL', 'FLOA', 'DOUB', 'NUMERIC', 'DECIMAL', 'CURRENCY', 'SINGLE')),
+    ('date', ('DATE', 'TIME')),
+)
+
+FIELD_SEARCH_PATTERN = re.compile(r'^([^:^]+?)\s*([:^])\s*(.+)$')
+SEARCH_NUMBER_PATTERN = re.compile(r'^[+-]?(\d+\.?\d*|\.\d+)$')
+SEARCH_DATE_PATTERN = re.compile(r'^(\d{4})(?:-(\d{2})(?:-(\d{2}))?)?$')
+
+@lru_cache(maxsize=1024)
+def column_type_family(type_name):
+    """'text', 'number', 'date' or 'other' for a declared column type"""
+    declared = str(type_name or '').upper()
+    for family, keywords in COLUMN_TYPE_FAMILIES:
+        if any(keyword in declared for keyword in keywords):
+            return family
+    return 'other'
+
+def parse_search_number(term):
+    """The int/float a search term spells, or None"""
+    if not SEARCH_NUMBER_PATTERN.match(term):
+        return None
+    return float(term) if '.' in term else int(term)
+
+def parse_search_date_range(term):
+    """Half-open [start, end) date range for 'YYYY', 'YYYY-MM' or 'YYYY-MM-DD', or None"""
+    match = SEARCH_DATE_PATTERN.match(term)
+    if not match:
+        return None
+    year, month, day = (int(part) if part else None for part in match.groups())
+    try:
+        if day is not None:
+            start = date(year, month, day)
+            return start, start + timedelta(days=1)
+        if month is not None:
+            start = date(year, month, 1)
+            return start, date(year + month // 12, month % 12 + 1, 1)
+        return date(year, 1, 1), date(year + 1, 1, 1)
+    except ValueError:
+        return None
+
+def parse_field_search(columns, search_term):
+    """Split 'col:value' / 'col^prefix' into (column, operator, value) when col names a column"""
+    match = FIELD_SEARCH_PATTERN.match(search_term or '')
+    if not match or not columns:
+        return None
+    name, operator, value = match.group(1).strip().lower(), match.group(2), match.group(3).strip()
+    column = next((c for c in columns if c['name'].lower() == name), None)
+    return (column, operator, value) if column is not None and value else None
+
+def _escape_column(name):
+    return f"[{name.replace(']', ']]')}]"
+
+def _prefix_upper_bound(prefix):
+    """Smallest string greater than every string starting with prefix, or None"""
+    while prefix and ord(prefix[-1]) >= 0x10FFFF:
+        prefix = prefix[:-1]
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1) if prefix else None
+
+def _typed_search_predicate(escaped_col, family, value):
+    """Index-friendly equality/range predicate for a number or date on a column of that type, or None"""
+    if family == 'number':
+        number = parse_search_number(value)
+        if number is not None:
+            return f"{escaped_col} = ?", [number]
+    elif family == 'date':
+        bounds = parse_search_date_range(value)
+        if bounds:
+            return f"({escaped_col} >= ? AND {escaped_col} < ?)", list(bounds)
+    return None
+
+def compile_field_search(column, operator, value):
+    """Predicate for an explicit 'col:value' (equality) or 'col^prefix' (range) search"""
+    escaped_col = _escape_column(column['name'])
+    family = column_type_family(column['type'])
+    # A date range is also a prefix match ('2020-01' covers every day of the month); a number is not
+    typed = _typed_search_predicate(escaped_col, family, value) if operator == ':' or family == 'date' else None
+    if typed:
+        return typed
+    if operator == ':':
+        return f"{escaped_col} = ?", [value]
+    if family in ('text', 'other'):
+        upper = _prefix_upper_bound(value)
+        if upper is not None:
+            return f"({escaped_col} >= ? AND {escaped_col} < ?)", [value, upper]
+    # Prefixes of numbers and unparseable dates: no range exists, scan
+    return f"CAST({escaped_col} AS TEXT) LIKE ?", [f"{value}%"]
+
+def build_search_conditions(columns, search_term, search_columns, fts=None):
+    """Compile a search into ORed WHERE conditions and parameters.
+
+    This is the single search compiler behind the page, count and estimate
+    queries. 'col:value' and 'col^prefix' become equality/range predicates on
+    that column. Otherwise numeric and date terms become equality/range
+    predicates on numeric and date columns, and a substring LIKE (or the
+    table's full-text index, when one is ready and passed in `fts`) is kept
+    for text columns only.
+    """
+    if not search_term or not columns:
+        return [], []
+    field = parse_field_search(columns, search_term)
+    if field:
+        condition, params = compile_field_search(*field)
+        return [condition], params
+
+    specific = bool(search_columns) and search_columns != ['all']
+    if specific:
+        # Search specific columns - validate column names
+        by_name = {c['name']: c for c in columns}
+        targets = [by_name[name] for name in search_columns if name in by_name]
+    else:
+        targets = columns
+
+    search_conditions = []
     params = []
+    like_columns = []
+    for col in targets:
+        family = column_type_family(col['type'])
+        typed = _typed_search_predicate(_escape_column(col['name']), family, search_term)
+        if typed:
+            search_conditions.append(typed[0])
+            params.extend(typed[1])
+        elif specific or family == 'text':
+            # Only search text-like columns for better performance unless a column was chosen
+            like_columns.append(col['name'])
+
+    if like_columns and fts:
+        fts_conditions, fts_params = build_fts_condition(fts, search_term, like_columns if specific else None)
+        search_conditions = fts_conditions + search_conditions
+        params = fts_params + params
+    elif like_columns:
+        like_conditions = [f"UPPER(CAST({_escape_column(name)} AS TEXT)) LIKE UPPER(?)" for name in like_columns]
+        search_conditions = like_conditions + search_conditions
+        params = [f"%{search_term}%"] * len(like_conditions) + params
+    return search_conditions, params
+
+def describe_search_plan(columns, search_term, fts):
+    """How a search is answered: 'field', 'fts' or 'like' (the response's search.index)"""
+    if parse_field_search(columns, search_term):
+        return 'field'
+    return 'fts' if fts else 'like'
+
+def build_search_query(table_name, columns, search_term, search_columns, sort_column, sort_order, limit, offset, fts=None):
+    """Build optimized SQL query with search and pagination"""
+    # Validate and escape table name
+    table_name_escaped = f"[{table_name.replace(']', ']]')}]"
+    
+    # Base query - select only needed columns for better performance
+    query = f"SELECT * FROM {table_name_escaped}"
     
     # Add search conditions with optimized LIKE queries
-    if search_term and columns:
-        search_conditions = []
-        if search_columns and search_columns != ['all']:
-            # Search specific columns - validate column names
-            valid_column_names = {c['name'] for c in columns}
-            for col in search_columns:
-                if col in valid_column_names:
-                    # Escape column name to prevent injection
-                    escaped_col = f"[{col.replace(']', ']]')}]"
-                    search_conditions.append(f"UPPER(CAST({escaped_col} AS TEXT)) LIKE UPPER(?)")
-                    params.append(f"%{search_term}%")
-        else:
-            # Search all text-compatible columns
-            for col in columns:
-                escaped_col = f"[{col['name'].replace(']', ']]')}]"
-                # Only search text-like columns for better performance
-                if col['type'] in ['Text', 'Memo', 'VARCHAR', 'CHAR', 'NVARCHAR', 'NCHAR', 'TEXT']:
-                    search_conditions.append(f"UPPER(CAST({escaped_col} AS TEXT)) LIKE UPPER(?)")
-                    params.append(f"%{search_term}%")
-        
-        if search_conditions:
-            query += " WHERE " + " OR ".join(search_conditions)
+    search_conditions, params = build_search_conditions(columns, search_term, search_columns, fts)
+    if search_conditions:
+        query += " WHERE " + " OR ".join(search_conditions)
     
     # Add sorting with validation
     if sort_column:
@@ -540,9 +1980,79 @@ def build_search_query(table_name, columns, search_term, search_columns, sort_co
     
     return query, params
 
-def execute_paginated_query(conn, query, params, limit, offset):
+class QueryDeadline:
+    """Time budget shared by the queries of one request or job"""
+
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds if seconds and seconds > 0 else None
+        self.timed_out = False  # some query hit the budget
+        self.truncated = False  # the page rows are incomplete because of it
+
+    @property
+    def expired(self):
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def remaining(self):
+        return None if self.expires_at is None else max(self.expires_at - time.monotonic(), 0)
+
+    def is_timeout(self, exc):
+        """True (and remembered) when exc is a driver error caused by this budget running out"""
+        if self.expired and isinstance(exc, (sqlite3.OperationalError, pyodbc.Error)):
+            self.timed_out = True
+            return True
+        return False
+
+class enforce_deadline:
+    """Context manager making a connection abort statements once the deadline passes.
+
+    SQLite checks it from a progress handler; ODBC gets a query timeout for
+    the time remaining (rounded up to whole seconds).
+    """
+
+    def __init__(self, conn, deadline):
+        self.conn = conn
+        self.deadline = deadline
+        self.previous_timeout = None
+
+    def __enter__(self):
+        if self.deadline.expires_at is None:
+            return self.deadline
+        if isinstance(self.conn, sqlite3.Connection):
+            deadline = self.deadline
+            self.conn.set_progress_handler(lambda: 1 if deadline.expired else 0, QUERY_DEADLINE_CHECK_STEPS)
+        else:
+            self.previous_timeout = self.conn.timeout
+            self.conn.timeout = max(int(math.ceil(self.deadline.remaining())), 1)
+        return self.deadline
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.deadline.expires_at is None:
+            return False
+        if isinstance(self.conn, sqlite3.Connection):
+            self.conn.set_progress_handler(None, 0)
+        else:
+            self.conn.timeout = self.previous_timeout
+        return False
+
+def fetch_rows(cursor, limit, deadline=None):
+    """Fetch up to limit rows; if the deadline interrupts the scan, return the rows read so far"""
+    rows = []
+    try:
+        # Row by row: an interrupted fetchmany() would discard the rows of its batch
+        while len(rows) < limit:
+            row = cursor.fetchone()
+            if row is None:
+                break
+            rows.append(row)
+    except Exception as e:
+        if deadline is None or not deadline.is_timeout(e):
+            raise
+        deadline.truncated = True
+    return rows
+
+def execute_paginated_query(conn, query, params, limit, offset, cursor=None, deadline=None):
     """Execute query with pagination handling for different database types"""
-    cursor = conn.cursor()
+    cursor = cursor or conn.cursor()
     
     if isinstance(conn, pyodbc.Connection):
         # For Access databases, we'll use a more efficient approach
@@ -570,7 +2080,7 @@ def execute_paginated_query(conn, query, params, limit, offset):
             
             if modified_query != query:
                 cursor.execute(modified_query, params)
-                return cursor.fetchall(), cursor.description
+                return fetch_rows(cursor, limit, deadline), cursor.description
         
         # Fallback method for Access - fetch and skip
         cursor.execute(query, params)
@@ -587,52 +2097,1939 @@ def execute_paginated_query(conn, query, params, limit, offset):
                 remaining -= len(chunk)
         
         # Fetch the required rows
-        rows = cursor.fetchmany(limit)
+        rows = fetch_rows(cursor, limit, deadline)
         return rows, cursor.description
     else:
         # SQLite supports LIMIT/OFFSET
         paginated_query = query + f" LIMIT {limit} OFFSET {offset}"
         cursor.execute(paginated_query, params)
-        return cursor.fetchall(), cursor.description
+        return fetch_rows(cursor, limit, deadline), cursor.description
+
+class InvalidCursorError(ValueError):
+    """Raised when a keyset pagination cursor cannot be decoded or does not match the request"""
+
+KEYSET_KEY_ALIAS = '__dbv_key'
+
+def get_keyset_tiebreaker(conn, table_name, columns):
+    """Find a unique, ordered key for keyset pagination (rowid or single-column primary key)"""
+    column_names = {c['name'].lower() for c in columns}
+    try:
+        cursor = conn.cursor()
+        if isinstance(conn, pyodbc.Connection):
+            # Prefer the declared primary key, then any single-column unique index
+            try:
+                pk_columns = [str(row.column_name) for row in cursor.primaryKeys(table=table_name)]
+                if len(pk_columns) == 1:
+                    return f"[{pk_columns[0].replace(']', ']]')}]"
+            except Exception as e:
+                db_logger.debug(f"primaryKeys() not available for {table_name}: {e}")
+            try:
+                unique_indexes = {}
+                for row in cursor.statistics(table=table_name, unique=True):
+                    if row.index_name and row.column_name and not row.non_unique:
+                        unique_indexes.setdefault(str(row.index_name), []).append(str(row.column_name))
+                for index_columns in unique_indexes.values():
+                    if len(index_columns) == 1:
+                        return f"[{index_columns[0].replace(']', ']]')}]"
+            except Exception as e:
+                db_logger.debug(f"statistics() not available for {table_name}: {e}")
+            return None
+        else:  # SQLite
+            cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
+            row = cursor.fetchone()
+            if row and row[0] and 'WITHOUT ROWID' in row[0].upper():
+                cursor.execute(f"PRAGMA table_info([{table_name.replace(']', ']]')}])")
+                pk_columns = [col[1] for col in cursor.fetchall() if col[5]]
+                if len(pk_columns) == 1:
+                    return f"[{pk_columns[0].replace(']', ']]')}]"
+                return None
+            # A user column may shadow one of the rowid aliases
+            for alias in ('rowid', '_rowid_', 'oid'):
+                if alias not in column_names:
+                    return alias
+            return None
+    except Exception as e:
+        logger.warning(f"Could not determine keyset tiebreaker for table {table_name}: {e}")
+        return None
+
+def _encode_cursor_value(value):
+    """Convert a sort key value into a JSON-safe form"""
+    if isinstance(value, datetime):
+        return {'$dt': value.isoformat()}
+    if isinstance(value, date):  # DATE columns (pyodbc, or SQLite declared-type converters)
+        return {'$d': value.isoformat()}
+    if isinstance(value, datetime_time):
+        return {'$t': value.isoformat()}
+    if isinstance(value, bytes):
+        return {'$b': base64.b64encode(value).decode('ascii')}
+    if isinstance(value, Decimal):
+        return {'$dec': str(value)}
+    return value
+
+def _decode_cursor_value(value):
+    """Reverse _encode_cursor_value"""
+    if isinstance(value, dict):
+        if '$dt' in value:
+            return datetime.fromisoformat(value['$dt'])
+        if '$d' in value:
+            return date.fromisoformat(value['$d'])
+        if '$t' in value:
+            return datetime_time.fromisoformat(value['$t'])
+        if '$b' in value:
+            return base64.b64decode(value['$b'])
+        if '$dec' in value:
+            return Decimal(value['$dec'])
+        raise InvalidCursorError('Unknown cursor value type')
+    return value
+
+def encode_cursor(direction, sort_column, sort_order, sort_value, key_value):
+    """Build an opaque cursor pointing just past (or before) a row"""
+    payload = {
+        'd': direction,
+        's': sort_column,
+        'o': sort_order,
+        'k': [_encode_cursor_value(sort_value), _encode_cursor_value(key_value)]
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(token, sort_column, sort_order):
+    """Decode a cursor and check it was issued for the same sort"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw.decode('utf-8'))
+        direction = payload['d']
+        sort_value, key_value = (_decode_cursor_value(v) for v in payload['k'])
+    except InvalidCursorError:
+        raise
+    except Exception:
+        raise InvalidCursorError('Malformed cursor')
+    if direction not in ('next', 'prev'):
+        raise InvalidCursorError('Malformed cursor')
+    if payload.get('s') != sort_column or payload.get('o') != sort_order:
+        raise InvalidCursorError('Cursor does not match the current sort')
+    return direction, sort_value, key_value
+
+def _keyset_predicate(sort_expr, key_expr, ascending, sort_value, key_value):
+    """Build the seek predicate for rows strictly after (sort_value, key_value) in the given order.
+
+    NULLs sort first in ascending order on both SQLite and Access, so the
+    predicate has to treat them explicitly rather than rely on comparisons.
+    """
+    op = '>' if ascending else '<'
+    if sort_expr is None:
+        return f"{key_expr} {op} ?", [key_value]
+    if ascending:
+        if sort_value is None:
+            return f"(({sort_expr} IS NULL AND {key_expr} > ?) OR {sort_expr} IS NOT NULL)", [key_value]
+        return f"({sort_expr} > ? OR ({sort_expr} = ? AND {key_expr} > ?))", [sort_value, sort_value, key_value]
+    if sort_value is None:
+        return f"({sort_expr} IS NULL AND {key_expr} < ?)", [key_value]
+    return (f"({sort_expr} < ? OR {sort_expr} IS NULL OR ({sort_expr} = ? AND {key_expr} < ?))",
+            [sort_value, sort_value, key_value])
+
+def execute_keyset_query(conn, table_name, columns, search_term, search_columns,
+                         sort_column, sort_order, limit, cursor_token, key_expr, fts=None):
+    """Fetch one page by seeking past the last seen sort key instead of skipping rows.
+
+    Returns (rows, description, next_cursor, prev_cursor). Each page costs the
+    same regardless of depth because the database only reads `limit + 1` rows
+    past the seek position.
+    """
+    valid_column_names = {c['name'] for c in columns}
+    if sort_column not in valid_column_names:
+        sort_column = ''
+    sort_expr = f"[{sort_column.replace(']', ']]')}]" if sort_column else None
+
+    direction, sort_value, key_value = 'next', None, None
+    if cursor_token:
+        direction, sort_value, key_value = decode_cursor(cursor_token, sort_column, sort_order)
+
+    # Walking backwards is a forward walk in the reversed order, re-reversed afterwards
+    ascending = (sort_order == 'ASC') == (direction == 'next')
+    order_sql = 'ASC' if ascending else 'DESC'
+
+    conditions, params = build_search_conditions(columns, search_term, search_columns, fts)
+    where_parts = [f"({' OR '.join(conditions)})"] if conditions else []
+    if cursor_token:
+        if isinstance(sort_value, datetime_time) and not isinstance(conn, pyodbc.Connection):
+            sort_value = sort_value.isoformat()  # sqlite3 has no adapter for time; stored as ISO text
+        predicate, predicate_params = _keyset_predicate(sort_expr, key_expr, ascending, sort_value, key_value)
+        where_parts.append(predicate)
+        params = params + predicate_params
+
+    table_name_escaped = f"[{table_name.replace(']', ']]')}]"
+    top_clause = f"TOP {limit + 1} " if isinstance(conn, pyodbc.Connection) else ""
+    query = f"SELECT {top_clause}*, {key_expr} AS [{KEYSET_KEY_ALIAS}] FROM {table_name_escaped}"
+    if where_parts:
+        query += " WHERE " + " AND ".join(where_parts)
+    order_terms = [f"{sort_expr} {order_sql}"] if sort_expr else []
+    order_terms.append(f"{key_expr} {order_sql}")
+    query += " ORDER BY " + ", ".join(order_terms)
+    if not isinstance(conn, pyodbc.Connection):
+        query += f" LIMIT {limit + 1}"
+
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    fetched = cursor.fetchmany(limit + 1)
+    description = cursor.description[:-1]  # Drop the synthetic key column
+    has_more = len(fetched) > limit
+    fetched = fetched[:limit]
+    if direction == 'prev':
+        fetched.reverse()
+
+    sort_index = None
+    if sort_column:
+        sort_index = next((i for i, col in enumerate(description) if col[0] == sort_column), None)
+
+    def cursor_for(row, cursor_direction):
+        sort_key = row[sort_index] if sort_index is not None else None
+        return encode_cursor(cursor_direction, sort_column, sort_order, sort_key, row[-1])
+
+    next_cursor = prev_cursor = None
+    if fetched:
+        # Moving forward, a previous page exists whenever we arrived via a cursor;
+        # moving backward, the page we came from is always ahead of us.
+        has_next = has_more if direction == 'next' else True
+        has_prev = bool(cursor_token) if direction == 'next' else has_more
+        if has_next:
+            next_cursor = cursor_for(fetched[-1], 'next')
+        if has_prev:
+            prev_cursor = cursor_for(fetched[0], 'prev')
+
+    rows = [tuple(row)[:-1] for row in fetched]
+    return rows, description, next_cursor, prev_cursor
+
+def _access_order_path(filepath, digest):
+    return os.path.join(get_sidecar_folder(), f"{os.path.basename(filepath)}~order-{digest}.bin")
+
+def _map_access_order(order_path):
+    """Map an on-disk int64 key order read-only; the page cache shares it between workers"""
+    with open(order_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return array.array('q')
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)).cast('q')
+
+def _store_access_order(filepath, order_path, keys):
+    """Write an int64 key order atomically and prune this database's oldest or outdated orders"""
+    os.makedirs(get_sidecar_folder(), exist_ok=True)
+    tmp_path = f"{order_path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, 'wb') as f:
+        keys.tofile(f)
+    os.replace(tmp_path, order_path)
+
+    prefix = f"{os.path.basename(filepath)}~order-"
+    source_mtime = os.path.getmtime(filepath)
+    orders = []
+    for name in os.listdir(get_sidecar_folder()):
+        if name.startswith(prefix) and name.endswith('.bin'):
+            path = os.path.join(get_sidecar_folder(), name)
+            try:
+                orders.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+    orders.sort(reverse=True)
+    for index, (mtime, path) in enumerate(orders):
+        if index >= ACCESS_ORDER_MAX_FILES or mtime < source_mtime:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def load_access_order(conn, filepath, table_name, columns, search_term, search_columns,
+                      sort_column, sort_order, key_expr):
+    """Key of every matching row in sort order, read once per table version, sort and search.
+
+    Integer keys (the usual AutoNumber primary key) are stored as a flat int64
+    file in the sidecar folder and memory-mapped, so every worker shares one
+    copy; other key types are kept in this worker only.
+    """
+    size, mtime_ns = get_file_version(filepath)
+    digest = hashlib.sha1(json.dumps(
+        [size, mtime_ns, table_name, sort_column, sort_order, search_term, sorted(search_columns or [])]
+    ).encode('utf-8')).hexdigest()
+    with access_order_lock:
+        keys = access_order_cache.get(digest)
+        if keys is not None:
+            access_order_cache.move_to_end(digest)
+            return keys
+
+    order_path = _access_order_path(filepath, digest)
+    try:
+        keys = _map_access_order(order_path)
+    except (OSError, ValueError):
+        table_name_escaped = f"[{table_name.replace(']', ']]')}]"
+        query = f"SELECT {key_expr} FROM {table_name_escaped}"
+        conditions, params = build_search_conditions(columns, search_term, search_columns)
+        if conditions:
+            query += " WHERE " + " OR ".join(conditions)
+        query += f" ORDER BY [{sort_column.replace(']', ']]')}] {sort_order}, {key_expr} {sort_order}"
+
+        started = time.time()
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        values = []
+        while True:
+            batch = cursor.fetchmany(ACCESS_ORDER_BATCH_SIZE)
+            if not batch:
+                break
+            values.extend(row[0] for row in batch)
+        if all(type(value) is int for value in values):
+            try:
+                _store_access_order(filepath, order_path, array.array('q', values))
+                keys = _map_access_order(order_path)
+            except (OSError, OverflowError) as e:
+                db_logger.warning(f"Could not store key order for {table_name}: {e}")
+                keys = tuple(values)
+        else:
+            keys = tuple(values)
+        db_logger.info(f"Built key order for {table_name} by {sort_column} {sort_order}: {len(values)} rows in {time.time() - started:.1f}s")
+
+    with access_order_lock:
+        access_order_cache[digest] = keys
+        while len(access_order_cache) > ACCESS_ORDER_CACHE_ENTRIES:
+            access_order_cache.popitem(last=False)
+    return keys
+
+def execute_access_ordered_query(conn, filepath, table_name, columns, search_term, search_columns,
+                                 sort_column, sort_order, limit, offset, key_expr, deadline=None):
+    """Fetch one sorted page of an Access table by looking up the page's keys in the cached key order"""
+    keys = load_access_order(conn, filepath, table_name, columns, search_term, search_columns,
+                             sort_column, sort_order, key_expr)
+    page_keys = list(keys[offset:offset + limit])
+    table_name_escaped = f"[{table_name.replace(']', ']]')}]"
+    cursor = conn.cursor()
+    if not page_keys:
+        cursor.execute(f"SELECT * FROM {table_name_escaped} WHERE 1 = 0")
+        return [], cursor.description
+
+    rows_by_key = {}
+    description = None
+    for start in range(0, len(page_keys), ACCESS_ORDER_FETCH_CHUNK):
+        chunk = page_keys[start:start + ACCESS_ORDER_FETCH_CHUNK]
+        cursor.execute(
+            f"SELECT *, {key_expr} AS [{KEYSET_KEY_ALIAS}] FROM {table_name_escaped} "
+            f"WHERE {key_expr} IN ({', '.join('?' * len(chunk))})",
+            chunk
+        )
+        description = cursor.description[:-1]  # Drop the synthetic key column
+        for row in fetch_rows(cursor, len(chunk), deadline):
+            rows_by_key[row[-1]] = tuple(row)[:-1]
+        if deadline is not None and deadline.truncated:
+            break
+    return [rows_by_key[key] for key in page_keys if key in rows_by_key], description
+
+def get_total_count(conn, table_name, columns, search_term, search_columns, fts=None, cursor=None):
+    """Get exact count of rows, filtered with the same predicate as the page query"""
+    query = f"SELECT COUNT(*) FROM [{table_name.replace(']', ']]')}]"
+    search_conditions, params = build_search_conditions(columns, search_term, search_columns, fts)
+    if search_conditions:
+        query += " WHERE " + " OR ".join(search_conditions)
+    
+    cursor = cursor or conn.cursor()
+    cursor.execute(query, params)
+    count = cursor.fetchone()[0]
+    return int(count) if count is not None else 0
+
+def estimate_total_count(conn, table_name):
+    """Cheap unfiltered row count estimate, or None when the backend offers none"""
+    if isinstance(conn, pyodbc.Connection):
+        return None
+    cursor = conn.cursor()
+    try:
+        # Populated by ANALYZE; the first number of each stat row is the table's row count
+        cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = ?", (table_name,))
+        estimates = [int(row[0].split()[0]) for row in cursor.fetchall() if row[0]]
+        if estimates:
+            return max(estimates)
+    except (sqlite3.Error, ValueError):
+        pass
+    try:
+        # Reads only the right edge of the table b-tree
+        cursor.execute(f"SELECT MAX(rowid) FROM [{table_name.replace(']', ']]')}]")
+        max_rowid = cursor.fetchone()[0]
+        return int(max_rowid) if max_rowid is not None else 0
+    except sqlite3.Error:
+        return None
+
+def estimate_filtered_count(conn, table_name, columns, search_term, search_columns, total_estimate, fts=None):
+    """Estimate the filtered count by scanning a fixed-size sample of rows"""
+    if fts:
+        # An index lookup is cheap enough to count exactly
+        return get_total_count(conn, table_name, columns, search_term, search_columns, fts), True
+    search_conditions, params = build_search_conditions(columns, search_term, search_columns)
+    if not search_conditions:
+        return total_estimate, True
+    table_name_escaped = f"[{table_name.replace(']', ']]')}]"
+    if isinstance(conn, pyodbc.Connection):
+        sample = f"SELECT TOP {COUNT_SAMPLE_ROWS} * FROM {table_name_escaped}"
+    else:
+        sample = f"SELECT * FROM {table_name_escaped} LIMIT {COUNT_SAMPLE_ROWS}"
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM ({sample}) AS sample WHERE " + " OR ".join(search_conditions), params)
+    matches = int(cursor.fetchone()[0] or 0)
+    if total_estimate <= COUNT_SAMPLE_ROWS:
+        return matches, True  # The sample was the whole table
+    return int(matches * total_estimate / COUNT_SAMPLE_ROWS), False
+
+def _count_cache_key(read_path, table_name, search_term, search_columns):
+    """Key a count by file version, table and normalized search spec"""
+    search_spec = None
+    if search_term:
+        search_spec = (search_term, tuple(sorted(set(search_columns or []) - {'all'})))
+    return (read_path, get_file_version(read_path), table_name, search_spec)
+
+def _count_cache_get(key):
+    with count_lock:
+        if key in count_cache:
+            count_cache.move_to_end(key)
+            return count_cache[key]
+    return None
+
+def _count_cache_put(key, count):
+    with count_lock:
+        count_cache[key] = count
+        count_cache.move_to_end(key)
+        while len(count_cache) > COUNT_CACHE_SIZE:
+            count_cache.popitem(last=False)
+
+def invalidate_counts(read_path):
+    """Drop cached counts for a database file"""
+    with count_lock:
+        for key in [k for k in count_cache if k[0] == read_path]:
+            del count_cache[key]
+
+def _compute_counts(conn, read_path, table_name, columns, search_term, search_columns, fts=None, cursor=None):
+    """Compute and cache whichever of the unfiltered/filtered exact counts are missing"""
+    total_key = _count_cache_key(read_path, table_name, '', [])
+    total = _count_cache_get(total_key)
+    if total is None:
+        with timed_stage('count_total'):
+            total = get_total_count(conn, table_name, columns, '', [], cursor=cursor)
+        _count_cache_put(total_key, total)
+    if not search_term:
+        return total, total
+    filtered_key = _count_cache_key(read_path, table_name, search_term, search_columns)
+    filtered = _count_cache_get(filtered_key)
+    if filtered is None:
+        with timed_stage('count_filtered'):
+            filtered = get_total_count(conn, table_name, columns, search_term, search_columns, fts, cursor)
+        _count_cache_put(filtered_key, filtered)
+    return total, filtered
+
+def _compute_counts_in_background(read_path, table_name, columns, search_term, search_columns, fts=None):
+    deadline = QueryDeadline(QUERY_BUDGETS['count'])
+    with pooled_connection(read_path) as conn:
+        if fts:
+            attach_fts_index(conn, fts['path'])
+        try:
+            with enforce_deadline(conn, deadline):
+                _compute_counts(conn, read_path, table_name, columns, search_term, search_columns, fts)
+        except Exception as e:
+            if not deadline.is_timeout(e):
+                raise
+            db_logger.warning(f"Exact count of {table_name} in {os.path.basename(read_path)} exceeded {QUERY_BUDGETS['count']:g}s and was abandoned")
+
+def get_partial_row_counts(conn, read_path, table_name, search_term, search_columns, rows_seen):
+    """Best counts available once the time budget is spent: cached, estimated, or a lower bound"""
+    cached = get_cached_counts(read_path, table_name, search_term, search_columns)
+    if cached is not None:
+        return {'total': cached[0], 'filtered': cached[1], 'exact': True}
+    total = _count_cache_get(_count_cache_key(read_path, table_name, '', []))
+    if total is None:
+        try:
+            total = estimate_total_count(conn, table_name)
+        except Exception as e:
+            db_logger.warning(f"Could not estimate row count for {table_name}: {e}")
+    filtered = total if (total is not None and not search_term) else rows_seen
+    return {'total': max(total or 0, filtered), 'filtered': filtered, 'exact': False}
+
+def get_cached_counts(read_path, table_name, search_term, search_columns):
+    """Exact (total, filtered) counts if both are cached, else None"""
+    total = _count_cache_get(_count_cache_key(read_path, table_name, '', []))
+    if total is None:
+        return None
+    if not search_term:
+        return total, total
+    filtered = _count_cache_get(_count_cache_key(read_path, table_name, search_term, search_columns))
+    return (total, filtered) if filtered is not None else None
+
+def get_row_counts(conn, read_path, table_name, columns, search_term, search_columns, estimate=False, fts=None):
+    """Unfiltered and filtered row counts for a page request.
+
+    Exact counts are computed once per (file version, table, search spec) and
+    cached. With estimate=True, large tables get an immediate estimate
+    (sqlite_stat1, MAX(rowid) or a sampled match rate) while the exact count
+    runs in the background; the result says which one it is.
+    """
+    cached = get_cached_counts(read_path, table_name, search_term, search_columns)
+    if cached is not None:
+        return {'total': cached[0], 'filtered': cached[1], 'exact': True}
+
+    if estimate:
+        total = _count_cache_get(_count_cache_key(read_path, table_name, '', []))
+        total_exact = total is not None
+        if total is None:
+            total = estimate_total_count(conn, table_name)
+        if total is not None and total > COUNT_EXACT_THRESHOLD:
+            filtered, filtered_exact = total, True
+            if search_term:
+                filtered, filtered_exact = estimate_filtered_count(
+                    conn, table_name, columns, search_term, search_columns, total, fts
+                )
+            if not (total_exact and filtered_exact):
+                submit_background_task(
+                    ('count',) + _count_cache_key(read_path, table_name, search_term, search_columns),
+                    _compute_counts_in_background, read_path, table_name, columns, search_term, search_columns, fts
+                )
+                return {'total': total, 'filtered': filtered, 'exact': False}
+
+    total, filtered = _compute_counts(conn, read_path, table_name, columns, search_term, search_columns, fts)
+    return {'total': total, 'filtered': filtered, 'exact': True}
+
+def highlight_search_term(value, search_term):
+    """Highlight search term in value"""
+    if not search_term or not value:
+        return value
+    
+    # Convert to string and escape HTML
+    str_value = str(value)
+    str_value = str_value.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    
+    # Case-insensitive highlight
+    return compile_highlight_pattern(search_term).sub(r'<mark>\g<0></mark>', str_value)
+
+@lru_cache(maxsize=256)
+def compile_highlight_pattern(search_term):
+    """Case-insensitive pattern for a search term, compiled once per term"""
+    return re.compile(re.escape(search_term), re.IGNORECASE)
+
+def _display_generic(value):
+    """Display string for any cell value (the slow path every converter falls back to)"""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, bytes):
+        try: return value.decode('utf-8')
+        except UnicodeDecodeError:
+            try: return value.decode('latin-1')
+            except UnicodeDecodeError: return f'<Binary {len(value)} bytes>'
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    try: return str(value)
+    except (UnicodeDecodeError, UnicodeEncodeError):
+        try: return repr(value)
+        except Exception: return '<Unable to display>'
+    except Exception: return '<Unable to display>'
+
+def _display_text(value):
+    return value if type(value) is str else _display_generic(value)
+
+def _display_number(value):
+    cls = type(value)
+    return str(value) if cls is int or cls is float else _display_generic(value)
+
+def _display_datetime(value):
+    # isoformat matches the strftime output for naive four-digit years and is several times faster
+    if type(value) is datetime and value.tzinfo is None and value.year >= 1000:
+        return value.isoformat(' ', 'seconds')
+    return _display_generic(value)
+
+# Declared column type family -> converter specialised for the values it usually holds
+DISPLAY_TYPE_CONVERTERS = {'text': _display_text, 'number': _display_number, 'date': _display_datetime}
+
+# Python types reported in cursor.description (pyodbc) -> converter
+DISPLAY_PYTHON_CONVERTERS = {str: _display_text, int: _display_number, float: _display_number, datetime: _display_datetime}
+
+def get_display_converter(type_code, declared_type):
+    """Pick the converter for one result column from its driver and declared types"""
+    converter = DISPLAY_PYTHON_CONVERTERS.get(type_code) if isinstance(type_code, type) else None
+    if converter:
+        return converter
+    return DISPLAY_TYPE_CONVERTERS.get(column_type_family(declared_type), _display_generic)
+
+def build_row_formatter(description, columns, search_term, columnar=False):
+    """Build a function turning fetched rows into display dicts (or positional lists when columnar)"""
+    declared_types = {col['name']: col.get('type') for col in columns or []}
+    names = [col[0] for col in description]
+    converters = [get_display_converter(col[1], declared_types.get(col[0])) for col in description]
+
+    if search_term:
+        pattern = compile_highlight_pattern(search_term)
+        search = pattern.search
+        sub = pattern.sub
+
+        def highlight(display_value):
+            if not display_value:
+                return display_value
+            escaped = display_value.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+            return sub(r'<mark>\g<0></mark>', escaped) if search(escaped) else escaped
+
+        converters = [(lambda value, convert=convert: highlight(convert(value))) for convert in converters]
+
+    pairs = list(zip(names, converters))
+
+    def format_cell_by_cell(row):
+        # Slow path for driver rows whose item access fails part-way
+        values = []
+        for i, (name, convert) in enumerate(pairs):
+            try:
+                value = row[i]
+            except TypeError:
+                logger.warning(f"Row formatting: TypeError accessing row[{i}] (col='{name}'). Assigning <Access Error>.", exc_info=True)
+                value = "<Access Error>"
+            values.append(convert(value))
+        return values
+
+    def format_rows(rows):
+        results = []
+        append = results.append
+        for row in rows:
+            try:
+                values = [convert(value) for convert, value in zip(converters, row)]
+            except TypeError:
+                values = format_cell_by_cell(row)
+            append(values if columnar else dict(zip(names, values)))
+        return results
+
+    return format_rows
+
+def fast_json_response(payload, status=200):
+    """Serialize a large payload compactly, with orjson when it is installed"""
+    if orjson is not None:
+        try:
+            body = orjson.dumps(payload)
+        except TypeError:
+            body = None
+        if body is not None:
+            return Response(body, status=status, mimetype='application/json')
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    return Response(body, status=status, mimetype='application/json')
+
+def get_redis_client():
+    """Shared Redis client for the page cache, or None when Redis is not configured or unreachable"""
+    if redis is None or not PAGE_CACHE_REDIS_URL.startswith(('redis://', 'rediss://', 'unix://')):
+        return None
+    if redis_state['client'] is None and time.time() >= redis_state['retry_at']:
+        try:
+            redis_state['client'] = redis.Redis.from_url(PAGE_CACHE_REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5)
+        except Exception as e:
+            logger.warning(f"Page cache: could not create Redis client: {e}")
+            redis_state['retry_at'] = time.time() + 30
+    return redis_state['client']
+
+def _redis_failed(e):
+    """Stop using Redis for a while after an error so requests are not slowed by timeouts"""
+    logger.warning(f"Page cache: Redis unavailable, using in-process cache only for 30s: {e}")
+    redis_state['client'] = None
+    redis_state['retry_at'] = time.time() + 30
+
+def _page_cache_index_key(database_id):
+    """Redis set listing every cached page of a database, for invalidation"""
+    return f"dbviewer:pages:{database_id}"
+
+def data_version_digest(filepath, read_path, *parts):
+    """Digest of the versions of every file a response is read from plus the normalized request parameters"""
+    versions = [get_file_version(filepath)]
+    for path in (read_path, get_sidecar_path(filepath, 'fts')):
+        if path != filepath and os.path.exists(path):
+            versions.append(get_file_version(path))
+    return hashlib.sha1(json.dumps([versions, list(parts)], sort_keys=True).encode('utf-8')).hexdigest()
+
+def page_cache_key(database_id, digest):
+    """Cache key for a table page identified by its data version digest"""
+    return f"dbviewer:page:{database_id}:{digest}"
+
+def not_modified_response(etag):
+    """An empty 304 when the client's If-None-Match already names this ETag, else None"""
+    if not request.if_none_match.contains_weak(etag):  # nginx weakens ETags when it gzips
+        return None
+    response = Response(status=304)
+    return set_http_cache_headers(response, etag)
+
+def set_http_cache_headers(response, etag=None, last_modified=None, max_age=None):
+    """Let browsers and the nginx proxy cache a response (or forbid it when no ETag is given)"""
+    if etag is None:
+        response.cache_control.no_store = True
+        return response
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = HTTP_CACHE_MAX_AGE if max_age is None else max_age
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
+
+def _page_cache_store_l1(key, blob):
+    """Insert into the in-process cache, evicting least recently used entries beyond the byte budget"""
+    global page_cache_bytes
+    with page_cache_lock:
+        old = page_cache.pop(key, None)
+        if old:
+            page_cache_bytes -= len(old[1])
+        page_cache[key] = (time.time() + PAGE_CACHE_TTL, blob)
+        page_cache_bytes += len(blob)
+        while page_cache_bytes > PAGE_CACHE_L1_BYTES and page_cache:
+            _, (_, evicted) = page_cache.popitem(last=False)
+            page_cache_bytes -= len(evicted)
+
+def page_cache_get(key):
+    """Cached response body for a page key, checking the local cache before Redis"""
+    global page_cache_bytes
+    if PAGE_CACHE_TTL <= 0:
+        return None
+    blob = None
+    with page_cache_lock:
+        entry = page_cache.get(key)
+        if entry:
+            if entry[0] > time.time():
+                page_cache.move_to_end(key)
+                blob = entry[1]
+            else:
+                del page_cache[key]
+                page_cache_bytes -= len(entry[1])
+    if blob is None:
+        client = get_redis_client()
+        if client is not None:
+            try:
+                blob = client.get(key)
+            except Exception as e:
+                _redis_failed(e)
+            if blob is not None:
+                _page_cache_store_l1(key, blob)
+    return zlib.decompress(blob) if blob is not None else None
+
+def page_cache_put(database_id, key, body):
+    """Store a response body compressed, locally and in Redis"""
+    if PAGE_CACHE_TTL <= 0:
+        return
+    blob = zlib.compress(body, 6)
+    if len(blob) > PAGE_CACHE_MAX_ENTRY_BYTES:
+        return
+    _page_cache_store_l1(key, blob)
+    client = get_redis_client()
+    if client is not None:
+        try:
+            index_key = _page_cache_index_key(database_id)
+            pipe = client.pipeline(transaction=False)
+            pipe.setex(key, PAGE_CACHE_TTL, blob)
+            pipe.sadd(index_key, key)
+            pipe.expire(index_key, PAGE_CACHE_TTL)
+            pipe.execute()
+        except Exception as e:
+            _redis_failed(e)
+
+def invalidate_page_cache(database_id):
+    """Drop every cached page of a database from this worker and from Redis"""
+    global page_cache_bytes
+    prefix = f"dbviewer:page:{database_id}:"
+    with page_cache_lock:
+        for key in [key for key in page_cache if key.startswith(prefix)]:
+            page_cache_bytes -= len(page_cache.pop(key)[1])
+    client = get_redis_client()
+    if client is not None:
+        try:
+            index_key = _page_cache_index_key(database_id)
+            keys = client.smembers(index_key)
+            if keys:
+                client.delete(*keys)
+            client.delete(index_key)
+        except Exception as e:
+            _redis_failed(e)
+
+def get_sidecar_folder():
+    """Folder holding derived files (mirrors, indexes) for uploaded databases"""
+    return os.path.join(app.config['UPLOAD_FOLDER'], SIDECAR_FOLDER_NAME)
+
+def get_sidecar_path(filepath, kind):
+    """Path of a derived SQLite file of the given kind for an uploaded database"""
+    # '~' never survives sanitize_filename, so it cannot collide with another upload's name
+    return os.path.join(get_sidecar_folder(), f"{os.path.basename(filepath)}~{kind}.sqlite")
+
+def remove_sidecars(filepath):
+    """Remove every derived file belonging to an uploaded database"""
+    sidecar_folder = get_sidecar_folder()
+    if not os.path.isdir(sidecar_folder):
+        return
+    prefix = os.path.basename(filepath) + '~'
+    for name in os.listdir(sidecar_folder):
+        if name.startswith(prefix):
+            sidecar_path = os.path.join(sidecar_folder, name)
+            invalidate_metadata(sidecar_path)
+            invalidate_counts(sidecar_path)
+            close_connection_pool(sidecar_path)
+            try:
+                os.remove(sidecar_path)
+            except OSError as e:
+                logger.warning(f"Could not remove sidecar file {sidecar_path}: {e}")
+
+def acquire_lock_marker(marker_path, wait, stale_seconds):
+    """Create an O_EXCL marker shared by all workers; False if another worker holds it past `wait` seconds"""
+    give_up_at = time.time() + wait
+    while True:
+        try:
+            fd = os.open(marker_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(fd, str(os.getpid()).encode('ascii'))
+            os.close(fd)
+            return True
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(marker_path) > stale_seconds:
+                    os.remove(marker_path)
+                    continue
+            except FileNotFoundError:
+                continue
+        if time.time() >= give_up_at:
+            return False
+        time.sleep(0.05)
+
+def heartbeat_lock_marker(marker_path, stop_event, interval):
+    """Touch a held marker until stop_event is set, so only the marker of a dead holder goes stale"""
+    while not stop_event.wait(interval):
+        try:
+            os.utime(marker_path)
+        except OSError:
+            return
+
+class content_lock:
+    """Hold the cross-worker lock of a content file while aliases of it are added or removed"""
+
+    def __init__(self, content_path):
+        self.marker_path = content_path + '.lock'
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.marker_path), exist_ok=True)
+        if not acquire_lock_marker(self.marker_path, CONTENT_LOCK_WAIT, CONTENT_LOCK_STALE_SECONDS):
+            raise TimeoutError(f"Timed out waiting for {os.path.basename(self.marker_path)}")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            os.remove(self.marker_path)
+        except FileNotFoundError:
+            pass
+        return False
+
+def get_content_folder():
+    """Folder holding the bytes of uploads, one file per distinct content"""
+    return os.path.join(get_sidecar_folder(), 'content')
+
+def resolve_upload_path(filepath):
+    """Path of the bytes behind an upload: the shared content file for an alias, else the upload itself.
+
+    Everything derived from a database (pools, metadata and count caches,
+    mirrors, indexes, column usage) is keyed by this path, so identical
+    uploads share it.
+    """
+    if os.path.islink(filepath):
+        return os.path.normpath(os.path.join(os.path.dirname(filepath), os.readlink(filepath)))
+    return filepath
+
+def count_upload_aliases(content_path):
+    """Uploads whose alias points at a content file (its reference count, kept in the catalog)"""
+    conn = get_catalog_connection()
+    try:
+        return conn.execute(
+            "SELECT COUNT(*) FROM upload_aliases WHERE content = ?", (os.path.basename(content_path),)
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+def catalog_add_alias(filename, content_path):
+    """Count an upload alias against its content file"""
+    conn = get_catalog_connection()
+    try:
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO upload_aliases (filename, content) VALUES (?, ?)",
+                         (filename, os.path.basename(content_path)))
+    finally:
+        conn.close()
+
+def store_upload_content(upload, sha256, filepath):
+    """Make filepath an alias of the content file for sha256, storing the spooled upload only if it is new"""
+    extension = filepath.rsplit('.', 1)[-1].lower()
+    content_path = os.path.join(get_content_folder(), f"{sha256}.{extension}")
+    # Held against remove_upload on any worker, so the content cannot vanish under the new alias
+    with content_lock(content_path):
+        deduplicated = os.path.exists(content_path)
+        if not deduplicated:
+            upload.commit(content_path)
+        # Aliases are relative symlinks, so the uploads folder can be moved as a whole
+        link_path = f"{filepath}.{uuid.uuid4().hex}.tmp"
+        os.symlink(os.path.relpath(content_path, os.path.dirname(filepath)), link_path)
+        os.replace(link_path, filepath)
+        catalog_add_alias(os.path.basename(filepath), content_path)
+    upload.discard()
+    return content_path, deduplicated
+
+def remove_upload(filepath):
+    """Delete an upload; its bytes and everything derived from them go with the last alias"""
+    filename = os.path.basename(filepath)
+    metrics_forget_database(filename)
+    source = resolve_upload_path(filepath)
+    if source == filepath:
+        # A plain (pre-deduplication) upload owns its bytes
+        close_connection_pool(filepath)
+        os.remove(filepath)
+        catalog_remove(filename)
+        invalidate_page_cache(filename)
+    else:
+        with content_lock(source):
+            os.remove(filepath)
+            catalog_remove(filename)
+            if count_upload_aliases(source) > 0:
+                invalidate_page_cache(filename)
+                return False
+            close_connection_pool(source)
+            try:
+                os.remove(source)
+            except FileNotFoundError:
+                pass
+        invalidate_page_cache(filename)
+        catalog_remove(os.path.basename(source))  # Column usage is recorded against the content file
+    invalidate_metadata(source)
+    invalidate_counts(source)
+    remove_sidecars(source)
+    return True
+
+def submit_background_task(key, func, *args):
+    """Run func(*args) on the background executor unless a task with the same key is in flight"""
+    with background_lock:
+        if key in background_tasks:
+            return False
+        background_tasks.add(key)
+
+    def run():
+        try:
+            func(*args)
+        except Exception as e:
+            logger.error(f"Background task {key} failed: {e}", exc_info=True)
+        finally:
+            with background_lock:
+                background_tasks.discard(key)
+
+    background_executor.submit(run)
+    return True
+
+def is_access_file(filepath):
+    """True for .mdb/.accdb files"""
+    return filepath.rsplit('.', 1)[-1].lower() in ('mdb', 'accdb')
+
+def get_mirror_status(filepath):
+    """Status of the SQLite mirror of an Access database.
+
+    Derived from files on disk so every worker process agrees: the builder
+    holds a .lock marker it keeps fresh, and the mirror is only renamed into
+    place once complete.
+    """
+    if not is_access_file(filepath):
+        return 'not_applicable'
+    mirror_path = get_sidecar_path(filepath, 'mirror')
+    if os.path.exists(mirror_path):
+        return 'ready'
+    with background_lock:
+        if ('mirror', filepath) in background_tasks:
+            return 'building'
+    try:
+        if time.time() - os.path.getmtime(mirror_path + '.lock') < MIRROR_STALE_SECONDS:
+            return 'building'
+    except OSError:
+        pass
+    if os.path.exists(mirror_path + '.failed'):
+        return 'failed'
+    return 'pending'
+
+def resolve_read_path(filepath):
+    """Path that reads for a database should be served from (the mirror once it is ready, or an indexed copy)"""
+    if get_mirror_status(filepath) == 'ready':
+        return get_sidecar_path(filepath, 'mirror')
+    indexed_path = get_sidecar_path(filepath, 'indexed')
+    try:
+        if os.path.getmtime(indexed_path) >= os.path.getmtime(filepath):
+            return indexed_path
+    except OSError:
+        pass
+    return filepath
+
+def schedule_access_mirror(filepath):
+    """Queue background conversion of an Access database into its SQLite mirror"""
+    if get_mirror_status(filepath) != 'pending':
+        return False
+    return submit_background_task(('mirror', filepath), build_access_mirror, filepath)
+
+def _mirror_value(value):
+    """Convert a pyodbc value into something sqlite3 can store"""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    if isinstance(value, (str, int, float)) or value is None:
+        return value
+    if hasattr(value, 'isoformat'):  # date / time
+        return value.isoformat()
+    return str(value)
+
+def get_access_indexes(conn, table_name):
+    """Primary key and declared indexes of an Access table as (name, unique, columns), from the ODBC catalog"""
+    indexes = OrderedDict()
+    cursor = conn.cursor()
+    try:
+        pk_rows = sorted(cursor.primaryKeys(table=table_name), key=lambda row: row.key_seq)
+        if pk_rows:
+            indexes[str(pk_rows[0].pk_name or 'PrimaryKey')] = (True, [str(row.column_name) for row in pk_rows])
+    except Exception as e:
+        db_logger.debug(f"primaryKeys() not available for {table_name}: {e}")
+    try:
+        # The Access driver reports the primary key here as well, as an index named PrimaryKey
+        statistics = [row for row in cursor.statistics(table=table_name) if row.index_name and row.column_name]
+        known = set(indexes)
+        for row in sorted(statistics, key=lambda row: (str(row.index_name), row.ordinal_position)):
+            name = str(row.index_name)
+            if name not in known:
+                indexes.setdefault(name, (not row.non_unique, []))[1].append(str(row.column_name))
+    except Exception as e:
+        db_logger.debug(f"statistics() not available for {table_name}: {e}")
+    seen = set()
+    result = []
+    # Unique indexes first, so they win over a plain index on the same columns
+    for name, (unique, columns) in sorted(indexes.items(), key=lambda item: not item[1][0]):
+        key = tuple(column.lower() for column in columns)
+        if key not in seen:
+            seen.add(key)
+            result.append((name, unique, columns))
+    return result
+
+def create_mirror_indexes(mirror, table_name, indexes):
+    """Recreate an Access table's primary key and indexes on its mirror table once the rows are loaded"""
+    for index_name, unique, columns in indexes:
+        digest = hashlib.sha1(f"{table_name}\0{index_name}".encode('utf-8')).hexdigest()[:12]
+        column_list = ", ".join(f"[{column.replace(']', ']]')}]" for column in columns)
+        table_escaped = f"[{table_name.replace(']', ']]')}]"
+        try:
+            mirror.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX mirror_{digest} ON {table_escaped} ({column_list})")
+        except sqlite3.Error as e:
+            # Converted values can collide (decimals are stored as floats); keep the index for
+            # ordering and lookups even when uniqueness does not carry over
+            db_logger.warning(f"Could not create index {index_name} on mirror table {table_name}: {e}")
+            if unique:
+                mirror.execute(f"CREATE INDEX mirror_{digest} ON {table_escaped} ({column_list})")
+
+def build_access_mirror(filepath):
+    """Stream every table of an Access database into a sidecar SQLite file in batches"""
+    mirror_path = get_sidecar_path(filepath, 'mirror')
+    marker_path = mirror_path + '.lock'
+    failed_path = mirror_path + '.failed'
+    sidecar_folder = get_sidecar_folder()
+    os.makedirs(sidecar_folder, exist_ok=True)
+    # One builder per mirror across workers; a marker is only taken over once its holder stopped touching it
+    if not acquire_lock_marker(marker_path, 0, MIRROR_STALE_SECONDS):
+        return
+    if os.path.exists(mirror_path):
+        os.remove(marker_path)  # Published by another worker since it was scheduled
+        return
+    # Temporary files of builders that died; only removed while holding the marker
+    tmp_prefix = os.path.basename(mirror_path) + '.'
+    for name in os.listdir(sidecar_folder):
+        if name.startswith(tmp_prefix) and name.endswith('.tmp'):
+            os.remove(os.path.join(sidecar_folder, name))
+    if os.path.exists(failed_path):
+        os.remove(failed_path)
+    tmp_path = f"{mirror_path}.{uuid.uuid4().hex}.tmp"
+    heartbeat_stop = threading.Event()
+    threading.Thread(target=heartbeat_lock_marker, args=(marker_path, heartbeat_stop, MIRROR_STALE_SECONDS / 5),
+                     name='dbviewer-mirror-heartbeat', daemon=True).start()
+
+    started = time.time()
+    source = None
+    mirror = None
+    try:
+        # Use a private connection; the cached one may be serving requests
+        source = open_db_connection(filepath)
+        mirror = sqlite3.connect(tmp_path)
+        mirror.execute("PRAGMA journal_mode=OFF")
+        mirror.execute("PRAGMA synchronous=OFF")
+
+        total_rows = 0
+        total_indexes = 0
+        for table_name in get_tables(source):
+            declared_types = {c['name']: c['type'] for c in get_table_info(source, table_name)}
+            # Read before the bulk load opens a cursor on the table
+            indexes = get_access_indexes(source, table_name) if isinstance(source, pyodbc.Connection) else []
+            cursor = source.cursor()
+            cursor.execute(f"SELECT * FROM [{table_name.replace(']', ']]')}]")
+            column_names = [str(col[0]) for col in cursor.description]
+
+            table_escaped = f"[{table_name.replace(']', ']]')}]"
+            column_defs = ", ".join(
+                f"[{name.replace(']', ']]')}] {declared_types.get(name, '')}".rstrip() for name in column_names
+            )
+            mirror.execute(f"CREATE TABLE {table_escaped} ({column_defs})")
+            insert_sql = f"INSERT INTO {table_escaped} VALUES ({', '.join('?' * len(column_names))})"
+
+            while True:
+                batch = cursor.fetchmany(MIRROR_BATCH_SIZE)
+                if not batch:
+                    break
+                mirror.executemany(insert_sql, [[_mirror_value(v) for v in row] for row in batch])
+                mirror.commit()
+                total_rows += len(batch)
+
+            # Built after the load, which is faster than maintaining them row by row
+            create_mirror_indexes(mirror, table_name, indexes)
+            mirror.commit()
+            total_indexes += len(indexes)
+
+        mirror.commit()
+        mirror.close()
+        mirror = None
+        os.replace(tmp_path, mirror_path)
+        db_logger.info(f"Built SQLite mirror for {os.path.basename(filepath)}: {total_rows} rows and {total_indexes} indexes in {time.time() - started:.1f}s")
+    except Exception as e:
+        error_details = format_pyodbc_error(e) if isinstance(e, pyodbc.Error) else str(e)
+        db_logger.error(f"Failed to build SQLite mirror for {filepath}: {error_details}")
+        if mirror is not None:
+            mirror.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        if os.path.exists(filepath):
+            with open(failed_path, 'w') as f:
+                f.write(error_details)
+    finally:
+        heartbeat_stop.set()
+        try:
+            os.remove(marker_path)
+        except FileNotFoundError:
+            pass
+        if source is not None:
+            try:
+                source.close()
+            except Exception:
+                pass
+    # Analysis waits for the mirror so it reads SQLite instead of going through ODBC
+    schedule_database_analysis(filepath, after_mirror=True)
+
+def _fts_table_name(table_name):
+    """Stable, identifier-safe name for a table's FTS shadow table"""
+    return 'fts_' + hashlib.sha1(table_name.encode('utf-8')).hexdigest()[:16]
+
+def open_fts_sidecar(fts_path):
+    """Open (creating if needed) the writable full-text index sidecar of a database"""
+    os.makedirs(os.path.dirname(fts_path), exist_ok=True)
+    conn = sqlite3.connect(fts_path, timeout=30.0, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")  # Readers attach while other tables are being built
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS fts_tables (
+            table_name TEXT PRIMARY KEY,
+            fts_name TEXT NOT NULL,
+            columns_json TEXT NOT NULL,
+            source_version TEXT,
+            status TEXT NOT NULL,
+            row_count INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            updated_at REAL NOT NULL
+        )
+    """)
+    return conn
+
+def _fts_source_version(filepath, read_path):
+    # Keyed on the upload, not the read copy: adding auto indexes rewrites the copy but keeps its rowids
+    size, mtime_ns = get_file_version(filepath)
+    source = 'mirror' if read_path == get_sidecar_path(filepath, 'mirror') else 'upload'
+    return f"{source}:{size}:{mtime_ns}"
+
+def get_fts_status(filepath, table_name):
+    """State of a table's full-text index: none, building, ready, stale or failed"""
+    fts_path = get_sidecar_path(filepath, 'fts')
+    if not os.path.exists(fts_path):
+        return {'status': 'none'}
+    conn = sqlite3.connect(fts_path, timeout=30.0)
+    try:
+        row = conn.execute(
+            "SELECT fts_name, columns_json, source_version, status, row_count, error, updated_at "
+            "FROM fts_tables WHERE table_name = ?", (table_name,)
+        ).fetchone()
+    except sqlite3.Error:
+        row = None
+    finally:
+        conn.close()
+    if row is None:
+        return {'status': 'none'}
+    fts_name, columns_json, source_version, status, row_count, error, updated_at = row
+    if status == 'building' and time.time() - updated_at > MIRROR_STALE_SECONDS:
+        status = 'failed'
+        error = error or 'Build was abandoned'
+    elif status == 'ready':
+        read_path = resolve_read_path(filepath)
+        if not os.path.exists(read_path) or source_version != _fts_source_version(filepath, read_path):
+            status = 'stale'
+    return {
+        'status': status, 'path': fts_path, 'name': fts_name,
+        'columns': json.loads(columns_json), 'rows': row_count, 'error': error
+    }
+
+def schedule_fts_index(filepath, table_name):
+    """Queue a background (re)build of a table's full-text index"""
+    read_path = resolve_read_path(filepath)
+    if is_access_file(read_path):
+        return False  # Needs rowids; Access tables are indexed once their mirror is ready
+    return submit_background_task(('fts', filepath, table_name), build_fts_index, filepath, read_path, table_name)
+
+def build_fts_index(filepath, read_path, table_name):
+    """Copy a table's values into a contentless FTS5 trigram table keyed by source rowid"""
+    fts_path = get_sidecar_path(filepath, 'fts')
+    fts_name = _fts_table_name(table_name)
+    source = open_db_connection(read_path)
+    # CAST(blob AS TEXT) may yield invalid UTF-8; index what decodes
+    source.text_factory = lambda b: b.decode('utf-8', 'replace')
+    fts = open_fts_sidecar(fts_path)
+    started = time.time()
+    try:
+        columns = discover_table_info(source, table_name)[0]
+        indexed_columns = [{'name': c['name'], 'text': column_type_family(c['type']) == 'text'} for c in columns]
+        with fts:
+            fts.execute(
+                "INSERT OR REPLACE INTO fts_tables (table_name, fts_name, columns_json, status, updated_at) "
+                "VALUES (?, ?, ?, 'building', ?)", (table_name, fts_name, json.dumps(indexed_columns), time.time())
+            )
+            fts.execute(f"DROP TABLE IF EXISTS {fts_name}")
+            column_defs = ", ".join(f"c{i}" for i in range(len(columns)))
+            fts.execute(f"CREATE VIRTUAL TABLE {fts_name} USING fts5({column_defs}, content='', tokenize='trigram')")
+
+        source_version = _fts_source_version(filepath, read_path)
+        select_list = ", ".join(f"CAST([{c['name'].replace(']', ']]')}] AS TEXT)" for c in columns)
+        cursor = source.execute(f"SELECT rowid, {select_list} FROM [{table_name.replace(']', ']]')}]")
+        insert_sql = f"INSERT INTO {fts_name} (rowid, {column_defs}) VALUES (?, {', '.join('?' * len(columns))})"
+        row_count = 0
+        while True:
+            batch = cursor.fetchmany(FTS_BATCH_SIZE)
+            if not batch:
+                break
+            row_count += len(batch)
+            with fts:
+                fts.executemany(insert_sql, batch)
+                fts.execute("UPDATE fts_tables SET row_count = ?, updated_at = ? WHERE table_name = ?",
+                            (row_count, time.time(), table_name))
+        with fts:
+            fts.execute("UPDATE fts_tables SET status = 'ready', source_version = ?, updated_at = ? WHERE table_name = ?",
+                        (source_version, time.time(), table_name))
+        db_logger.info(f"Built full-text index for {os.path.basename(filepath)}/{table_name}: {row_count} rows in {time.time() - started:.1f}s")
+    except Exception as e:
+        db_logger.error(f"Failed to build full-text index for {filepath}/{table_name}: {e}")
+        with fts:
+            fts.execute("UPDATE fts_tables SET status = 'failed', error = ?, updated_at = ? WHERE table_name = ?",
+                        (str(e), time.time(), table_name))
+    finally:
+        fts.close()
+        source.close()
+
+def drop_fts_index(filepath, table_name):
+    """Remove a table's full-text index; returns False if there was none"""
+    fts_path = get_sidecar_path(filepath, 'fts')
+    if not os.path.exists(fts_path):
+        return False
+    fts = open_fts_sidecar(fts_path)
+    try:
+        with fts:
+            deleted = fts.execute("DELETE FROM fts_tables WHERE table_name = ?", (table_name,)).rowcount
+            fts.execute(f"DROP TABLE IF EXISTS {_fts_table_name(table_name)}")
+        return bool(deleted)
+    finally:
+        fts.close()
+
+def attach_fts_index(conn, fts_path):
+    """Attach a full-text sidecar to a SQLite connection under FTS_SCHEMA (once per connection)"""
+    attached = {row[1] for row in conn.execute("PRAGMA database_list")}
+    if FTS_SCHEMA not in attached:
+        conn.execute(f"ATTACH DATABASE ? AS {FTS_SCHEMA}", (fts_path,))
+
+def get_fts_search_index(conn, filepath, read_path, table_name, search_term):
+    """Return the descriptor of a ready full-text index usable for this search, or None.
+
+    Falls back to LIKE (returns None) while the index is missing, building or
+    stale, for Access connections, and for terms the trigram index cannot answer.
+    """
+    if not search_term or len(search_term) < FTS_MIN_TERM_LENGTH or isinstance(conn, pyodbc.Connection):
+        return None
+    columns = get_cached_table_info(conn, read_path, table_name)
+    if parse_field_search(columns, search_term):
+        return None  # Field searches compile to their own index-friendly predicates
+    status = get_fts_status(filepath, table_name)
+    if status['status'] == 'none' and FTS_AUTO_BUILD:
+        schedule_fts_index(filepath, table_name)
+    if status['status'] != 'ready':
+        return None
+    key_expr = get_cached_keyset_tiebreaker(conn, read_path, table_name, columns)
+    if key_expr not in ('rowid', '_rowid_', 'oid'):
+        return None
+    attach_fts_index(conn, status['path'])
+    return {'path': status['path'], 'name': status['name'], 'columns': status['columns'], 'key': key_expr}
+
+def build_fts_condition(fts, search_term, search_columns):
+    """WHERE condition matching rows whose indexed values contain search_term"""
+    if search_columns and search_columns != ['all']:
+        wanted = set(search_columns)
+        indexes = [i for i, c in enumerate(fts['columns']) if c['name'] in wanted]
+    else:
+        indexes = [i for i, c in enumerate(fts['columns']) if c['text']]
+    if not indexes:
+        return [], []
+    phrase = '"' + search_term.replace('"', '""') + '"'
+    match = "{" + " ".join(f"c{i}" for i in indexes) + "} : " + phrase
+    condition = (f"{fts['key']} IN (SELECT rowid FROM {FTS_SCHEMA}.{fts['name']} "
+                 f"WHERE {fts['name']} MATCH ?)")
+    return [condition], [match]
+
+def auto_index_name(table_name, column_name):
+    """Deterministic, identifier-safe name of the auto index on a column"""
+    digest = hashlib.sha1(f"{table_name}\0{column_name}".encode('utf-8')).hexdigest()[:12]
+    return f"{AUTO_INDEX_PREFIX}{digest}"
+
+def get_auto_index_target(filepath):
+    """SQLite file auto indexes for a database are written to (None while an Access mirror is not ready)"""
+    if is_access_file(filepath):
+        return get_sidecar_path(filepath, 'mirror') if get_mirror_status(filepath) == 'ready' else None
+    return get_sidecar_path(filepath, 'indexed')
+
+def note_column_usage(conn, filepath, read_path, table_name, column_name, kind):
+    """Record a sort/search on a column and queue an index build once it is used often enough"""
+    if AUTO_INDEX_THRESHOLD <= 0 or not isinstance(conn, sqlite3.Connection):
+        return
+    if column_name.lower() in get_cached_indexed_columns(conn, read_path, table_name):
+        return
+    uses, suppressed = record_column_usage(os.path.basename(filepath), table_name, column_name, kind)
+    if uses >= AUTO_INDEX_THRESHOLD and not suppressed and get_auto_index_target(filepath):
+        submit_background_task(('auto-index', filepath), build_auto_indexes, filepath)
+
+def _auto_index_candidates(filename):
+    """(table, column) pairs used at least AUTO_INDEX_THRESHOLD times, most used first"""
+    conn = get_catalog_connection()
+    try:
+        return conn.execute(
+            "SELECT table_name, column_name FROM column_usage "
+            "WHERE filename = ? AND suppressed = 0 AND sorts + searches >= ? "
+            "ORDER BY sorts + searches DESC",
+            (filename, AUTO_INDEX_THRESHOLD)
+        ).fetchall()
+    finally:
+        conn.close()
+
+def _list_auto_index_names(conn):
+    return {row[0]: row[1] for row in conn.execute(
+        "SELECT name, tbl_name FROM sqlite_master WHERE type = 'index' AND name LIKE ?",
+        (AUTO_INDEX_PREFIX + '%',)
+    )}
+
+class IndexRewriteBusy(RuntimeError):
+    """Another worker is rewriting the same indexed copy or mirror"""
+
+def _index_source_path(filepath, target_path):
+    """File an index rewrite copies from: the mirror itself, or whatever SQLite reads are served from"""
+    return target_path if is_access_file(filepath) else resolve_read_path(filepath)
+
+class index_target_lock:
+    """Hold an indexed copy or mirror against rewrites (and removal) by other threads and worker processes.
+
+    Raises IndexRewriteBusy if another worker still holds the target after
+    `wait` seconds.
+    """
+
+    def __init__(self, target_path, wait=0):
+        self.marker_path = target_path + '.lock'
+        self.wait = wait
+
+    def __enter__(self):
+        index_rewrite_lock.acquire()
+        try:
+            os.makedirs(get_sidecar_folder(), exist_ok=True)
+            if not acquire_lock_marker(self.marker_path, self.wait, INDEX_REWRITE_LOCK_STALE_SECONDS):
+                raise IndexRewriteBusy(f"{os.path.basename(self.marker_path)[:-5]} is being rewritten by another worker")
+        except BaseException:
+            index_rewrite_lock.release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            os.remove(self.marker_path)
+        except FileNotFoundError:
+            pass
+        finally:
+            index_rewrite_lock.release()
+        return False
+
+def _rewrite_index_target(filepath, target_path, modify, wait=0):
+    """Copy the read file, apply modify(conn) to the copy and swap it in (pools key on file version).
+
+    Rewrites of one target are serialized across threads and worker
+    processes so none loses another's changes.
+    """
+    with index_target_lock(target_path, wait):
+        tmp_path = f"{target_path}.idx-{uuid.uuid4().hex}.tmp"
+        try:
+            shutil.copyfile(_index_source_path(filepath, target_path), tmp_path)
+            conn = sqlite3.connect(tmp_path)
+            try:
+                conn.execute("PRAGMA journal_mode=DELETE")
+                result = modify(conn)
+                conn.commit()
+            finally:
+                conn.close()
+            os.replace(tmp_path, target_path)
+            return result
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+def _plan_auto_indexes(conn, candidates):
+    """Split candidate columns into ((table, column) to index, (table, column) that cannot or need not be)"""
+    per_table = {}
+    for table_name in _list_auto_index_names(conn).values():
+        per_table[table_name] = per_table.get(table_name, 0) + 1
+    tables = set(get_tables(conn))
+    planned, skipped = [], []
+    for table_name, column_name in candidates:
+        if (table_name not in tables
+                or per_table.get(table_name, 0) >= AUTO_INDEX_MAX_PER_TABLE
+                or column_name.lower() in discover_indexed_columns(conn, table_name)
+                or column_name not in {c['name'] for c in get_table_info(conn, table_name)}):
+            skipped.append((table_name, column_name))
+            continue
+        per_table[table_name] = per_table.get(table_name, 0) + 1
+        planned.append((table_name, column_name))
+    return planned, skipped
+
+def _skip_column_usage(filename, columns):
+    """Stop columns that cannot be indexed from queuing further builds (suppressed = 2; 1 means dropped by an admin)"""
+    conn = get_catalog_connection()
+    try:
+        with conn:
+            conn.executemany(
+                "UPDATE column_usage SET suppressed = 2 WHERE filename = ? AND table_name = ? AND column_name = ? AND suppressed = 0",
+                [(filename, table_name, column_name) for table_name, column_name in columns]
+            )
+    finally:
+        conn.close()
+
+def build_auto_indexes(filepath):
+    """Create indexes for frequently sorted/searched columns in the database's indexed copy or mirror"""
+    filename = os.path.basename(filepath)
+    target_path = get_auto_index_target(filepath)
+    candidates = _auto_index_candidates(filename)
+    if target_path is None or not candidates:
+        return
+
+    # Decide on a read-only connection first, so nothing is copied when there is nothing to build
+    conn = sqlite3.connect(sqlite_read_only_uri(_index_source_path(filepath, target_path)), uri=True)
+    try:
+        _, skipped = _plan_auto_indexes(conn, candidates)
+    finally:
+        conn.close()
+    if skipped:
+        _skip_column_usage(filename, skipped)
+    if len(skipped) == len(candidates):
+        return
+
+    def create_indexes(conn):
+        # Planned again on the copy, which may include another worker's rewrite since
+        created = []
+        planned, _ = _plan_auto_indexes(conn, candidates)
+        for table_name, column_name in planned:
+            index_name = auto_index_name(table_name, column_name)
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {_escape_column(table_name)} ({_escape_column(column_name)})")
+            created.append(f"{table_name}.{column_name}")
+        if created:
+            conn.execute("ANALYZE")
+        return created
+
+    started = time.time()
+    try:
+        created = _rewrite_index_target(filepath, target_path, create_indexes)
+    except IndexRewriteBusy as e:
+        # Usage is kept in the catalog, so the next qualifying request queues the build again
+        db_logger.info(f"Skipped auto index build for {filename}: {e}")
+        return
+    if created:
+        db_logger.info(f"Built auto indexes for {os.path.basename(filepath)} on {', '.join(created)} in {time.time() - started:.1f}s")
+        schedule_database_analysis(filepath)  # Restamps the analysis against the rewritten copy
+
+def list_auto_indexes(filepath):
+    """Auto indexes of a database with the usage that triggered them"""
+    target_path = get_auto_index_target(filepath)
+    if target_path is None or not os.path.exists(target_path):
+        return []
+    conn = sqlite3.connect(sqlite_read_only_uri(target_path), uri=True)
+    try:
+        indexes = []
+        for index_name, table_name in sorted(_list_auto_index_names(conn).items()):
+            info = conn.execute(f"PRAGMA index_info({index_name})").fetchall()
+            indexes.append({'name': index_name, 'table': table_name, 'column': info[0][2] if info else None})
+    finally:
+        conn.close()
+    catalog = get_catalog_connection()
+    try:
+        usage = {
+            (row[0], row[1]): {'sorts': row[2], 'searches': row[3], 'last_used': row[4]}
+            for row in catalog.execute(
+                "SELECT table_name, column_name, sorts, searches, last_used FROM column_usage WHERE filename = ?",
+                (os.path.basename(filepath),)
+            )
+        }
+    finally:
+        catalog.close()
+    for index in indexes:
+        index.update(usage.get((index['table'], index['column']), {'sorts': 0, 'searches': 0, 'last_used': None}))
+    return indexes
+
+def drop_auto_index(filepath, index_name):
+    """Drop an auto index and stop it from being rebuilt; returns False if there was none"""
+    target_path = get_auto_index_target(filepath)
+    if target_path is None or not os.path.exists(target_path):
+        return False
+    indexes = {index['name']: index for index in list_auto_indexes(filepath)}
+    index = indexes.get(index_name)
+    if index is None:
+        return False
+    catalog = get_catalog_connection()
+    try:
+        with catalog:
+            catalog.execute(
+                "UPDATE column_usage SET suppressed = 1 WHERE filename = ? AND table_name = ? AND column_name = ?",
+                (os.path.basename(filepath), index['table'], index['column'])
+            )
+            # The table is below its index cap again, so columns skipped for it may be indexed after all
+            catalog.execute(
+                "UPDATE column_usage SET suppressed = 0 WHERE filename = ? AND table_name = ? AND suppressed = 2",
+                (os.path.basename(filepath), index['table'])
+            )
+    finally:
+        catalog.close()
+    removed = False
+    if not is_access_file(filepath):
+        with index_target_lock(target_path, INDEX_REWRITE_LOCK_WAIT):
+            # Checked again under the lock, since a build may have added indexes since they were listed
+            conn = sqlite3.connect(sqlite_read_only_uri(target_path), uri=True)
+            try:
+                remaining = set(_list_auto_index_names(conn))
+            finally:
+                conn.close()
+            if remaining <= {index_name}:
+                # The indexed copy exists only for its auto indexes
+                close_connection_pool(target_path)
+                invalidate_metadata(target_path)
+                invalidate_counts(target_path)
+                os.remove(target_path)
+                removed = True
+    if not removed:
+        _rewrite_index_target(filepath, target_path, lambda conn: conn.execute(f"DROP INDEX IF EXISTS {index_name}"),
+                              wait=INDEX_REWRITE_LOCK_WAIT)
+    close_connection_pool(target_path)
+    invalidate_metadata(target_path)
+    schedule_database_analysis(filepath)
+    return True
+
+def analysis_due(filepath, record):
+    """Whether a database needs analyzing: never analyzed, abandoned, failed and past its backoff, or read from a changed file"""
+    if record is None:
+        return True
+    age = time.time() - record['updated']
+    if record['status'] == 'running':
+        return age > ANALYSIS_STALE_SECONDS
+    if record['status'] == 'failed':
+        attempts = record['stats'].get('attempts', 1)
+        return age > min(ANALYSIS_RETRY_SECONDS * 2 ** (attempts - 1), ANALYSIS_RETRY_MAX_SECONDS)
+    # Auto index rewrites and a finished mirror change the file reads come from, and seeding needs an exact match
+    read_path = resolve_read_path(filepath)
+    try:
+        version = get_file_version(read_path)
+    except OSError:
+        return False
+    return record['read_file'] != os.path.basename(read_path) or (record['read_size'], record['read_mtime_ns']) != version
+
+def schedule_database_analysis(filepath, after_mirror=False):
+    """Queue the analysis of a database when it is due (and not waiting for its Access mirror)"""
+    if not ANALYSIS_ENABLED:
+        return False
+    if not after_mirror and get_mirror_status(filepath) in ('pending', 'building'):
+        return False
+    filename = os.path.basename(filepath)
+    if not analysis_due(filepath, load_database_analyses([filename]).get(filename)):
+        return False
+    return submit_background_task(('analysis', filepath), analyze_database, filepath)
+
+def ensure_sqlite_statistics(filepath):
+    """Add ANALYZE statistics to the indexed copy or mirror reads come from; returns whether reads have statistics.
+
+    Uploads are never modified, and no copy is made just for statistics: a
+    plain upload keeps only the figures recorded in the catalog until an
+    auto index creates its indexed copy (which runs ANALYZE itself). Tables
+    without indexes gain nothing from ANALYZE, so such files are left alone.
+    """
+    read_path = resolve_read_path(filepath)
+    if read_path == filepath and is_access_file(filepath):
+        return False  # Still read through ODBC
+    with pooled_connection(read_path) as conn:
+        has_statistics = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone() is not None
+        has_indexes = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' LIMIT 1").fetchone() is not None
+    if has_statistics or not has_indexes or read_path == filepath or os.path.getsize(read_path) > ANALYSIS_ANALYZE_MAX_BYTES:
+        return has_statistics
+    started = time.time()
+    try:
+        _rewrite_index_target(filepath, read_path, lambda conn: conn.execute("ANALYZE"))
+    except IndexRewriteBusy:
+        return False  # An auto index build is rewriting the copy and runs ANALYZE itself
+    db_logger.info(f"Collected ANALYZE statistics for {os.path.basename(filepath)} in {time.time() - started:.1f}s")
+    return True
+
+def _value_size(value):
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    return len(str(value).encode('utf-8'))
+
+def sample_row_bytes(conn, table_name):
+    """Average size in bytes of a row's values, from the first ANALYSIS_SAMPLE_ROWS rows"""
+    table_escaped = f"[{table_name.replace(']', ']]')}]"
+    cursor = conn.cursor()
+    if isinstance(conn, pyodbc.Connection):
+        cursor.execute(f"SELECT TOP {ANALYSIS_SAMPLE_ROWS} * FROM {table_escaped}")
+    else:
+        cursor.execute(f"SELECT * FROM {table_escaped} LIMIT {ANALYSIS_SAMPLE_ROWS}")
+    rows = cursor.fetchall()
+    if not rows:
+        return 0
+    return round(sum(_value_size(value) for row in rows for value in row) / len(rows))
+
+def analyze_database(filepath):
+    """Collect row counts, columns, statistics and size estimates of every table and persist them in the catalog.
+
+    Runs on the background executor after an upload (or once an Access
+    mirror is built), and again when the file reads come from changes.
+    Progress is recorded after each table, and the metadata and count
+    caches of this worker are warmed as a side effect; other workers seed
+    theirs from the catalog record.
+    """
+    filename = os.path.basename(filepath)
+    started = time.time()
+    read_path = None
+    tables_done = tables_total = 0
+    previous = load_database_analyses([filename]).get(filename)
+    try:
+        source_version = list(get_file_version(filepath))
+        # An indexed copy or mirror rewrite keeps the rows, so known figures are reused while the upload
+        # itself is unchanged; moving from ODBC to the mirror changes column types, so that is redone
+        known = {}
+        if (previous is not None and previous['status'] == 'ready'
+                and previous['stats'].get('source_version') == source_version
+                and not (is_access_file(filepath) and previous['read_file'] == filename)):
+            known = previous['stats'].get('tables', {})
+        statistics = ensure_sqlite_statistics(filepath)
+        read_path = resolve_read_path(filepath)
+        with pooled_connection(read_path) as conn:
+            tables = get_cached_tables(conn, read_path)
+            tables_total = len(tables)
+            stats = {'statistics': statistics, 'source_version': source_version, 'tables': {}}
+            if isinstance(conn, sqlite3.Connection):
+                stats['page_size'] = conn.execute("PRAGMA page_size").fetchone()[0]
+                stats['page_count'] = conn.execute("PRAGMA page_count").fetchone()[0]
+            store_database_analysis(filename, 'running', 0, tables_total, read_path, stats)
+            for table_name in tables:
+                columns = get_cached_table_info(conn, read_path, table_name)
+                get_cached_keyset_tiebreaker(conn, read_path, table_name, columns)
+                if table_name in known:
+                    rows, avg_row_bytes = known[table_name]['rows'], known[table_name]['avg_row_bytes']
+                    _count_cache_put(_count_cache_key(read_path, table_name, '', []), rows)
+                else:
+                    with timed_stage('analysis'):
+                        rows, _ = _compute_counts(conn, read_path, table_name, columns, '', [])
+                        avg_row_bytes = sample_row_bytes(conn, table_name)
+                stats['tables'][table_name] = {
+                    'rows': rows, 'columns': columns, 'column_count': len(columns),
+                    'avg_row_bytes': avg_row_bytes, 'page_bytes': avg_row_bytes * min(rows, ANALYSIS_PAGE_ROWS)
+                }
+                tables_done += 1
+                store_database_analysis(filename, 'running', tables_done, tables_total, read_path, stats)
+        store_database_analysis(filename, 'ready', tables_done, tables_total, read_path, stats)
+        db_logger.info(f"Analyzed {filename}: {tables_total} tables in {time.time() - started:.1f}s")
+    except Exception as e:
+        error_details = format_pyodbc_error(e) if isinstance(e, pyodbc.Error) else str(e)
+        db_logger.error(f"Failed to analyze {filename}: {error_details}")
+        if os.path.exists(filepath):
+            # Retried after a backoff that grows with each failure
+            attempts = previous['stats'].get('attempts', 1) + 1 if previous is not None and previous['status'] == 'failed' else 1
+            store_database_analysis(filename, 'failed', tables_done, tables_total, None, {'attempts': attempts}, error_details)
+
+def _export_value(value):
+    """Convert a database value for export: strings, numbers and None pass through"""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, bytes):
+        try:
+            return value.decode('utf-8')
+        except UnicodeDecodeError:
+            return value.decode('latin-1')
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return str(value)
+
+def generate_export(read_path, filepath, table_name, columns, search_term, search_columns,
+                    sort_column, sort_order, export_format, compress):
+    """Yield an export of a table in fetchmany batches using constant memory.
+
+    Uses a private connection for the lifetime of the stream so a long
+    download never holds the shared one.
+    """
+    conn = open_db_connection(read_path)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+
+    def emit(text):
+        data = text.encode('utf-8')
+        return compressor.compress(data) if compressor else data
+
+    try:
+        fts = get_fts_search_index(conn, filepath, read_path, table_name, search_term) if search_term else None
+        query, params = build_search_query(
+            table_name, columns, search_term, search_columns, sort_column, sort_order, 0, 0, fts
+        )
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        column_names = [str(col[0]) for col in cursor.description]
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if export_format == 'csv' else None
+        if writer:
+            writer.writerow(column_names)
+
+        row_count = 0
+        while True:
+            batch = cursor.fetchmany(EXPORT_BATCH_SIZE)
+            if not batch:
+                break
+            row_count += len(batch)
+            if writer:
+                writer.writerows([_export_value(v) for v in row] for row in batch)
+            else:
+                for row in batch:
+                    buffer.write(json.dumps(dict(zip(column_names, map(_export_value, row))), ensure_ascii=False))
+                    buffer.write('\n')
+            chunk = emit(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+            if chunk:
+                yield chunk
+
+        if buffer.tell():
+            yield emit(buffer.getvalue())
+        if compressor:
+            yield compressor.flush()
+        db_logger.info(f"Exported {row_count} rows from {os.path.basename(filepath)}/{table_name} as {export_format}")
+    finally:
+        conn.close()
+
+def get_jobs_folder():
+    """Folder holding the state and spooled results of query jobs"""
+    return os.path.join(get_sidecar_folder(), 'jobs')
+
+def _job_path(job_id, name):
+    return os.path.join(get_jobs_folder(), job_id, name)
+
+def _write_job_status(status):
+    """Atomically replace a job's status file"""
+    tmp_path = _job_path(status['id'], 'status.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(status, f)
+    os.replace(tmp_path, _job_path(status['id'], 'status.json'))
+
+def read_job_status(job_id):
+    """Current status of a job, or None if it is unknown"""
+    try:
+        with open(_job_path(job_id, 'status.json'), encoding='utf-8') as f:
+            status = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Queued jobs get heartbeats too, so a job lost with its worker never stays queued forever
+    if status['state'] in ('queued', 'running') and time.time() - status['heartbeat'] > JOB_STALE_SECONDS:
+        status.update(state='failed', error='Job was lost because its worker stopped')
+    return status
 
-def get_total_count(conn, table_name, columns, search_term, search_columns):
-    """Get total count of rows (with search if applicable)"""
-    query = f"SELECT COUNT(*) FROM [{table_name}]"
-    params = []
-    
-    if search_term and columns:
-        if search_columns and search_columns != ['all']:
-            search_conditions = []
-            for col in search_columns:
-                if col in [c['name'] for c in columns]:
-                    search_conditions.append(f"[{col}] LIKE ?")
-                    params.append(f"%{search_term}%")
-            if search_conditions:
-                query += " WHERE " + " OR ".join(search_conditions)
+def cleanup_expired_jobs():
+    """Remove finished jobs older than the retention period"""
+    jobs_folder = get_jobs_folder()
+    if not os.path.isdir(jobs_folder):
+        return
+    cutoff = time.time() - JOB_RETENTION_SECONDS
+    for job_id in os.listdir(jobs_folder):
+        status = read_job_status(job_id)
+        if status is None or (status['state'] not in ('queued', 'running') and status['heartbeat'] < cutoff):
+            job_dir = os.path.join(jobs_folder, job_id)
+            if os.path.getmtime(job_dir) < cutoff:
+                shutil.rmtree(job_dir, ignore_errors=True)
+
+class QueryJob:
+    """A page or count query run off the request path, cancellable from any worker.
+
+    Results are spooled to result.ndjson in the job folder. Another worker
+    cancels a job by creating its cancel marker; the job's watcher thread
+    notices it and interrupts the query (sqlite3 interrupt, pyodbc cursor cancel).
+    """
+
+    def __init__(self, job_id, database_id, filepath, table_name, kind, params):
+        self.filepath = filepath
+        self.table_name = table_name
+        self.kind = kind
+        self.params = params
+        self.conn = None
+        self.cursor = None
+        self.steps = 0
+        self.deadline = None
+        self.cancel_event = threading.Event()
+        self.done_event = threading.Event()
+        self.lock = threading.Lock()
+        now = time.time()
+        self.status = {
+            'id': job_id, 'database_id': database_id, 'table': table_name, 'kind': kind, 'params': params,
+            'state': 'queued', 'created': now, 'started': None, 'finished': None, 'heartbeat': now,
+            'progress': {'steps': 0}, 'result': None, 'error': None
+        }
+
+    def update(self, **fields):
+        with self.lock:
+            self.status.update(fields)
+            self.status['heartbeat'] = time.time()
+            _write_job_status(self.status)
+
+    def cancel(self):
+        """Stop the job: interrupt the running statement, or skip it if not yet started"""
+        self.cancel_event.set()
+        try:
+            if isinstance(self.conn, sqlite3.Connection):
+                self.conn.interrupt()
+            elif self.cursor is not None:
+                self.cursor.cancel()
+        except Exception as e:
+            db_logger.warning(f"Job {self.status['id']}: could not cancel query: {e}")
+
+    def _on_progress(self):
+        self.steps += JOB_PROGRESS_STEPS
+        return 1 if self.cancel_event.is_set() or self.deadline.expired else 0
+
+    def start_watcher(self):
+        """Heartbeat the job from submission on, while it waits in the queue as well as while it runs"""
+        threading.Thread(target=self._watch, name=f"dbviewer-job-watch-{self.status['id'][:8]}", daemon=True).start()
+
+    def _watch(self):
+        """Write heartbeats and progress; pick up cancel markers written by other workers"""
+        marker = _job_path(self.status['id'], 'cancel')
+        while not self.done_event.wait(JOB_HEARTBEAT_SECONDS):
+            if not self.cancel_event.is_set() and os.path.exists(marker):
+                self.cancel()
+            self.update(progress={'steps': self.steps})
+
+    def run(self):
+        job_id = self.status['id']
+        try:
+            if self.cancel_event.is_set() or os.path.exists(_job_path(job_id, 'cancel')):
+                self.update(state='cancelled', finished=time.time())
+                return
+            self.update(state='running', started=time.time())
+            try:
+                result = self._execute()
+                self.update(state='done', result=result, finished=time.time(), progress={'steps': self.steps})
+                db_logger.info(f"Job {job_id} ({self.kind} on {self.table_name}) finished in {self.status['finished'] - self.status['started']:.2f}s")
+            except Exception as e:
+                if self.cancel_event.is_set():
+                    self.update(state='cancelled', finished=time.time())
+                    db_logger.info(f"Job {job_id} cancelled")
+                elif self.deadline is not None and self.deadline.is_timeout(e):
+                    db_logger.warning(f"Job {job_id} exceeded its {QUERY_BUDGETS['job']:g}s time budget")
+                    self.update(state='failed', error=f"Query exceeded the {QUERY_BUDGETS['job']:g}s time budget", finished=time.time())
+                else:
+                    db_logger.error(f"Job {job_id} failed: {e}")
+                    self.update(state='failed', error=str(e), finished=time.time())
+        finally:
+            self.done_event.set()
+            if self.conn is not None:
+                _close_quietly(self.conn)
+            with jobs_lock:
+                active_jobs.pop(job_id, None)
+
+    def _execute(self):
+        params = self.params
+        search_term, search_columns = params['search'], params['search_columns']
+        read_path = resolve_read_path(self.filepath)
+        # A private connection, so interrupting it never affects pooled ones
+        self.conn = conn = open_db_connection(read_path)
+        self.deadline = QueryDeadline(QUERY_BUDGETS['job'])
+        if isinstance(conn, sqlite3.Connection):
+            # One handler serves progress, cancellation and the time budget
+            conn.set_progress_handler(self._on_progress, JOB_PROGRESS_STEPS)
+        elif self.deadline.expires_at is not None:
+            conn.timeout = max(int(math.ceil(self.deadline.remaining())), 1)
+        self.cursor = cursor = conn.cursor()
+        if self.cancel_event.is_set():
+            raise RuntimeError('Job cancelled')
+
+        if self.table_name not in get_cached_tables(conn, read_path):
+            raise ValueError(f"Table '{self.table_name}' not found")
+        columns = get_cached_table_info(conn, read_path, self.table_name)
+        fts = get_fts_search_index(conn, self.filepath, read_path, self.table_name, search_term) if search_term else None
+
+        if self.kind == 'count':
+            total, filtered = _compute_counts(conn, read_path, self.table_name, columns, search_term, search_columns, fts, cursor)
+            result = {'total': total, 'filtered': filtered}
+            lines = [result]
         else:
-            search_conditions = []
-            for col in columns:
-                search_conditions.append(f"[{col['name']}] LIKE ?")
-                params.append(f"%{search_term}%")
-            if search_conditions:
-                query += " WHERE " + " OR ".join(search_conditions)
-    
-    cursor = conn.cursor()
-    cursor.execute(query, params)
-    return cursor.fetchone()[0]
+            offset = (params['page'] - 1) * params['per_page']
+            query, query_params = build_search_query(
+                self.table_name, columns, search_term, search_columns,
+                params['sort_column'], params['sort_order'], params['per_page'], offset, fts
+            )
+            rows, description = execute_paginated_query(conn, query, query_params, params['per_page'], offset, cursor)
+            data = build_row_formatter(description, columns, search_term, columnar=True)(rows)
+            result = {'rows': len(data)}
+            lines = [{'columns': columns, 'row_columns': [col[0] for col in description]}] + data
 
-def highlight_search_term(value, search_term):
-    """Highlight search term in value"""
-    if not search_term or not value:
-        return value
-    
-    # Convert to string and escape HTML
-    str_value = str(value)
-    str_value = str_value.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-    
-    # Case-insensitive highlight
-    pattern = re.compile(re.escape(search_term), re.IGNORECASE)
-    return pattern.sub(lambda m: f'<mark>{m.group()}</mark>', str_value)
+        # Spool the result, renamed into place so readers never see a partial file
+        spool_path = _job_path(self.status['id'], 'result.ndjson')
+        with open(spool_path + '.tmp', 'w', encoding='utf-8') as f:
+            for line in lines:
+                f.write(json.dumps(line, ensure_ascii=False) + '\n')
+        os.replace(spool_path + '.tmp', spool_path)
+        return result
+
+def submit_query_job(database_id, filepath, table_name, kind, params):
+    """Queue a query job on the bounded job pool; returns its status, or None when this worker is saturated"""
+    with jobs_lock:
+        if len(active_jobs) >= JOB_QUEUE_LIMIT:
+            return None
+        job = QueryJob(uuid.uuid4().hex, database_id, filepath, table_name, kind, params)
+        active_jobs[job.status['id']] = job
+    try:
+        cleanup_expired_jobs()
+        os.makedirs(os.path.join(get_jobs_folder(), job.status['id']))
+        job.update()
+        job.start_watcher()
+        job_executor.submit(job.run)
+    except Exception:
+        job.done_event.set()
+        with jobs_lock:
+            active_jobs.pop(job.status['id'], None)
+        raise
+    return dict(job.status)
+
+def cancel_query_job(job_id):
+    """Ask a job to stop, whichever worker is running it; returns False if the job was removed meanwhile"""
+    try:
+        open(_job_path(job_id, 'cancel'), 'w').close()
+    except OSError:
+        return False
+    with jobs_lock:
+        job = active_jobs.get(job_id)
+    if job is not None:
+        job.cancel()
+    return True
 
 @app.route('/')
 def index():
@@ -643,106 +4040,247 @@ def index():
 def list_databases():
     """Get list of all uploaded databases"""
     try:
-        databases = get_all_databases()
-        return jsonify({
+        sort = request.args.get('sort', 'modified_time')
+        order = request.args.get('order', 'DESC').upper()
+        page = per_page = None
+        if 'page' in request.args or 'per_page' in request.args:
+            try:
+                page = max(int(request.args.get('page', 1)), 1)
+                per_page = min(max(int(request.args.get('per_page', 50)), 1), 500)
+            except (ValueError, TypeError):
+                return jsonify({'error': 'Invalid pagination parameters'}), 400
+        
+        databases, total = list_catalog_databases(page, per_page, sort, order)
+        response = jsonify({
             'success': True,
             'databases': databases,
+            'pagination': {'page': page, 'per_page': per_page, 'total': total},
             'admin_enabled': bool(DBVIEWER_ADMIN_TOKEN)
         })
+        # The listing changes with every upload, so clients revalidate each time (a 304 skips the body)
+        response.add_etag()
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
     except Exception as e:
         logger.error(f"Error listing databases: {e}")
         return jsonify({'error': str(e)}), 500
 
+def register_upload(upload, sha256, original_filename, file_size):
+    """Store a validated upload under a new database name and answer with its database info"""
+    # Sanitize filename
+    filename = sanitize_filename(secure_filename(original_filename))
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f"{timestamp}_{filename}"
+    
+    # Ensure upload directory exists
+    upload_folder = app.config['UPLOAD_FOLDER']
+    os.makedirs(upload_folder, exist_ok=True)
+    
+    filepath = os.path.join(upload_folder, filename)
+    
+    # Identical content is stored once; each upload name is an alias of it
+    try:
+        content_path, deduplicated = store_upload_content(upload, sha256, filepath)
+        upload_logger.info(f"File saved: {filename} (original: {original_filename}, size: {file_size}, sha256: {sha256}, "
+                           f"{'shares existing content' if deduplicated else 'new content'})")
+    except Exception as e:
+        upload_logger.error(f"Failed to save file {filename}: {e}")
+        upload.discard()
+        if os.path.islink(filepath):
+            remove_upload(filepath)
+        return jsonify({'error': 'Failed to save uploaded file'}), 500
+    
+    # Get database info with error handling
+    try:
+        db_info = get_database_info(filepath)
+        if not db_info:
+            upload_logger.error(f"Failed to read database info: {filename}")
+            remove_upload(filepath)
+            return jsonify({'error': 'Unable to read database file. File may be corrupted or password-protected'}), 500
+        
+        upload_logger.info(f"Database uploaded successfully: {filename}")
+        db_info['sha256'] = sha256
+        db_info['deduplicated'] = deduplicated
+        try:
+            catalog_upsert(db_info)
+        except Exception as e:
+            # The next reconcile picks the file up anyway
+            upload_logger.warning(f"Could not record {filename} in catalog: {e}")
+        if is_access_file(content_path):
+            schedule_access_mirror(content_path)
+            db_info['mirror_status'] = get_mirror_status(content_path)
+        try:
+            schedule_database_analysis(content_path)
+            content_name = os.path.basename(content_path)
+            db_info['analysis'] = describe_database_analysis(load_database_analyses([content_name]).get(content_name))
+        except Exception as e:
+            # Tables are still discovered on first view, just not ahead of it
+            upload_logger.warning(f"Could not schedule analysis of {filename}: {e}")
+        return jsonify({
+            'success': True,
+            'database': db_info
+        })
+        
+    except Exception as e:
+        upload_logger.error(f"Database processing error for {filename}: {e}")
+        if os.path.lexists(filepath):
+            remove_upload(filepath)
+        return jsonify({'error': f'Database processing failed: {str(e)}'}), 500
+
 @app.route('/upload', methods=['POST'])
 @limiter.limit("10 per minute")
 def upload_file():
     """Handle file upload with enhanced security and error handling"""
     try:
+        cleanup_stale_uploads()
+        # Parsing the form (here or in the CSRF check) streams the file part to disk; see StreamingUpload
+        files = request.files
+        
         # Check if file is in request
-        if 'file' not in request.files:
+        if 'file' not in files:
             log_security_event('missing_file', {'action': 'upload'})
             return jsonify({'error': 'No file provided'}), 400
         
-        file = request.files['file']
+        file = files['file']
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
         # Enhanced file validation
-        if not file or not allowed_file(file.filename):
+        if not file or not allowed_file(file.filename) or not isinstance(file.stream, StreamingUpload):
             log_security_event('invalid_file_type', {
                 'filename': file.filename,
                 'content_type': file.content_type
             })
             return jsonify({'error': 'Invalid file type. Only .mdb, .accdb, .sqlite, and .db files are allowed'}), 400
         
-        # Check file size before saving
-        file.seek(0, os.SEEK_END)
-        file_size = file.tell()
-        file.seek(0)
-        
-        if file_size > MAX_UPLOAD_SIZE:
-            log_security_event('file_too_large', {
-                'filename': file.filename,
-                'size': file_size
-            })
-            return jsonify({'error': f'File too large. Maximum size is {MAX_UPLOAD_SIZE // (1024*1024)}MB'}), 400
-        
+        upload = file.stream
+        file_size = upload.size
         if file_size == 0:
             return jsonify({'error': 'Empty file not allowed'}), 400
+        sha256 = upload.finish()
         
-        # Sanitize filename
-        original_filename = file.filename
-        filename = sanitize_filename(secure_filename(file.filename))
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{timestamp}_{filename}"
-        
-        # Ensure upload directory exists
-        upload_folder = app.config['UPLOAD_FOLDER']
-        os.makedirs(upload_folder, exist_ok=True)
-        
-        filepath = os.path.join(upload_folder, filename)
-        
-        # Save file with error handling
-        try:
-            file.save(filepath)
-            upload_logger.info(f"File saved: {filename} (original: {original_filename}, size: {file_size})")
-        except Exception as e:
-            upload_logger.error(f"Failed to save file {filename}: {e}")
-            return jsonify({'error': 'Failed to save uploaded file'}), 500
-        
-        # Validate file content
-        if not validate_file_content(filepath):
-            upload_logger.warning(f"File content validation failed: {filename}")
-            os.remove(filepath)
-            log_security_event('invalid_file_content', {
-                'filename': original_filename
-            })
-            return jsonify({'error': 'Invalid file format or corrupted file'}), 400
-        
-        # Get database info with error handling
-        try:
-            db_info = get_database_info(filepath)
-            if not db_info:
-                upload_logger.error(f"Failed to read database info: {filename}")
-                os.remove(filepath)
-                return jsonify({'error': 'Unable to read database file. File may be corrupted or password-protected'}), 500
-            
-            upload_logger.info(f"Database uploaded successfully: {filename}")
-            return jsonify({
-                'success': True,
-                'database': db_info
-            })
-            
-        except Exception as e:
-            upload_logger.error(f"Database processing error for {filename}: {e}")
-            if os.path.exists(filepath):
-                os.remove(filepath)
-            return jsonify({'error': f'Database processing failed: {str(e)}'}), 500
+        return register_upload(upload, sha256, file.filename, file_size)
     
+    except UploadRejected:
+        raise
     except Exception as e:
         upload_logger.error(f"Unexpected upload error: {e}")
         return jsonify({'error': 'Upload failed due to server error'}), 500
 
+@app.errorhandler(UploadRejected)
+def upload_rejected(e):
+    """An upload failed validation while streaming in; drop whatever was spooled"""
+    for upload in getattr(request, 'streaming_uploads', []):
+        upload.discard()
+    log_security_event(e.reason, {'action': 'upload', 'content_length': request.content_length})
+    upload_logger.warning(f"Upload rejected while streaming ({e.reason}): {e}")
+    return jsonify({'error': str(e), 'reason': e.reason}), 400
+
+@app.route('/uploads', methods=['POST'])
+@limiter.limit("10 per minute")
+def init_chunked_upload():
+    """Start a chunked upload; the client then PUTs each chunk and finalizes"""
+    try:
+        cleanup_stale_uploads()
+        data = request.get_json(silent=True) or {}
+        filename = str(data.get('filename', ''))
+        try:
+            size = int(data.get('size', 0))
+        except (ValueError, TypeError):
+            return jsonify({'error': 'Invalid file size'}), 400
+        if not filename or not allowed_file(filename):
+            log_security_event('invalid_file_type', {'filename': filename, 'action': 'chunked_upload'})
+            return jsonify({'error': 'Invalid file type. Only .mdb, .accdb, .sqlite, and .db files are allowed'}), 400
+        if size <= 0:
+            return jsonify({'error': 'Empty file not allowed'}), 400
+        if size > CHUNKED_UPLOAD_MAX_SIZE:
+            log_security_event('file_too_large', {'filename': filename, 'size': size})
+            return jsonify({'error': f'File too large. Maximum size is {CHUNKED_UPLOAD_MAX_SIZE // (1024*1024)}MB'}), 400
+        
+        upload = ChunkedUpload.create(filename, size, get_remote_address())
+        upload_logger.info(f"Chunked upload {upload.upload_id} started: {filename} ({size} bytes in {upload.session['chunk_count']} chunks)")
+        return jsonify({'success': True, 'upload': upload.status()}), 201
+    except UploadQuotaExceeded as e:
+        log_security_event('upload_quota_exceeded', {'filename': filename, 'size': size, 'reason': str(e)})
+        return jsonify({'error': str(e)}), e.status
+    except OSError as e:
+        upload_logger.error(f"Could not start chunked upload: {e}")
+        return jsonify({'error': 'Not enough space to receive this file'}), 507
+    except Exception as e:
+        upload_logger.error(f"Unexpected chunked upload error: {e}")
+        return jsonify({'error': 'Upload failed due to server error'}), 500
+
+def finalize_state_response(upload_id, state):
+    """Answer for an upload being finalized (202) or finalized (the stored upload response)"""
+    if state['state'] == 'finalizing':
+        return jsonify({'success': True, 'upload': {'id': upload_id, 'state': 'finalizing'}}), 202
+    body = dict(state['response'], upload={'id': upload_id, 'state': state['state']})
+    return jsonify(body), state['status']
+
+@app.route('/uploads/<upload_id>')
+@limiter.limit("120 per minute")
+def get_chunked_upload(upload_id):
+    """Received and missing chunks of an upload, so an interrupted client can resume; the result once finalized"""
+    if not re.fullmatch(r'[0-9a-f]{32}', upload_id or ''):
+        return jsonify({'error': 'Upload not found or expired'}), 404
+    state = ChunkedUpload.finalize_state(upload_id)
+    if state is not None:
+        return finalize_state_response(upload_id, state)
+    upload = ChunkedUpload.load(upload_id)
+    if upload is None:
+        return jsonify({'error': 'Upload not found or expired'}), 404
+    return jsonify({'success': True, 'upload': dict(upload.status(), state='receiving')})
+
+@app.route('/uploads/<upload_id>/chunks/<int:index>', methods=['PUT'])
+@limiter.limit("600 per minute")
+def put_upload_chunk(upload_id, index):
+    """Write one chunk (the raw request body) at its offset; X-Chunk-SHA256 is verified when sent"""
+    upload = ChunkedUpload.load(upload_id)
+    if upload is None:
+        return jsonify({'error': 'Upload not found or expired'}), 404
+    try:
+        digest = upload.write_chunk(index, request.stream, request.headers.get('X-Chunk-SHA256'))
+    except OSError as e:
+        upload_logger.error(f"Could not write chunk {index} of upload {upload_id}: {e}")
+        return jsonify({'error': 'Failed to save chunk'}), 500
+    return jsonify({'success': True, 'index': index, 'sha256': digest})
+
+@app.route('/uploads/<upload_id>/finalize', methods=['POST'])
+@limiter.limit("10 per minute")
+def finalize_chunked_upload(upload_id):
+    """Assemble a fully received upload and store it like a single-request upload.
+
+    Hashing and storing a file of up to CHUNKED_UPLOAD_MAX_SIZE runs in the
+    background; the client polls GET /uploads/<id> until it has the result.
+    """
+    if not re.fullmatch(r'[0-9a-f]{32}', upload_id or ''):
+        return jsonify({'error': 'Upload not found or expired'}), 404
+    state = ChunkedUpload.finalize_state(upload_id)
+    if state is not None:
+        return finalize_state_response(upload_id, state)
+    upload = ChunkedUpload.load(upload_id)
+    if upload is None:
+        return jsonify({'error': 'Upload not found or expired'}), 404
+    status = upload.status()
+    if status['missing']:
+        missing = sorted(set(range(status['chunk_count'])) - set(status['received']))
+        return jsonify({'error': f"{len(missing)} chunks missing", 'missing': missing[:1000]}), 409
+    if not upload.claim_finalize():
+        return finalize_state_response(upload_id, {'state': 'finalizing'})
+    submit_background_task(('finalize', upload_id), upload.finalize)
+    return finalize_state_response(upload_id, {'state': 'finalizing'})
+
+@app.route('/uploads/<upload_id>', methods=['DELETE'])
+def abort_chunked_upload(upload_id):
+    """Abandon an upload and free its space"""
+    upload = ChunkedUpload.load(upload_id)
+    if upload is None:
+        return jsonify({'error': 'Upload not found or expired'}), 404
+    if ChunkedUpload.finalize_state(upload_id) is not None:
+        return jsonify({'error': 'Upload is being finalized'}), 409
+    upload.discard()
+    return jsonify({'success': True})
+
 # Decorator for admin token authentication
 from functools import wraps
 
@@ -759,6 +4297,115 @@ def admin_token_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def get_profiles_folder():
+    """Folder holding saved request profiles and their descriptions"""
+    return os.path.join(get_sidecar_folder(), 'profiles')
+
+def list_saved_profiles():
+    """Descriptions of the saved profiles, newest first"""
+    profiles_folder = get_profiles_folder()
+    if not os.path.isdir(profiles_folder):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(profiles_folder), reverse=True):
+        if name.endswith('.json'):
+            try:
+                with open(os.path.join(profiles_folder, name), encoding='utf-8') as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+    return profiles
+
+def save_profile(profile):
+    """Write a finished profile into the ring and drop the oldest ones beyond PROFILE_RING_SIZE"""
+    profiles_folder = get_profiles_folder()
+    os.makedirs(profiles_folder, exist_ok=True)
+    profile_id = profile['id']
+    profile['profiler'].dump_stats(os.path.join(profiles_folder, f"{profile_id}.prof"))
+    info = {key: profile[key] for key in ('id', 'endpoint', 'method', 'path', 'created')}
+    info['duration'] = round(time.perf_counter() - profile['started'], 6)
+    info['size'] = os.path.getsize(os.path.join(profiles_folder, f"{profile_id}.prof"))
+    # The description is written last, so a profile is only listed once it is complete
+    tmp_path = os.path.join(profiles_folder, f"{profile_id}.json.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(info, f)
+    os.replace(tmp_path, os.path.join(profiles_folder, f"{profile_id}.json"))
+
+    for old in list_saved_profiles()[PROFILE_RING_SIZE:]:
+        for extension in ('json', 'prof'):
+            try:
+                os.remove(os.path.join(profiles_folder, f"{old['id']}.{extension}"))
+            except OSError:
+                pass
+    logger.info(f"Saved profile {profile_id} of {info['method']} {info['path']} ({info['duration']:.3f}s)")
+
+def _profile_stream(body, profile):
+    """Keep profiling a streamed body chunk by chunk, then save the profile"""
+    iterator = iter(body)
+    try:
+        while True:
+            profile['profiler'].enable()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                profile['profiler'].disable()
+            yield chunk
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+        try:
+            save_profile(profile)
+        except OSError as e:
+            logger.warning(f"Could not save profile {profile['id']}: {e}")
+        finally:
+            profile_lock.release()
+
+def _run_profiled(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not profile_lock.acquire(blocking=False):
+            return jsonify({'error': 'Another request is being profiled, try again shortly'}), 409
+        g.profiling = True
+        profile = {
+            'id': f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}",
+            'endpoint': request.endpoint, 'method': request.method, 'path': request.full_path,
+            'created': datetime.now().isoformat(), 'started': time.perf_counter(),
+            'profiler': cProfile.Profile()
+        }
+        try:
+            profile['profiler'].enable()
+            try:
+                response = app.make_response(f(*args, **kwargs))
+            finally:
+                profile['profiler'].disable()
+            response.headers['X-Profile-Id'] = profile['id']
+            if response.is_streamed:
+                # Exports do their work while the body streams, so the profile is saved when it ends
+                response.response = _profile_stream(response.response, profile)
+                return response
+            save_profile(profile)
+        except Exception:
+            profile_lock.release()
+            raise
+        profile_lock.release()
+        return response
+    return decorated_function
+
+def profile_on_request(f):
+    """Run a view under cProfile when an admin asks for it with the X-Profile header or ?profile=1.
+
+    Requests without the flag call the view directly; with it, the admin
+    token is checked by admin_token_required before anything is profiled.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if request.headers.get(PROFILE_HEADER, '0') == '0' and request.args.get('profile', '0') == '0':
+            return f(*args, **kwargs)
+        return admin_token_required(_run_profiled(f))(*args, **kwargs)
+    return decorated_function
+
 @app.route('/database/<database_id>/tables')
 @limiter.limit("30 per minute")
 def get_tables_list(database_id):
@@ -774,16 +4421,24 @@ def get_tables_list(database_id):
         if not os.path.exists(filepath) or not allowed_file(database_id):
             db_logger.warning(f"Database not found or invalid: {database_id}")
             return jsonify({'error': 'Database not found'}), 404
+        filepath = resolve_upload_path(filepath)
         
-        conn = get_db_connection(filepath)
-        tables = get_tables(conn)
+        read_path = resolve_read_path(filepath)
+        etag = data_version_digest(filepath, read_path, 'tables')
+        last_modified = datetime.fromtimestamp(os.path.getmtime(filepath), timezone.utc)
+        not_modified = not_modified_response(etag)
+        if not_modified is not None:
+            return not_modified
+        
+        conn = get_db_connection(read_path)
+        tables = get_cached_tables(conn, read_path)
         db_logger.info(f"Retrieved {len(tables)} tables for database: {database_id}")
         
-        return jsonify({
+        return set_http_cache_headers(jsonify({
             'success': True,
             'tables': tables,
             'database_id': database_id
-        })
+        }), etag, last_modified)
     except FileNotFoundError:
         return jsonify({'error': 'Database file not found'}), 404
     except ConnectionError as e:
@@ -794,6 +4449,7 @@ def get_tables_list(database_id):
 
 @app.route('/database/<database_id>/table/<table_name>')
 @limiter.limit("50 per minute")
+@profile_on_request
 def view_table(database_id, table_name):
     """View table data with pagination and search - optimized for performance"""
     logger.info(f"VIEW_TABLE: Entered for db='{database_id}', table='{table_name}'")
@@ -811,6 +4467,7 @@ def view_table(database_id, table_name):
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], database_id)
         if not os.path.exists(filepath) or not allowed_file(database_id):
             return jsonify({'error': 'Database not found'}), 404
+        filepath = resolve_upload_path(filepath)
         
         # Get and validate parameters
         try:
@@ -820,9 +4477,16 @@ def view_table(database_id, table_name):
             sort_order = request.args.get('sort_order', 'ASC').upper()
             search_term = request.args.get('search', '').strip()
             search_columns = request.args.getlist('search_columns')
+            cursor_token = request.args.get('cursor', '').strip()
+            pagination_mode = 'keyset' if cursor_token or request.args.get('pagination') == 'keyset' else 'offset'
+            count_mode = request.args.get('count_mode', 'exact')
+            response_format = request.args.get('format', 'rows').lower()
         except (ValueError, TypeError) as e:
             return jsonify({'error': 'Invalid pagination parameters'}), 400
         
+        if response_format not in TABLE_RESPONSE_FORMATS:
+            return jsonify({'error': f"Unsupported format. Use one of: {', '.join(TABLE_RESPONSE_FORMATS)}"}), 400
+        
         # Validate sort order
         if sort_order not in ['ASC', 'DESC']:
             sort_order = 'ASC'
@@ -831,14 +4495,44 @@ def view_table(database_id, table_name):
         if len(search_term) > 100:
             search_term = search_term[:100]
         
+        # Serve Access reads from the SQLite mirror once it is ready
+        mirror_status = get_mirror_status(filepath)
+        if mirror_status == 'pending':
+            schedule_access_mirror(filepath)
+            mirror_status = get_mirror_status(filepath)
+        read_path = resolve_read_path(filepath)
+        
+        # Pages are cached (by clients via ETag, and across workers) while the files they are read from are unchanged
+        etag = cache_key = None
+        last_modified = datetime.fromtimestamp(os.path.getmtime(filepath), timezone.utc)
+        # A profiled request always does the real work, so it skips both caches
+        if mirror_status not in ('pending', 'building') and not g.get('profiling'):
+            etag = data_version_digest(
+                filepath, read_path, 'page', table_name,
+                page if pagination_mode == 'offset' else None, cursor_token, per_page,
+                sort_column, sort_order, search_term, sorted(search_columns),
+                pagination_mode, count_mode, response_format
+            )
+            not_modified = not_modified_response(etag)
+            if not_modified is not None:
+                return not_modified
+            cache_key = page_cache_key(database_id, etag)
+            with timed_stage('cache'):
+                cached_body = page_cache_get(cache_key)
+            if cached_body is not None:
+                logger.info("VIEW_TABLE: Serving page from cache.")
+                return set_http_cache_headers(Response(cached_body, mimetype='application/json'), etag, last_modified)
+        
         try:
-            conn = get_db_connection(filepath)
+            with timed_stage('connect'):
+                conn = get_db_connection(read_path)
         except TypeError as te:
             logger.error(f"VIEW_TABLE: TypeError during get_db_connection: {te}", exc_info=True)
             raise
 
         try:
-            all_tables = get_tables(conn)
+            with timed_stage('tables'):
+                all_tables = get_cached_tables(conn, read_path)
             if table_name not in all_tables:
                 logger.warning(f"Attempt to access non-existent or unauthorized table '{table_name}' in database '{database_id}'.")
                 return jsonify({'error': f"Table '{table_name}' not found or access denied."}), 404
@@ -847,7 +4541,8 @@ def view_table(database_id, table_name):
             raise
 
         try:
-            columns = get_table_info(conn, table_name)
+            with timed_stage('columns'):
+                columns = get_cached_table_info(conn, read_path, table_name)
             if not columns:
                 logger.error(f"Could not get column info for validated table '{table_name}' in database '{database_id}'.")
                 return jsonify({'error': f"Could not retrieve column information for table '{table_name}'."}), 500
@@ -857,130 +4552,464 @@ def view_table(database_id, table_name):
         
         offset = (page - 1) * per_page
         
+        # Columns sorted or field-searched often enough get an index built in the background
         try:
-            query, params = build_search_query(
-                table_name, columns, search_term, search_columns,
-                sort_column, sort_order, per_page, offset
-            )
-        except TypeError as te:
-            logger.error(f"VIEW_TABLE: TypeError during build_search_query: {te}", exc_info=True)
-            raise
+            column_names = {c['name'] for c in columns}
+            if sort_column in column_names:
+                note_column_usage(conn, filepath, read_path, table_name, sort_column, 'sort')
+            field = parse_field_search(columns, search_term)
+            if field:
+                note_column_usage(conn, filepath, read_path, table_name, field[0]['name'], 'search')
+        except Exception as e:
+            logger.warning(f"VIEW_TABLE: Could not record column usage for '{table_name}': {e}")
+        
+        # Use the table's full-text index for the search when one is ready
+        fts = get_fts_search_index(conn, filepath, read_path, table_name, search_term) if search_term else None
+        
+        # Keyset (seek) pagination: constant cost per page regardless of depth
+        key_expr = None
+        if pagination_mode == 'keyset':
+            key_expr = get_cached_keyset_tiebreaker(conn, read_path, table_name, columns)
+            if key_expr is None:
+                logger.info(f"VIEW_TABLE: No usable key for keyset pagination on '{table_name}', falling back to offset.")
+                pagination_mode = 'offset'
+        
+        # Queries past the time budget are interrupted; whatever was read is returned, flagged as truncated
+        deadline = QueryDeadline(QUERY_BUDGETS['table'])
+        next_cursor = prev_cursor = None
+        if pagination_mode == 'keyset':
+            metrics_count_query(database_id, 'page')
+            try:
+                with enforce_deadline(conn, deadline), timed_stage('query'):
+                    rows, description, next_cursor, prev_cursor = execute_keyset_query(
+                        conn, table_name, columns, search_term, search_columns,
+                        sort_column, sort_order, per_page, cursor_token, key_expr, fts
+                    )
+            except InvalidCursorError as e:
+                return jsonify({'error': f'Invalid cursor: {e}'}), 400
+            except Exception as e:
+                if not deadline.is_timeout(e):
+                    raise
+                rows, description, deadline.truncated = [], None, True
+        else:
+            try:
+                query, params = build_search_query(
+                    table_name, columns, search_term, search_columns,
+                    sort_column, sort_order, per_page, offset, fts
+                )
+            except TypeError as te:
+                logger.error(f"VIEW_TABLE: TypeError during build_search_query: {te}", exc_info=True)
+                raise
+            
+            # Sorted Access pages are looked up by key in a cached sort order instead of skipping `offset` rows
+            access_key = None
+            if (isinstance(conn, pyodbc.Connection) and ACCESS_ORDER_CACHE_ENTRIES > 0
+                    and sort_column in {c['name'] for c in columns}):
+                access_key = get_cached_keyset_tiebreaker(conn, read_path, table_name, columns)
+            
+            metrics_count_query(database_id, 'page')
+            try:
+                with enforce_deadline(conn, deadline), timed_stage('query'):
+                    if access_key:
+                        rows, description = execute_access_ordered_query(
+                            conn, read_path, table_name, columns, search_term, search_columns,
+                            sort_column, sort_order, per_page, offset, access_key, deadline
+                        )
+                    else:
+                        rows, description = execute_paginated_query(conn, query, params, per_page, offset, deadline=deadline)
+            except TypeError as te:
+                logger.error(f"VIEW_TABLE: TypeError during execute_paginated_query: {te}", exc_info=True)
+                raise
+            except Exception as e:
+                if not deadline.is_timeout(e):
+                    raise
+                rows, description, deadline.truncated = [], None, True
+        if description is None:
+            # The query was interrupted before it produced a result set
+            description = [(col['name'], None, None, None, None, None, None) for col in columns]
         
         try:
-            rows, description = execute_paginated_query(conn, query, params, per_page, offset)
+            counts = None
+            if not deadline.expired:
+                try:
+                    with enforce_deadline(conn, deadline):
+                        counts = get_row_counts(
+                            conn, read_path, table_name, columns, search_term, search_columns,
+                            estimate=(count_mode == 'estimate'), fts=fts
+                        )
+                except Exception as e:
+                    if not deadline.is_timeout(e):
+                        raise
+            if counts is None:
+                rows_seen = (offset if pagination_mode == 'offset' else 0) + len(rows) + (1 if len(rows) == per_page else 0)
+                counts = get_partial_row_counts(conn, read_path, table_name, search_term, search_columns, rows_seen)
+            total_count = counts['total']
+            filtered_count = counts['filtered']
         except TypeError as te:
-            logger.error(f"VIEW_TABLE: TypeError during execute_paginated_query: {te}", exc_info=True)
+            logger.error(f"VIEW_TABLE: TypeError during get_row_counts: {te}", exc_info=True)
             raise
+        if deadline.timed_out:
+            logger.warning(f"VIEW_TABLE: Time budget of {QUERY_BUDGETS['table']:g}s exhausted for '{table_name}' in '{database_id}' (rows truncated: {deadline.truncated}).")
         
+        # Converters are resolved once per column, then applied to the whole page
         try:
-            # Ensure total_count is an integer
-            total_count_val = get_total_count(conn, table_name, columns, search_term, search_columns)
-            total_count = int(total_count_val) if total_count_val is not None else 0
-
-            if search_term:
-                count_query, count_params = build_search_query(
-                    table_name, columns, search_term, search_columns, '', '', 0, 0
-                )
-                count_query = count_query.replace("SELECT *", "SELECT COUNT(*)")
-                if "ORDER BY" in count_query.upper():
-                    order_index = count_query.upper().find("ORDER BY")
-                    count_query = count_query[:order_index].strip()
-                count_cursor = conn.cursor()
-                count_cursor.execute(count_query, count_params)
-                # Ensure filtered_count is an integer
-                filtered_count_val = count_cursor.fetchone()[0]
-                filtered_count = int(filtered_count_val) if filtered_count_val is not None else 0
-            else:
-                filtered_count = total_count
+            with timed_stage('format'):
+                results = build_row_formatter(description, columns, search_term, columnar=(response_format == 'columnar'))(rows)
         except TypeError as te:
-            logger.error(f"VIEW_TABLE: TypeError during get_total_count/filtered_count: {te}", exc_info=True)
+            logger.error(f"VIEW_TABLE: TypeError during results formatting: {te}", exc_info=True)
             raise
         
-        results = []
-        # Initialize diagnostic variables for the formatting loop's error handler
-        row_idx_diag, i_diag, col_name_diag = -1, -1, ""
-        try:
-            for row_idx, row in enumerate(rows):
-                row_idx_diag = row_idx # Update diagnostic variable
-                row_dict = {}
-                for i, col in enumerate(description):
-                    i_diag = i # Update diagnostic variable
-                    col_name_diag = col[0] # Update diagnostic variable
-                    
-                    value = None
-                    try:
-                        value = row[i]
-                    except TypeError:
-                        logger.warning(f"VIEW_TABLE: TypeError accessing row[{i_diag}] (col='{col_name_diag}') for db='{database_id}', table='{table_name}'. Assigning <Access Error>.", exc_info=True)
-                        value = "<Access Error>" # Placeholder for value that caused TypeError on access
-                    
-                    if value is None: display_value = 'NULL'
-                    elif value == "<Access Error>": display_value = value
-                    elif isinstance(value, bytes):
-                        try: display_value = value.decode('utf-8')
-                        except UnicodeDecodeError:
-                            try: display_value = value.decode('latin-1')
-                            except UnicodeDecodeError: display_value = f'<Binary {len(value)} bytes>'
-                    elif isinstance(value, datetime):
-                        display_value = value.strftime('%Y-%m-%d %H:%M:%S')
-                    else:
-                        try: display_value = str(value)
-                        except (UnicodeDecodeError, UnicodeEncodeError):
-                            try: display_value = repr(value)
-                            except Exception: display_value = '<Unable to display>'
-                        except Exception: display_value = '<Unable to display>'
-                    
-                    if search_term:
-                        display_value = highlight_search_term(display_value, search_term)
-                    
-                    row_dict[col[0]] = display_value
-                results.append(row_dict)
-        except TypeError as te: # This specific trap for the whole loop might be redundant if individual accesses are safe
-            logger.error(f"VIEW_TABLE: TypeError during results formatting loop (outer) (last row_idx {row_idx_diag}): {te}", exc_info=True)
-            raise
+        total_pages = (filtered_count + per_page - 1) // per_page
         
-        total_pages = (total_count + per_page - 1) // per_page
+        if pagination_mode == 'keyset':
+            pagination = {
+                'mode': 'keyset', 'per_page': per_page, 'total': total_count,
+                'filtered': filtered_count, 'total_pages': total_pages,
+                'count_exact': counts['exact'],
+                'next_cursor': next_cursor, 'prev_cursor': prev_cursor
+            }
+        else:
+            pagination = {
+                'mode': 'offset', 'page': page, 'per_page': per_page, 'total': total_count,
+                'filtered': filtered_count, 'total_pages': total_pages,
+                'count_exact': counts['exact']
+            }
         
-        logger.info("VIEW_TABLE: Successfully processed request. Returning JSON.")
-        return jsonify({
+        payload = {
             'success': True, 'data': results, 'columns': columns,
-            'pagination': {
-                'page': page, 'per_page': per_page, 'total': total_count,
-                'filtered': filtered_count, 'total_pages': total_pages
-            },
+            'format': response_format,
+            'pagination': pagination,
             'sort': {'column': sort_column, 'order': sort_order},
-            'search': {'term': search_term, 'columns': search_columns},
+            'search': {'term': search_term, 'columns': search_columns, 'index': describe_search_plan(columns, search_term, fts)},
+            'mirror': {'status': mirror_status, 'serving': read_path != filepath},
+            'timed_out': deadline.timed_out,
+            'truncated': deadline.truncated,
             'database_id': database_id
-        })
+        }
+        logger.info("VIEW_TABLE: Successfully processed request. Returning JSON.")
+        with timed_stage('serialize'):
+            if response_format == 'columnar':
+                # Column names are sent once; each row is a positional list in this order
+                payload['row_columns'] = [col[0] for col in description]
+                response = fast_json_response(payload)
+            else:
+                response = jsonify(payload)
+        # Estimated counts are refined later, so only pages with exact counts are cached
+        if cache_key and counts['exact'] and not deadline.timed_out:
+            page_cache_put(database_id, cache_key, response.get_data())
+            return set_http_cache_headers(response, etag, last_modified)
+        return set_http_cache_headers(response)
         
     except Exception as e:
         logger.error(f"Error viewing table: {e}", exc_info=True) # Added exc_info for general errors too
         return jsonify({'error': str(e)}), 500
 
+def resolve_database_request(database_id, table_name=None):
+    """Validate route parameters; returns (filepath of the upload's bytes, None) or (None, error_response)"""
+    if not database_id or '..' in database_id or '/' in database_id:
+        log_security_event('invalid_database_id', {'database_id': database_id})
+        return None, (jsonify({'error': 'Invalid database identifier'}), 400)
+    if table_name is not None and (not table_name or len(table_name) > 128):
+        log_security_event('invalid_table_name', {'table_name': table_name})
+        return None, (jsonify({'error': 'Invalid table name'}), 400)
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], database_id)
+    if not os.path.exists(filepath) or not allowed_file(database_id):
+        return None, (jsonify({'error': 'Database not found'}), 404)
+    return resolve_upload_path(filepath), None
+
+@app.route('/database/<database_id>/table/<table_name>/count')
+@limiter.limit("120 per minute")
+def table_count(database_id, table_name):
+    """Exact row counts for a table/search, if already known; never blocks on a scan"""
+    try:
+        filepath, error = resolve_database_request(database_id, table_name)
+        if error:
+            return error
+        search_term = request.args.get('search', '').strip()[:100]
+        search_columns = request.args.getlist('search_columns')
+        read_path = resolve_read_path(filepath)
+        
+        cached = get_cached_counts(read_path, table_name, search_term, search_columns)
+        if cached is None:
+            conn = get_db_connection(read_path)
+            if table_name not in get_cached_tables(conn, read_path):
+                return jsonify({'error': f"Table '{table_name}' not found or access denied."}), 404
+            columns = get_cached_table_info(conn, read_path, table_name)
+            metrics_count_query(database_id, 'count')
+            submit_background_task(
+                ('count',) + _count_cache_key(read_path, table_name, search_term, search_columns),
+                _compute_counts_in_background, read_path, table_name, columns, search_term, search_columns
+            )
+            return jsonify({'success': True, 'ready': False})
+        
+        return jsonify({'success': True, 'ready': True, 'total': cached[0], 'filtered': cached[1]})
+    except Exception as e:
+        logger.error(f"Error counting table rows: {e}")
+        return jsonify({'error': str(e)}), 500
+
+def search_index_response(filepath, table_name):
+    """JSON status of a table's full-text search index, counting a build queued in this worker"""
+    status = get_fts_status(filepath, table_name)
+    with background_lock:
+        if ('fts', filepath, table_name) in background_tasks and status['status'] != 'building':
+            status = {'status': 'building'}
+    return jsonify({
+        'success': True,
+        'table': table_name,
+        'status': status['status'],
+        'rows': status.get('rows', 0),
+        'error': status.get('error')
+    })
+
+@app.route('/database/<database_id>/table/<table_name>/search-index', methods=['GET'])
+@limiter.limit("30 per minute")
+def table_search_index(database_id, table_name):
+    """Get the status of a table's full-text search index"""
+    try:
+        filepath, error = resolve_database_request(database_id, table_name)
+        if error:
+            return error
+        read_path = resolve_read_path(filepath)
+        conn = get_db_connection(read_path)
+        if table_name not in get_cached_tables(conn, read_path):
+            return jsonify({'error': f"Table '{table_name}' not found or access denied."}), 404
+        return search_index_response(filepath, table_name)
+    except Exception as e:
+        logger.error(f"Search index error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/database/<database_id>/table/<table_name>/search-index', methods=['POST'])
+@admin_token_required
+@limiter.limit("30 per minute")
+def build_table_search_index(database_id, table_name):
+    """Start building (or, with ?rebuild=1, rebuilding) a table's full-text search index"""
+    try:
+        filepath, error = resolve_database_request(database_id, table_name)
+        if error:
+            return error
+        read_path = resolve_read_path(filepath)
+        conn = get_db_connection(read_path)
+        if table_name not in get_cached_tables(conn, read_path):
+            return jsonify({'error': f"Table '{table_name}' not found or access denied."}), 404
+        if is_access_file(read_path):
+            return jsonify({'error': 'Search indexes for Access tables become available once the database has been converted (mirror_status: ready).'}), 409
+
+        # A build running here or in another worker is never restarted, even on rebuild
+        status = get_fts_status(filepath, table_name)['status']
+        if status != 'building' and (status != 'ready' or request.args.get('rebuild') == '1'):
+            schedule_fts_index(filepath, table_name)
+        return search_index_response(filepath, table_name)
+    except Exception as e:
+        logger.error(f"Search index error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/database/<database_id>/table/<table_name>/search-index', methods=['DELETE'])
+@admin_token_required
+def drop_table_search_index(database_id, table_name):
+    """Drop a table's full-text search index"""
+    try:
+        filepath, error = resolve_database_request(database_id, table_name)
+        if error:
+            return error
+        if not drop_fts_index(filepath, table_name):
+            return jsonify({'error': 'No search index for this table'}), 404
+        return jsonify({'success': True, 'message': f'Search index for {table_name} dropped'})
+    except Exception as e:
+        logger.error(f"Search index drop error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/database/<database_id>/indexes')
+@admin_token_required
+def list_database_indexes(database_id):
+    """List the indexes built automatically for frequently sorted/searched columns"""
+    try:
+        filepath, error = resolve_database_request(database_id)
+        if error:
+            return error
+        return jsonify({'success': True, 'threshold': AUTO_INDEX_THRESHOLD, 'indexes': list_auto_indexes(filepath)})
+    except Exception as e:
+        logger.error(f"Auto index list error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/database/<database_id>/indexes/<index_name>', methods=['DELETE'])
+@admin_token_required
+def drop_database_index(database_id, index_name):
+    """Drop an automatic index; the column is not indexed again"""
+    try:
+        filepath, error = resolve_database_request(database_id)
+        if error:
+            return error
+        if not index_name.startswith(AUTO_INDEX_PREFIX) or not drop_auto_index(filepath, index_name):
+            return jsonify({'error': 'No such automatic index'}), 404
+        return jsonify({'success': True, 'message': f'Index {index_name} dropped'})
+    except IndexRewriteBusy as e:
+        return jsonify({'error': f'{e}; try again shortly'}), 409
+    except Exception as e:
+        logger.error(f"Auto index drop error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/database/<database_id>/table/<table_name>/export')
+@limiter.limit("10 per minute")
+@profile_on_request
+def export_table(database_id, table_name):
+    """Stream a whole table (respecting sort and search) as CSV or NDJSON"""
+    try:
+        filepath, error = resolve_database_request(database_id, table_name)
+        if error:
+            return error
+        
+        export_format = request.args.get('format', 'csv').lower()
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'error': f"Unsupported export format. Use one of: {', '.join(EXPORT_FORMATS)}"}), 400
+        sort_column = request.args.get('sort_column', '').strip()
+        sort_order = request.args.get('sort_order', 'ASC').upper()
+        if sort_order not in ['ASC', 'DESC']:
+            sort_order = 'ASC'
+        search_term = request.args.get('search', '').strip()[:100]
+        search_columns = request.args.getlist('search_columns')
+        # Compress on the fly unless the client cannot accept it or opts out
+        compress = request.args.get('gzip', '1') != '0' and 'gzip' in request.accept_encodings
+        
+        read_path = resolve_read_path(filepath)
+        conn = get_db_connection(read_path)
+        if table_name not in get_cached_tables(conn, read_path):
+            return jsonify({'error': f"Table '{table_name}' not found or access denied."}), 404
+        columns = get_cached_table_info(conn, read_path, table_name)
+        
+        metrics_count_query(database_id, 'export')
+        mimetype, extension = EXPORT_FORMATS[export_format]
+        download_name = f"{sanitize_filename(table_name)}_export_{datetime.now().strftime('%Y-%m-%d')}.{extension}"
+        response = Response(
+            stream_with_context(generate_export(
+                read_path, filepath, table_name, columns, search_term, search_columns,
+                sort_column, sort_order, export_format, compress
+            )),
+            mimetype=mimetype
+        )
+        response.headers['Content-Disposition'] = f'attachment; filename="{download_name}"'
+        response.headers['X-Accel-Buffering'] = 'no'  # Let nginx pass batches through as they are produced
+        response.headers['Vary'] = 'Accept-Encoding'
+        if compress:
+            response.headers['Content-Encoding'] = 'gzip'
+        return response
+    except Exception as e:
+        logger.error(f"Export error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/database/<database_id>/table/<table_name>/jobs', methods=['POST'])
+@limiter.limit("30 per minute")
+def submit_table_job(database_id, table_name):
+    """Start a page or count query in the background and return its job id"""
+    try:
+        filepath, error = resolve_database_request(database_id, table_name)
+        if error:
+            return error
+        
+        data = request.get_json(silent=True) or {}
+        def param(name, default=None):
+            return data.get(name, request.args.get(name, default))
+        try:
+            kind = param('kind', 'page')
+            search_columns = data.get('search_columns', request.args.getlist('search_columns'))
+            sort_order = str(param('sort_order', 'ASC')).upper()
+            params = {
+                'page': max(int(param('page', 1)), 1),
+                'per_page': min(max(int(param('per_page', 50)), 1), 1000),
+                'sort_column': str(param('sort_column', '')).strip(),
+                'sort_order': sort_order if sort_order in ('ASC', 'DESC') else 'ASC',
+                'search': str(param('search', '')).strip()[:100],
+                'search_columns': [str(col) for col in search_columns] if isinstance(search_columns, list) else []
+            }
+        except (ValueError, TypeError):
+            return jsonify({'error': 'Invalid job parameters'}), 400
+        if kind not in JOB_KINDS:
+            return jsonify({'error': f"Unsupported job kind. Use one of: {', '.join(JOB_KINDS)}"}), 400
+        
+        read_path = resolve_read_path(filepath)
+        conn = get_db_connection(read_path)
+        if table_name not in get_cached_tables(conn, read_path):
+            return jsonify({'error': f"Table '{table_name}' not found or access denied."}), 404
+        
+        job = submit_query_job(database_id, filepath, table_name, kind, params)
+        if job is None:
+            return jsonify({'error': 'Too many queued jobs, try again shortly'}), 503
+        metrics_count_query(database_id, f'job_{kind}')
+        return jsonify({'success': True, 'job': job}), 202
+    except Exception as e:
+        logger.error(f"Job submission error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+def resolve_job_request(job_id):
+    """Validate a job id; returns (status, None) or (None, error_response)"""
+    if not re.fullmatch(r'[0-9a-f]{32}', job_id or ''):
+        return None, (jsonify({'error': 'Invalid job identifier'}), 400)
+    status = read_job_status(job_id)
+    if status is None:
+        return None, (jsonify({'error': 'Job not found'}), 404)
+    return status, None
+
+@app.route('/jobs/<job_id>')
+@limiter.limit("240 per minute")
+def get_job(job_id):
+    """Poll a job's state and progress"""
+    status, error = resolve_job_request(job_id)
+    if error:
+        return error
+    return jsonify({'success': True, 'job': status})
+
+@app.route('/jobs/<job_id>/result')
+@limiter.limit("60 per minute")
+def get_job_result(job_id):
+    """Stream a finished job's spooled result as NDJSON"""
+    status, error = resolve_job_request(job_id)
+    if error:
+        return error
+    if status['state'] != 'done':
+        return jsonify({'error': 'Job has not finished', 'job': status}), 409
+    spool_path = _job_path(job_id, 'result.ndjson')
+    if not os.path.exists(spool_path):
+        return jsonify({'error': 'Job result is no longer available'}), 410
+
+    def generate():
+        with open(spool_path, 'rb') as f:
+            while True:
+                chunk = f.read(64 * 1024)
+                if not chunk:
+                    break
+                yield chunk
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+@limiter.limit("60 per minute")
+def cancel_job(job_id):
+    """Cancel a queued or running job"""
+    status, error = resolve_job_request(job_id)
+    if error:
+        return error
+    if status['state'] in ('queued', 'running') and not cancel_query_job(job_id):
+        return jsonify({'error': 'Job is no longer available'}), 410
+    status = read_job_status(job_id)
+    if status is None:
+        return jsonify({'error': 'Job is no longer available'}), 410
+    return jsonify({'success': True, 'job': status})
+
 @app.route('/database/<database_id>/delete', methods=['DELETE'])
 @admin_token_required
 def delete_database(database_id):
     """Delete a specific database"""
     try:
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], database_id)
-        if not os.path.exists(filepath) or not allowed_file(database_id):
+        if not os.path.lexists(filepath) or not allowed_file(database_id):
             return jsonify({'error': 'Database not found'}), 404
         
-        # Close connection if cached
-        with cache_lock:
-            if filepath in connection_cache:
-                conn = connection_cache.pop(filepath)
-                try:
-                    conn.close()
-                except:
-                    pass
-        
-        # Remove file
-        os.remove(filepath)
+        # Remove the alias; the bytes and anything derived from them go with the last one
+        content_removed = remove_upload(filepath)
         
         return jsonify({
             'success': True, 
-            'message': f'Database {database_id} deleted successfully'
+            'message': f'Database {database_id} deleted successfully',
+            'content_removed': content_removed
         })
     except Exception as e:
         logger.error(f"Delete error: {e}")
@@ -998,18 +5027,26 @@ def cleanup_all():
             for filename in os.listdir(upload_folder):
                 if allowed_file(filename):
                     filepath = os.path.join(upload_folder, filename)
-                    if os.path.isfile(filepath):
-                        # Close connection if cached
-                        with cache_lock:
-                            if filepath in connection_cache:
-                                conn = connection_cache.pop(filepath)
-                                try:
-                                    conn.close()
-                                except:
-                                    pass
-                        
-                        os.remove(filepath)
+                    if os.path.islink(filepath) or os.path.isfile(filepath):
+                        remove_upload(filepath)
                         deleted_count += 1
+            
+            # Content no alias points at any more (e.g. left by an interrupted delete)
+            content_folder = get_content_folder()
+            if os.path.isdir(content_folder):
+                for name in os.listdir(content_folder):
+                    content_path = os.path.join(content_folder, name)
+                    if not allowed_file(name):
+                        continue
+                    with content_lock(content_path):
+                        if count_upload_aliases(content_path) > 0:
+                            continue
+                        close_connection_pool(content_path)
+                        os.remove(content_path)
+                        invalidate_metadata(content_path)
+                        invalidate_counts(content_path)
+                        remove_sidecars(content_path)
+                        catalog_remove(name)
         
         return jsonify({
             'success': True, 
@@ -1019,6 +5056,47 @@ def cleanup_all():
         logger.error(f"Cleanup error: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/profiles')
+@admin_token_required
+def list_profiles():
+    """Saved request profiles, newest first"""
+    try:
+        return jsonify({'success': True, 'profiles': list_saved_profiles()})
+    except Exception as e:
+        logger.error(f"Error listing profiles: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/profiles/<profile_id>')
+@admin_token_required
+def download_profile(profile_id):
+    """Download a saved profile (pstats file), or read its top functions with format=text"""
+    try:
+        if not re.fullmatch(r'[0-9]{8}_[0-9]{6}_[0-9a-f]{8}', profile_id):
+            return jsonify({'error': 'Invalid profile id'}), 400
+        profile_path = os.path.join(get_profiles_folder(), f"{profile_id}.prof")
+        if not os.path.exists(profile_path):
+            return jsonify({'error': 'Profile not found'}), 404
+        if request.args.get('format') == 'text':
+            sort = request.args.get('sort', 'cumulative')
+            if sort not in ('cumulative', 'tottime', 'calls'):
+                sort = 'cumulative'
+            output = io.StringIO()
+            pstats.Stats(profile_path, stream=output).sort_stats(sort).print_stats(PROFILE_TEXT_LINES)
+            return Response(output.getvalue(), mimetype='text/plain')
+        return send_file(profile_path, mimetype='application/octet-stream', as_attachment=True, download_name=f"{profile_id}.prof")
+    except Exception as e:
+        logger.error(f"Error reading profile {profile_id}: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/metrics')
+@limiter.exempt
+def metrics():
+    """Prometheus metrics of every worker"""
+    if not METRICS_ENABLED:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    flush_metrics(force=True)
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
 @app.errorhandler(413)
 def too_large(e):
     return jsonify({'error': 'File too large. Maximum size is 100MB.'}), 413
@@ -15,6 +15,10 @@ class DatabaseViewer {
         this.lastPaginationInfo = null;
         this.adminEnabled = false;
         this.adminToken = null;
+        this.chunkedUploadThreshold = 16 * 1024 * 1024; // Larger files go up in resumable chunks
+        this.uploadParallelism = 4;
+        this.chunkRetries = 3;
+        this.finalizePollInterval = 1000; // ms between polls while a chunked upload is stored
         
         this.initializeEventListeners();
         this.initializeKeyboardShortcuts();
@@ -302,30 +306,13 @@ class DatabaseViewer {
             return;
         }
 
-        // Check file size (100MB limit)
-        if (file.size > 100 * 1024 * 1024) {
-            this.showToast('error', 'File Too Large', 'File size must be less than 100MB');
-            return;
-        }
-
         // Show progress indicator
         this.showUploadProgress(file.name, file.size);
 
-        const formData = new FormData();
-        formData.append('file', file);
-        // formData.append('csrf_token', document.querySelector('meta[name="csrf-token"]').getAttribute('content')); // Alternative: send as form field
-
         try {
-            const csrfToken = document.querySelector('meta[name="csrf-token"]').getAttribute('content');
-            const response = await fetch('/upload', {
-                method: 'POST',
-                headers: {
-                    'X-CSRFToken': csrfToken
-                },
-                body: formData
-            });
-
-            const result = await response.json();
+            const result = file.size > this.chunkedUploadThreshold
+                ? await this.uploadInChunks(file)
+                : await this.uploadInOneRequest(file);
 
             if (result.success) {
                 this.showToast('success', 'Upload Successful', `Database "${file.name}" uploaded successfully`);
@@ -356,6 +343,159 @@ class DatabaseViewer {
         }
     }
 
+    async uploadInOneRequest(file) {
+        const formData = new FormData();
+        formData.append('file', file);
+        // formData.append('csrf_token', document.querySelector('meta[name="csrf-token"]').getAttribute('content')); // Alternative: send as form field
+
+        const csrfToken = document.querySelector('meta[name="csrf-token"]').getAttribute('content');
+        const response = await fetch('/upload', {
+            method: 'POST',
+            headers: {
+                'X-CSRFToken': csrfToken
+            },
+            body: formData
+        });
+        return response.json();
+    }
+
+    async uploadInChunks(file) {
+        // init -> PUT each missing chunk (several in parallel) -> finalize; an interrupted
+        // upload resumes when the same file is selected again
+        const csrfToken = document.querySelector('meta[name="csrf-token"]').getAttribute('content');
+        const resumeKey = `dbviewer-upload:${file.name}:${file.size}:${file.lastModified}`;
+        let upload = null;
+
+        const savedId = localStorage.getItem(resumeKey);
+        if (savedId) {
+            const response = await fetch(`/uploads/${encodeURIComponent(savedId)}`);
+            if (response.ok) {
+                upload = (await response.json()).upload;
+            }
+        }
+        if (!upload) {
+            const response = await fetch('/uploads', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': csrfToken
+                },
+                body: JSON.stringify({ filename: file.name, size: file.size })
+            });
+            const result = await response.json();
+            if (!result.success) return result;
+            upload = result.upload;
+            localStorage.setItem(resumeKey, upload.id);
+        }
+
+        const received = new Set(upload.received);
+        const pending = [];
+        for (let i = 0; i < upload.chunk_count; i++) {
+            if (!received.has(i)) pending.push(i);
+        }
+        let done = received.size;
+        let failure = null;
+        this.setUploadProgress(done / upload.chunk_count, done ? 'Resuming upload...' : 'Uploading file...');
+
+        const worker = async () => {
+            while (pending.length && !failure) {
+                const index = pending.shift();
+                try {
+                    await this.putChunk(upload, file, index, csrfToken);
+                } catch (error) {
+                    failure = error;
+                    return;
+                }
+                done++;
+                this.setUploadProgress(done / upload.chunk_count, `Uploading file... ${this.formatFileSize(Math.min(done * upload.chunk_size, file.size))} of ${this.formatFileSize(file.size)}`);
+            }
+        };
+        await Promise.all(Array.from({ length: Math.min(this.uploadParallelism, pending.length) }, worker));
+
+        if (failure) {
+            if (failure.fatal) {
+                localStorage.removeItem(resumeKey);
+                return { success: false, error: failure.message };
+            }
+            return { success: false, error: `${failure.message} Select the same file again to resume.` };
+        }
+
+        this.setUploadProgress(1, 'Processing database...');
+        let response = await fetch(`/uploads/${encodeURIComponent(upload.id)}/finalize`, {
+            method: 'POST',
+            headers: {
+                'X-CSRFToken': csrfToken
+            }
+        });
+        // The server hashes and stores the file in the background; poll until it has the result
+        while (response.status === 202) {
+            await new Promise(resolve => setTimeout(resolve, this.finalizePollInterval));
+            try {
+                response = await fetch(`/uploads/${encodeURIComponent(upload.id)}`);
+            } catch (error) {
+                // Network hiccup: poll again
+            }
+        }
+        const result = await response.json();
+        if (response.status !== 409) {
+            localStorage.removeItem(resumeKey);
+        }
+        return result;
+    }
+
+    async putChunk(upload, file, index, csrfToken) {
+        const start = index * upload.chunk_size;
+        const blob = file.slice(start, Math.min(start + upload.chunk_size, file.size));
+        const headers = {
+            'Content-Type': 'application/octet-stream',
+            'X-CSRFToken': csrfToken
+        };
+        // crypto.subtle only exists on secure origins; the server verifies the checksum when one is sent
+        if (window.crypto && window.crypto.subtle) {
+            const digest = await window.crypto.subtle.digest('SHA-256', await blob.arrayBuffer());
+            headers['X-Chunk-SHA256'] = Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('');
+        }
+
+        for (let attempt = 0; ; attempt++) {
+            let response = null;
+            try {
+                response = await fetch(`/uploads/${encodeURIComponent(upload.id)}/chunks/${index}`, {
+                    method: 'PUT',
+                    headers,
+                    body: blob
+                });
+            } catch (error) {
+                // Network failure: retried below
+            }
+            if (response && response.ok) return;
+            if (response && (response.status === 400 || response.status === 404)) {
+                const result = await response.json().catch(() => ({}));
+                if (result.reason !== 'chunk_checksum_mismatch') {
+                    const error = new Error(result.error || `Chunk ${index} was rejected`);
+                    error.fatal = true;
+                    throw error;
+                }
+            }
+            if (attempt >= this.chunkRetries) {
+                throw new Error('Network error occurred during upload.');
+            }
+            await new Promise(resolve => setTimeout(resolve, 1000 * 2 ** attempt));
+        }
+    }
+
+    setUploadProgress(fraction, status) {
+        // Real progress replaces the simulated one
+        if (this.progressInterval) {
+            clearInterval(this.progressInterval);
+            this.progressInterval = null;
+        }
+        const overlay = document.getElementById('loading-overlay');
+        const progressBar = overlay.querySelector('.progress-fill');
+        const statusText = overlay.querySelector('.upload-status');
+        if (progressBar) progressBar.style.width = `${Math.round(fraction * 100)}%`;
+        if (statusText) statusText.textContent = status;
+    }
+
     showUploadProgress(filename, fileSize) {
         const overlay = document.getElementById('loading-overlay');
         const content = overlay.querySelector('.loading-content');
@@ -599,13 +739,22 @@ class DatabaseViewer {
         dataTable.style.display = 'none';
         paginationContainer.style.display = 'none';
 
+        // A newer request (typing, paging, sorting) supersedes this one; abort the old fetch
+        if (this.tableRequestController) {
+            this.tableRequestController.abort();
+        }
+        const controller = new AbortController();
+        this.tableRequestController = controller;
+
         try {
             const params = new URLSearchParams({
                 page: this.currentPage,
                 per_page: this.perPage,
                 sort_column: this.sortColumn,
                 sort_order: this.sortOrder,
-                search: this.searchTerm
+                search: this.searchTerm,
+                count_mode: 'estimate',
+                format: 'columnar'
             });
 
             this.searchColumns.forEach(col => {
@@ -614,22 +763,71 @@ class DatabaseViewer {
                 }
             });
 
-            const response = await fetch(`/database/${encodeURIComponent(databaseId)}/table/${encodeURIComponent(tableName)}?${params}`);
+            const response = await fetch(`/database/${encodeURIComponent(databaseId)}/table/${encodeURIComponent(tableName)}?${params}`, {
+                signal: controller.signal
+            });
             const result = await response.json();
 
             if (result.success) {
+                if (result.timed_out) {
+                    this.showToast('warning', 'Query Timed Out', result.truncated
+                        ? 'The query took too long; showing the rows found so far.'
+                        : 'Counting rows took too long; the totals shown are approximate.');
+                }
                 this.lastPaginationInfo = result.pagination;
+                this.lastMirrorInfo = result.mirror;
                 this.renderTable(result);
-                this.updateTableStats(result.pagination);
+                this.updateTableStats(result.pagination, result.mirror);
                 this.renderPagination(result.pagination);
+                if (!result.pagination.count_exact) {
+                    this.pollExactCount(databaseId, tableName, params);
+                }
             } else {
                 this.showToast('error', 'Load Failed', result.error || 'Failed to load table data');
             }
         } catch (error) {
+            if (error.name === 'AbortError') {
+                return; // Superseded by a newer request, which owns the loading state
+            }
             console.error('Load table error:', error);
             this.showToast('error', 'Load Failed', 'Network error occurred while loading table');
         } finally {
-            tableLoading.style.display = 'none';
+            if (this.tableRequestController === controller) {
+                tableLoading.style.display = 'none';
+            }
+        }
+    }
+
+    async pollExactCount(databaseId, tableName, params, attempt = 0) {
+        // Large tables come back with an estimated count; the exact one is computed server-side
+        const requestKey = `${databaseId}/${tableName}?${params}`;
+        this.countRequestKey = requestKey;
+        const countParams = new URLSearchParams({ search: this.searchTerm });
+        params.getAll('search_columns').forEach(col => countParams.append('search_columns', col));
+
+        await new Promise(resolve => setTimeout(resolve, Math.min(500 * 2 ** attempt, 5000)));
+        if (this.countRequestKey !== requestKey || attempt > 10) return;
+
+        try {
+            const response = await fetch(`/database/${encodeURIComponent(databaseId)}/table/${encodeURIComponent(tableName)}/count?${countParams}`);
+            const result = await response.json();
+            if (this.countRequestKey !== requestKey) return;
+
+            if (result.success && result.ready) {
+                const pagination = Object.assign({}, this.lastPaginationInfo, {
+                    total: result.total,
+                    filtered: result.filtered,
+                    total_pages: Math.ceil(result.filtered / this.lastPaginationInfo.per_page),
+                    count_exact: true
+                });
+                this.lastPaginationInfo = pagination;
+                this.updateTableStats(pagination, this.lastMirrorInfo);
+                this.renderPagination(pagination);
+            } else if (result.success) {
+                this.pollExactCount(databaseId, tableName, params, attempt + 1);
+            }
+        } catch (error) {
+            console.error('Count error:', error);
         }
     }
 
@@ -676,12 +874,18 @@ class DatabaseViewer {
         });
         tableHead.appendChild(headerRow);
 
+        // Columnar pages carry positional rows; resolve each column's index once
+        const columnar = result.format === 'columnar';
+        const rowIndexes = columnar
+            ? result.columns.map(column => result.row_columns.indexOf(column.name))
+            : null;
+
         // Create data rows
         result.data.forEach(row => {
             const tr = document.createElement('tr');
-            result.columns.forEach(column => {
+            result.columns.forEach((column, i) => {
                 const td = document.createElement('td');
-                const value = row[column.name];
+                const value = columnar ? row[rowIndexes[i]] : row[column.name];
                 td.innerHTML = this.formatCellValue(value, column.type) || '';
                 td.title = this.getCellTooltip(value);
                 tr.appendChild(td);
@@ -707,12 +911,21 @@ class DatabaseViewer {
         });
     }
 
-    updateTableStats(pagination) {
+    updateTableStats(pagination, mirror) {
         const tableStats = document.getElementById('table-stats');
-        const start = Math.min((pagination.page - 1) * pagination.per_page + 1, pagination.total);
-        const end = Math.min(pagination.page * pagination.per_page, pagination.total);
+        const start = Math.min((pagination.page - 1) * pagination.per_page + 1, pagination.filtered);
+        const end = Math.min(pagination.page * pagination.per_page, pagination.filtered);
+        const approx = pagination.count_exact === false ? '~' : '';
         
-        tableStats.textContent = `Showing ${start.toLocaleString()}-${end.toLocaleString()} of ${pagination.total.toLocaleString()} rows`;
+        let text = `Showing ${start.toLocaleString()}-${end.toLocaleString()} of ${approx}${pagination.filtered.toLocaleString()} rows`;
+        if (pagination.filtered !== pagination.total) {
+            text += ` (filtered from ${approx}${pagination.total.toLocaleString()})`;
+        }
+        // Access databases are converted to a faster SQLite copy in the background
+        if (mirror && (mirror.status === 'pending' || mirror.status === 'building')) {
+            text += ' • optimizing for faster browsing...';
+        }
+        tableStats.textContent = text;
     }
 
     renderPagination(pagination) {
@@ -721,9 +934,10 @@ class DatabaseViewer {
         const paginationControls = document.getElementById('pagination-controls');
 
         // Update pagination info
-        const start = Math.min((pagination.page - 1) * pagination.per_page + 1, pagination.total);
-        const end = Math.min(pagination.page * pagination.per_page, pagination.total);
-        paginationInfo.textContent = `Showing ${start.toLocaleString()}-${end.toLocaleString()} of ${pagination.total.toLocaleString()} entries`;
+        const start = Math.min((pagination.page - 1) * pagination.per_page + 1, pagination.filtered);
+        const end = Math.min(pagination.page * pagination.per_page, pagination.filtered);
+        const approx = pagination.count_exact === false ? '~' : '';
+        paginationInfo.textContent = `Showing ${start.toLocaleString()}-${end.toLocaleString()} of ${approx}${pagination.filtered.toLocaleString()} entries`;
 
         // Clear existing controls
         paginationControls.innerHTML = '';
@@ -834,64 +1048,32 @@ class DatabaseViewer {
         this.loadTableData(this.currentDatabase, this.currentTable);
     }
 
-    async exportTable() {
+    exportTable() {
         if (!this.currentTable || !this.currentDatabase) return;
 
-        this.showToast('info', 'Export Started', 'Preparing table data for export...');
-
-        try {
-            // Get all data without pagination
-            const params = new URLSearchParams({
-                page: 1,
-                per_page: 50000, // Large number to get all data
-                sort_column: this.sortColumn,
-                sort_order: this.sortOrder,
-                search: this.searchTerm
-            });
-
-            const response = await fetch(`/database/${encodeURIComponent(this.currentDatabase)}/table/${encodeURIComponent(this.currentTable)}?${params}`);
-            const result = await response.json();
-
-            if (result.success) {
-                this.downloadCSV(result.data, result.columns, this.currentTable);
-            } else {
-                this.showToast('error', 'Export Failed', result.error || 'Failed to export table data');
+        // The server streams the full table (current sort and search applied) straight to a download
+        const params = new URLSearchParams({
+            format: 'csv',
+            sort_column: this.sortColumn,
+            sort_order: this.sortOrder,
+            search: this.searchTerm
+        });
+        this.searchColumns.forEach(col => {
+            if (col !== 'all') {
+                params.append('search_columns', col);
             }
-        } catch (error) {
-            console.error('Export error:', error);
-            this.showToast('error', 'Export Failed', 'Network error occurred during export');
-        }
-    }
+        });
 
-    downloadCSV(data, columns, tableName) {
-        // Create CSV content
-        const headers = columns.map(col => col.name);
-        const csvContent = [
-            headers.join(','),
-            ...data.map(row => 
-                headers.map(header => {
-                    const value = row[header] || '';
-                    // Remove HTML tags and escape quotes
-                    const cleanValue = value.toString().replace(/<[^>]*>/g, '').replace(/"/g, '""');
-                    return `"${cleanValue}"`;
-                }).join(',')
-            )
-        ].join('\n');
-
-        // Create and trigger download
-        const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
         const link = document.createElement('a');
-        const url = URL.createObjectURL(blob);
-        
-        link.setAttribute('href', url);
-        link.setAttribute('download', `${tableName}_export_${new Date().toISOString().split('T')[0]}.csv`);
+        link.setAttribute('href', `/database/${encodeURIComponent(this.currentDatabase)}/table/${encodeURIComponent(this.currentTable)}/export?${params}`);
+        link.setAttribute('download', '');
         link.style.visibility = 'hidden';
-        
+
         document.body.appendChild(link);
         link.click();
         document.body.removeChild(link);
 
-        this.showToast('success', 'Export Complete', `Table "${tableName}" exported successfully`);
+        this.showToast('info', 'Export Started', `Downloading "${this.currentTable}" as CSV...`);
     }
 
     showDatabaseActions() {
@@ -982,7 +1164,7 @@ class DatabaseViewer {
                 <h3>How to Use Database Explorer</h3>
                 <div class="help-section">
                     <h4>1. Upload Your Database</h4>
-                    <p>Drag and drop or click to upload .mdb, .accdb, .sqlite, or .db files (max 100MB)</p>
+                    <p>Drag and drop or click to upload .mdb, .accdb, .sqlite, or .db files. Files over 16MB are sent in resumable chunks (max 2GB)</p>
                 </div>
                 <div class="help-section">
                     <h4>2. Browse Tables</h4>
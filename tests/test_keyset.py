@@ -0,0 +1,55 @@
+import os
+import sqlite3
+from datetime import date
+
+import pytest
+
+pytest.importorskip('pyodbc', exc_type=ImportError)  # Also skips when the unixODBC library is missing
+os.environ.setdefault('FLASK_SECRET_KEY', 'test-secret-key-' + 'x' * 32)
+
+import dbviewer
+
+
+def make_dated_table():
+    # PARSE_DECLTYPES hands DATE values back as datetime.date, as pyodbc does for Access DATE columns
+    conn = sqlite3.connect(':memory:', detect_types=sqlite3.PARSE_DECLTYPES)
+    conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, happened DATE, name TEXT)")
+    conn.executemany("INSERT INTO events (happened, name) VALUES (?, ?)", [
+        (date(2024, 1, 1 + i % 5), f"event {i}") for i in range(12)
+    ])
+    columns = [{'name': 'id', 'type': 'INTEGER'}, {'name': 'happened', 'type': 'DATE'}, {'name': 'name', 'type': 'TEXT'}]
+    return conn, columns
+
+
+def walk(conn, columns, sort_order):
+    pages, token = [], None
+    while True:
+        rows, _, token, _ = dbviewer.execute_keyset_query(
+            conn, 'events', columns, '', [], 'happened', sort_order, 5, token, 'rowid'
+        )
+        pages.append(rows)
+        if token is None:
+            return pages
+
+
+def test_date_cursor_round_trip():
+    token = dbviewer.encode_cursor('next', 'happened', 'ASC', date(2024, 1, 3), 7)
+    assert dbviewer.decode_cursor(token, 'happened', 'ASC') == ('next', date(2024, 1, 3), 7)
+
+
+@pytest.mark.parametrize('sort_order', ['ASC', 'DESC'])
+def test_keyset_pages_sorted_on_date_column(sort_order):
+    conn, columns = make_dated_table()
+    pages = walk(conn, columns, sort_order)
+    rows = [row for page in pages for row in page]
+    expected = conn.execute(f"SELECT id, happened, name FROM events ORDER BY happened {sort_order}, rowid {sort_order}").fetchall()
+    assert rows == expected
+    assert [len(page) for page in pages] == [5, 5, 2]
+
+
+def test_keyset_prev_cursor_on_date_column():
+    conn, columns = make_dated_table()
+    first, _, next_cursor, _ = dbviewer.execute_keyset_query(conn, 'events', columns, '', [], 'happened', 'ASC', 5, None, 'rowid')
+    _, _, _, prev_cursor = dbviewer.execute_keyset_query(conn, 'events', columns, '', [], 'happened', 'ASC', 5, next_cursor, 'rowid')
+    back, _, _, _ = dbviewer.execute_keyset_query(conn, 'events', columns, '', [], 'happened', 'ASC', 5, prev_cursor, 'rowid')
+    assert back == first